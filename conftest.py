@@ -1,11 +1,118 @@
 import os
 import time
 
-import httpx
+import allure
 import pytest
 
-from services.auth_service import AuthService, Role
-from settings import settings
+from services.auth_service import AuthService, IikoAuthService, Role
+from services.iiko_command_poller import CommandPoller
+from src.attachments import AllureAttachments
+from src.http_methods import MyRequests
+from src.metrics import HttpMetrics, current_test_name
+from src.transports import PluggableTransport, Cassette, HarRecorder
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--http-transport",
+        action="store",
+        default=None,
+        help="HTTP transport for MyRequests/AuthService: network | mock:<module>:<handler> | "
+             "wsgi:<module>:<app> | asgi:<module>:<app> | transport:<module>:<obj> (default: HTTP_TRANSPORT setting)",
+    )
+    parser.addoption(
+        "--cassette-mode",
+        action="store",
+        default=None,
+        choices=("off", "record", "replay"),
+        help="Record HTTP traffic to a cassette or replay it without network (default: HTTP_CASSETTE_MODE setting)",
+    )
+    parser.addoption(
+        "--cassette-path",
+        action="store",
+        default=None,
+        help="Cassette file path (default: HTTP_CASSETTE_PATH setting)",
+    )
+    parser.addoption(
+        "--har",
+        action="store",
+        default=None,
+        choices=("off", "session", "test"),
+        help="Write HTTP traffic to HAR 1.2 files: one per session or one per test (default: HTTP_HAR_MODE setting)",
+    )
+    parser.addoption(
+        "--har-dir",
+        action="store",
+        default=None,
+        help="Directory for HAR files (default: HTTP_HAR_DIR setting)",
+    )
+
+
+def pytest_configure(config):
+    transport = config.getoption("--http-transport")
+    if transport:
+        PluggableTransport.configure(transport)
+    Cassette.configure(config.getoption("--cassette-mode"), config.getoption("--cassette-path"))
+    HarRecorder.configure(config.getoption("--har"), config.getoption("--har-dir"))
+    AllureAttachments.install()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Прикрепляет вложения, накопленные в setup и call, пока тест открыт в отчете Allure."""
+    yield
+    AllureAttachments.flush()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Прикрепляет вложения, сделанные в teardown (и в setup, если тест до call не дошел)."""
+    yield
+    AllureAttachments.flush(end_of_test=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_clients():
+    """Закрытие пула HTTP-клиентов (MyRequests, AuthService), кассеты и HAR-файлов по завершении сессии."""
+    yield
+    MyRequests.close()
+    AuthService.close()
+    IikoAuthService.close()
+    Cassette.close_current()
+    HarRecorder.close_current()
+
+
+@pytest.fixture(autouse=True)
+def http_timings():
+    """Прикрепляет к отчету теста замеры фаз всех HTTP-запросов, выполненных в тесте, и закрывает его HAR-файл."""
+    yield
+    HarRecorder.close_test(current_test_name())
+    timings = HttpMetrics.get_timings(test=current_test_name())
+    if timings:
+        allure.attach(
+            HttpMetrics.format_timings(timings),
+            name="HTTP timings (ms)",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    lines = HttpMetrics.summary_lines()
+    if lines:
+        terminalreporter.write_sep("=", "HTTP client summary (ms)")
+        for line in lines:
+            terminalreporter.write_line(line)
+    traffic = HttpMetrics.traffic_lines()
+    if traffic:
+        terminalreporter.write_sep("=", "HTTP traffic (bytes)")
+        for line in traffic:
+            terminalreporter.write_line(line)
+    commands = CommandPoller.summary_line()
+    if commands:
+        terminalreporter.write_line(commands)
+    counters = HttpMetrics.get_counters()
+    if counters:
+        terminalreporter.write_line(", ".join(f"{name}: {value:g}" for name, value in sorted(counters.items())))
 
 
 @pytest.fixture
@@ -16,22 +123,18 @@ def get_test_name():
     test_name = os.environ.get("PYTEST_CURRENT_TEST")
     return test_name
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers():
     """
     Универсальная фикстура для получения заголовков авторизации.
-    Использует обновленный AuthService с поддержкой Role enum.
+    Токены берутся из кэша сессии AuthService: повторного логина в каждом тесте нет.
     
     Пример использования:
     - Для администратора: auth_headers(Role.ADMIN)
     - Для логиста: auth_headers(Role.LOGIST)
     - Для курьера: auth_headers(Role.COURIER)
     """
-    def _get_headers(role: Role):
-        token = AuthService.get_access_token(role)
-        return {"Authorization": f"Bearer {token}"}
-    
-    return _get_headers
+    return AuthService.get_headers
 
 @pytest.fixture
 def admin_auth_headers(auth_headers):
@@ -55,18 +158,7 @@ def courier_iiko_auth_headers(auth_headers, request):
     if hasattr(request, "param") and request.param:
         courier_id = request.param
         admin_headers = auth_headers(Role.ADMIN)
-
-        phone = AuthService.get_courier_phone(courier_id, admin_headers)
-        AuthService.request_sms_code(phone)
-        sms_code = AuthService.get_sms_code_for_courier(courier_id, admin_headers)
-
-        response = httpx.post(
-            f"{settings.BASE_URL}/login/phone/code",
-            json={"phone": phone, "code": sms_code}
-        )
-        if response.status_code != 200:
-            raise Exception(f"Courier auth failed: {response.text}")
-        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return AuthService.get_courier_headers(courier_id, admin_headers)
 
 @pytest.fixture
 def logistician_iiko_auth_headers(auth_headers):
@@ -1,6 +1,8 @@
 import os
 import json
 import time
+import asyncio
+import inspect
 from functools import wraps
 from typing import Callable, Optional, Type, Union, Tuple
 
@@ -43,6 +45,7 @@ def retry(
 ):
     """
     Decorator for re-executing a function on exception.
+    Coroutine functions are supported as well (the delay is awaited with asyncio.sleep).
 
     Parameters:
         max_attempts (int): Maximum number of attempts (default 3)
@@ -57,7 +60,46 @@ def retry(
         def some_function():
             # code that can throw exceptions
     """
+    def log_attempt(func, current_attempt, error, current_delay):
+        log_message = (
+            f"Attempt {current_attempt}/{max_attempts} failed for {func.__name__}. "
+            f"Error: {str(error)}. Retrying in {current_delay} seconds..."
+        )
+        if logger:
+            logger.warning(log_message)
+        else:
+            print(log_message)
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                last_exception = None
+                current_attempt = 0
+                current_delay = delay
+
+                while current_attempt < max_attempts:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        last_exception = e
+                        current_attempt += 1
+
+                        if current_attempt == max_attempts:
+                            break
+
+                        log_attempt(func, current_attempt, e, current_delay)
+                        await asyncio.sleep(current_delay)
+                        if exponential_backoff:
+                            current_delay *= 2
+
+                if on_failure:
+                    on_failure(last_exception)
+
+                raise last_exception
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
@@ -74,15 +116,7 @@ def retry(
                     if current_attempt == max_attempts:
                         break
 
-                    log_message = (
-                        f"Attempt {current_attempt}/{max_attempts} failed for {func.__name__}. "
-                        f"Error: {str(e)}. Retrying in {current_delay} seconds..."
-                    )
-                    if logger:
-                        logger.warning(log_message)
-                    else:
-                        print(log_message)
-
+                    log_attempt(func, current_attempt, e, current_delay)
                     time.sleep(current_delay)
                     if exponential_backoff:
                         current_delay *= 2
@@ -93,4 +127,23 @@ def retry(
             raise last_exception
 
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+def percentile(values, percent: float) -> float:
+    """
+    Calculates a percentile using linear interpolation between closest ranks.
+
+    Args:
+        values: Sequence of numbers.
+        percent (float): Percentile in range 0..100 (e.g. 95 for p95).
+
+    Returns:
+        float: The percentile value (0.0 for an empty sequence).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
@@ -1,7 +1,19 @@
+import json
+import asyncio
+import threading
+import weakref
 from enum import Enum
+from http import HTTPStatus
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 import httpx
+from src.http_client import create_client, create_async_client
 from src.logger import get_logger
+from src.http_methods import MyRequests, AsyncMyRequests
+from src.token_cache import TokenCache, TokenHeaders
+from src.transports import CACHE_EXTENSION
 from settings import settings
+from data import get_iiko_endpoints
 
 
 class Role(str, Enum):
@@ -20,18 +32,36 @@ class Role(str, Enum):
 class AuthService:
     """
     Сервис для работы с аутентификацией и токенами.
+
+    Безопасен для потоков и asyncio: синхронный клиент создается под блокировкой, асинхронный - свой для каждого
+    event loop; у каждого метода есть async-версия с префиксом "a" (aget_access_token, aget_courier_headers...).
+    Одновременные логины одной роли или курьера выполняются один раз (см. TokenCache).
     """
 
     logger = get_logger(__name__)
     _client = None
+    _async_clients = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+    _tokens = TokenCache()
 
     @classmethod
     def _get_client(cls):
         """Ленивая инициализация клиента с текущим BASE_URL."""
         if cls._client is None:
-            cls._client = httpx.Client(base_url=settings.BASE_URL)
+            with cls._lock:
+                if cls._client is None:
+                    cls._client = create_client(base_url=settings.BASE_URL)
         return cls._client
 
+    @classmethod
+    def _get_async_client(cls):
+        """Асинхронный клиент текущего event loop."""
+        loop = asyncio.get_running_loop()
+        client = cls._async_clients.get(loop)
+        if client is None:
+            client = cls._async_clients[loop] = create_async_client(base_url=settings.BASE_URL)
+        return client
+
     @classmethod
     def _get_auth_credentials(cls, role: Role):
         """Получение учетных данных для роли из конфигурации."""
@@ -49,84 +79,305 @@ class AuthService:
 
     @classmethod
     def get_access_token(cls, role: Role) -> str:
-        """Универсальный метод получения токена."""
+        """Универсальный метод получения токена (из кэша сессии, см. TokenCache)."""
+        return cls._tokens.get(role.value, lambda: cls._login(role))
+
+    @classmethod
+    async def aget_access_token(cls, role: Role) -> str:
+        """Асинхронный аналог get_access_token."""
+        return await cls._tokens.aget(role.value, lambda: cls._alogin(role), lambda: cls._login(role))
+
+    @classmethod
+    def get_headers(cls, role: Role) -> dict:
+        """Заголовки авторизации для роли."""
+        return {"Authorization": f"Bearer {cls.get_access_token(role)}"}
+
+    @classmethod
+    async def aget_headers(cls, role: Role) -> dict:
+        """Асинхронный аналог get_headers."""
+        return {"Authorization": f"Bearer {await cls.aget_access_token(role)}"}
+
+    # Каждый запрос описан парой методов: аргументы запроса (_*_request) и разбор ответа (_*_result),
+    # общими для синхронной и асинхронной версий.
+
+    @classmethod
+    def _login_request(cls, role: Role) -> dict:
         credentials = cls._get_auth_credentials(role)
-        url = "/login/phone/code" if role.is_courier else "/login/email"
-        
         if role.is_courier:
-            response = cls._get_client().post(url, json=credentials)
-        else:
-            response = cls._get_client().post(url, auth=(
-                credentials["username"], credentials["password"]
-            ))
-        
+            return {"method": "POST", "url": "/login/phone/code", "json": credentials}
+        return {"method": "POST", "url": "/login/email", "auth": (credentials["username"], credentials["password"])}
+
+    @classmethod
+    def _login_result(cls, role: Role, response: httpx.Response) -> str:
         if response.status_code != 200:
             cls.logger.error(f"Auth failed: {response.status_code} for role {role}")
             raise Exception(f"Auth failed: {response.text}")
         
         return response.json().get("access_token")
-    
+
     @classmethod
-    def get_courier_id(cls, token: str) -> str:
-        """Получение ID курьера на основе токена."""
-        url = "/user"
-        response = cls._get_client().get(url, headers=token)
-        
+    def _login(cls, role: Role) -> str:
+        """Логин роли без кэша."""
+        return cls._login_result(role, cls._get_client().request(**cls._login_request(role)))
+
+    @classmethod
+    async def _alogin(cls, role: Role) -> str:
+        return cls._login_result(role, await cls._get_async_client().request(**cls._login_request(role)))
+
+    @classmethod
+    def _courier_id_result(cls, url: str, response: httpx.Response) -> str:
         if response.status_code != 200:
             cls.logger.error(f"Failed to fetch courier ID: {response.status_code}. URL: {url}.")
             raise Exception(f"Failed to fetch courier ID: {response.text}")
 
         return response.json().get("id")
-    
+
     @classmethod
-    def request_sms_code(cls, phone: str) -> None:
-        """Запрос SMS кода для авторизации курьера."""
-        url = "/login/phone"
-        response = cls._get_client().post(url, json={"phone": phone})
+    def get_courier_id(cls, token: str) -> str:
+        """Получение ID курьера на основе токена."""
+        url = "/user"
+        return cls._courier_id_result(url, cls._get_client().get(url, headers=token))
 
+    @classmethod
+    async def aget_courier_id(cls, token: str) -> str:
+        """Асинхронный аналог get_courier_id."""
+        url = "/user"
+        return cls._courier_id_result(url, await cls._get_async_client().get(url, headers=token))
+
+    @classmethod
+    def _sms_request_result(cls, phone: str, response: httpx.Response) -> None:
         if response.status_code != 204:
             cls.logger.error(f"SMS request failed: {response.status_code} for phone {phone}")
             raise Exception(f"SMS request failed: {response.text}")
-        
+
     @classmethod
-    def get_sms_code_for_courier(cls, courier_id: str, admin_headers: dict) -> str:
-        """Получение SMS кода для курьера через админский эндпоинт."""
-        url = f"/couriers/{courier_id}/sms_code"
-        response = cls._get_client().get(url, headers=admin_headers)
+    def request_sms_code(cls, phone: str) -> None:
+        """Запрос SMS кода для авторизации курьера."""
+        url = "/login/phone"
+        cls._sms_request_result(phone, cls._get_client().post(url, json={"phone": phone}))
 
+    @classmethod
+    async def arequest_sms_code(cls, phone: str) -> None:
+        """Асинхронный аналог request_sms_code."""
+        url = "/login/phone"
+        cls._sms_request_result(phone, await cls._get_async_client().post(url, json={"phone": phone}))
+
+    @classmethod
+    def _sms_code_result(cls, courier_id: str, response: httpx.Response) -> str:
         if response.status_code != 200 or response.json()["code"] == "":
             cls.logger.error(f"Failed to get SMS code: {response.status_code} for courier {courier_id}")
             raise Exception(f"Failed to get SMS code: {response.text}")
         return response.json()["code"]
-    
+
     @classmethod
-    def get_courier_phone(cls, courier_id: str, admin_headers: dict) -> str:
-        """Получение номера телефона курьера."""
-        url = f"/couriers/{courier_id}"
-        response = cls._get_client().get(url, headers=admin_headers)
+    def get_sms_code_for_courier(cls, courier_id: str, admin_headers: dict) -> str:
+        """Получение SMS кода для курьера через админский эндпоинт."""
+        url = f"/couriers/{courier_id}/sms_code"
+        # Код одноразовый: читается мимо кэша ответов
+        response = cls._get_client().get(url, headers=admin_headers, extensions={CACHE_EXTENSION: False})
+        return cls._sms_code_result(courier_id, response)
 
+    @classmethod
+    async def aget_sms_code_for_courier(cls, courier_id: str, admin_headers: dict) -> str:
+        """Асинхронный аналог get_sms_code_for_courier."""
+        url = f"/couriers/{courier_id}/sms_code"
+        response = await cls._get_async_client().get(url, headers=admin_headers, extensions={CACHE_EXTENSION: False})
+        return cls._sms_code_result(courier_id, response)
+
+    @classmethod
+    def _courier_phone_result(cls, response: httpx.Response) -> str:
         if response.status_code != 200:
             cls.logger.error(f"Failed to get courier phone: {response.status_code}")
             raise Exception(f"Failed to get courier phone: {response.text}")
         return response.json()["user"]["phone"]
-    
+
     @classmethod
-    def get_courier_headers(cls, courier_id: str, admin_headers: dict) -> dict:
-        """Получает auth headers для конкретного курьера."""
-        phone = AuthService.get_courier_phone(courier_id, admin_headers)
-        AuthService.request_sms_code(phone)
-        sms_code = AuthService.get_sms_code_for_courier(courier_id, admin_headers)
+    def get_courier_phone(cls, courier_id: str, admin_headers: dict) -> str:
+        """Получение номера телефона курьера."""
+        url = f"/couriers/{courier_id}"
+        return cls._courier_phone_result(cls._get_client().get(url, headers=admin_headers))
 
-        url = f"/login/phone/code"
-        response = cls._get_client().post(url, json={"phone": phone, "code": sms_code})
+    @classmethod
+    async def aget_courier_phone(cls, courier_id: str, admin_headers: dict) -> str:
+        """Асинхронный аналог get_courier_phone."""
+        url = f"/couriers/{courier_id}"
+        return cls._courier_phone_result(await cls._get_async_client().get(url, headers=admin_headers))
+
+    @classmethod
+    def get_courier_headers(cls, courier_id: str, admin_headers: dict = None) -> dict:
+        """
+        Получает auth headers для конкретного курьера (токен кэшируется на сессию, см. TokenCache).
+        Без admin_headers используется токен администратора из кэша.
+        """
+        token = cls._tokens.get(f"courier:{courier_id}", cls._courier_login(courier_id, admin_headers))
+        return {"Authorization": f"Bearer {token}"}
+
+    @classmethod
+    async def aget_courier_headers(cls, courier_id: str, admin_headers: dict = None) -> dict:
+        """Асинхронный аналог get_courier_headers."""
+        first_headers = admin_headers
 
+        async def alogin():
+            nonlocal first_headers
+            headers, first_headers = first_headers or await cls.aget_headers(Role.ADMIN), None
+            return await cls._alogin_courier(courier_id, headers)
+
+        token = await cls._tokens.aget(f"courier:{courier_id}", alogin, cls._courier_login(courier_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    @classmethod
+    def _courier_login(cls, courier_id: str, admin_headers: dict = None):
+        """Функция логина курьера для кэша токенов: первый логин - с admin_headers, следующие - с токеном из кэша."""
+
+        def login():
+            nonlocal admin_headers
+            # Фоновые обновления идут с актуальным токеном администратора из кэша
+            headers, admin_headers = admin_headers or cls.get_headers(Role.ADMIN), None
+            return cls._login_courier(courier_id, headers)
+
+        return login
+
+    @classmethod
+    def _courier_token_result(cls, response: httpx.Response) -> str:
         if response.status_code != 200:
             cls.logger.error(f"Failed to get courier headers: {response.status_code}")
             raise Exception(f"Failed to get courier headers: {response.text}")
     
-        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response.json()["access_token"]
+
+    @classmethod
+    def _login_courier(cls, courier_id: str, admin_headers: dict) -> str:
+        """Логин курьера по SMS-коду без кэша."""
+        phone = cls.get_courier_phone(courier_id, admin_headers)
+        cls.request_sms_code(phone)
+        sms_code = cls.get_sms_code_for_courier(courier_id, admin_headers)
+
+        url = f"/login/phone/code"
+        response = cls._get_client().post(url, json={"phone": phone, "code": sms_code})
+        return cls._courier_token_result(response)
+
+    @classmethod
+    async def _alogin_courier(cls, courier_id: str, admin_headers: dict) -> str:
+        phone = await cls.aget_courier_phone(courier_id, admin_headers)
+        await cls.arequest_sms_code(phone)
+        sms_code = await cls.aget_sms_code_for_courier(courier_id, admin_headers)
+
+        url = f"/login/phone/code"
+        response = await cls._get_async_client().post(url, json={"phone": phone, "code": sms_code})
+        return cls._courier_token_result(response)
 
     @classmethod
     def close(cls):
-        """Закрытие клиента."""
-        cls._get_client().close()
+        """Закрытие клиента и остановка фонового обновления токенов."""
+        cls._tokens.clear()
+        with cls._lock:
+            client, cls._client = cls._client, None
+        if client is not None:
+            client.close()
+
+    @classmethod
+    async def aclose(cls):
+        """Закрытие асинхронного клиента текущего event loop (вызывать перед завершением loop)."""
+        client = cls._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+class IikoAuthService:
+    """
+    Токен iiko Cloud API (apiLogin) на сессию.
+
+    Токен iiko не JWT, поэтому живет IIKO_TOKEN_TTL и обновляется в фоне за AUTH_TOKEN_REFRESH_BEFORE до истечения
+    (см. TokenCache). get_headers возвращает TokenHeaders: при 401 запрос один раз повторяется с новым токеном.
+    """
+
+    logger = get_logger(__name__)
+    _tokens = TokenCache(default_ttl=settings.IIKO_TOKEN_TTL)
+    _key = "iiko"
+
+    @classmethod
+    def get_access_token(cls) -> str:
+        return cls._tokens.get(cls._key, cls._login)
+
+    @classmethod
+    async def aget_access_token(cls) -> str:
+        return await cls._tokens.aget(cls._key, cls._alogin, cls._login)
+
+    @classmethod
+    def get_headers(cls) -> TokenHeaders:
+        """Заголовки iiko API с токеном из кэша (объект можно хранить всю сессию)."""
+        return TokenHeaders(cls.get_access_token, cls.aget_access_token, {"Content-Type": "application/json"})
+
+    @classmethod
+    def _login_payload(cls) -> str:
+        return json.dumps({"apiLogin": settings.IIKO_API_LOGIN})
+
+    @classmethod
+    def _login_result(cls, response: httpx.Response) -> str:
+        if response.status_code != HTTPStatus.OK:
+            cls.logger.error(f"iiko auth failed: {response.status_code}")
+            raise Exception(f"iiko auth failed: {response.text}")
+        return response.json()["token"]
+
+    @classmethod
+    def _login(cls) -> str:
+        response = MyRequests().post(url=get_iiko_endpoints().access_token, data=cls._login_payload())
+        return cls._login_result(response)
+
+    @classmethod
+    async def _alogin(cls) -> str:
+        response = await AsyncMyRequests().post(url=get_iiko_endpoints().access_token, data=cls._login_payload())
+        return cls._login_result(response)
+
+    @classmethod
+    def close(cls):
+        """Остановка фонового обновления токена."""
+        cls._tokens.clear()
+
+
+class CourierHeaders(Mapping):
+    """
+    Заголовки авторизации курьеров по имени: courier_headers["Семен"].
+
+    warm_up авторизует весь список курьеров параллельно; дальше заголовки берутся из кэша токенов AuthService.
+    Если сервер отклонил токен курьера (401), при следующем обращении курьер авторизуется заново.
+    """
+
+    logger = get_logger(__name__)
+
+    def __init__(self, couriers: dict, admin_headers: dict = None):
+        """
+        :param couriers: Имя курьера -> id курьера (tests/e2e/config/couriers.{env}.json).
+        :param admin_headers: Заголовки администратора для первого логина (по умолчанию - из кэша AuthService).
+        """
+        self.couriers = dict(couriers)
+        self.admin_headers = admin_headers
+
+    def warm_up(self, concurrency: int = None):
+        """
+        Авторизует всех курьеров параллельно (не больше concurrency логинов одновременно, по умолчанию
+        HTTP_BULK_CONCURRENCY). Ошибка отдельного курьера не прерывает остальных: он авторизуется при обращении.
+        """
+        if not self.couriers:
+            return
+        if self.admin_headers is None:
+            AuthService.get_headers(Role.ADMIN)  # токен администратора нужен всем логинам - получаем его до запуска потоков
+        concurrency = concurrency or settings.HTTP_BULK_CONCURRENCY
+
+        def _login(name: str):
+            try:
+                self[name]
+            except Exception as ex:
+                self.logger.warning(f"Courier warm-up failed for {name}: {ex}")
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(self.couriers))) as executor:
+            list(executor.map(_login, self.couriers))
+
+    def __getitem__(self, name: str) -> dict:
+        return AuthService.get_courier_headers(self.couriers[name], self.admin_headers)
+
+    def __iter__(self):
+        return iter(self.couriers)
+
+    def __len__(self) -> int:
+        return len(self.couriers)
@@ -1,4 +1,4 @@
-from src.http_methods import MyRequests
+from src.http_methods import MyRequests, AsyncMyRequests
 from src.assertions import Assertions
 from http import HTTPStatus
 from data import get_company_endpoints
@@ -15,3 +15,17 @@ class CompanyService:
         response = self.request.post(url=self.company_url.create_company, data=data, headers=headers)
         self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.CREATED, test_name=get_test_name)
         return response.json().get("id")
+
+
+class AsyncCompanyService(CompanyService):
+    """Асинхронный аналог CompanyService (методы возвращают корутины)."""
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def create_company(self, data, headers, get_test_name):
+        """Создание компании"""
+        response = await self.request.post(url=self.company_url.create_company, data=data, headers=headers)
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.CREATED, test_name=get_test_name)
+        return response.json().get("id")
@@ -1,5 +1,5 @@
 import json
-from src.http_methods import MyRequests
+from src.http_methods import MyRequests, AsyncMyRequests
 from src.assertions import Assertions
 from http import HTTPStatus
 from data import get_courier_endpoints
@@ -51,15 +51,7 @@ class CourierService:
         print(f"Courier {courier_id} info: {courier_data}")
         
         # Формируем данные для закрытия только АКТИВНЫХ смен
-        shifts_data = []
-        if "pickup_points" in courier_data:
-            for pickup_point in courier_data["pickup_points"]:
-                # Закрываем только те смены, которые сейчас открыты (online: true)
-                if pickup_point.get("online") is True:
-                    shifts_data.append({
-                        "pickup_point_id": pickup_point["id"],
-                        "online": False
-                    })
+        shifts_data = self._get_active_shifts_to_close(courier_data)
         
         if not shifts_data:
             print(f"No active shifts found for courier {courier_id}")
@@ -77,6 +69,20 @@ class CourierService:
         print(f"All active shifts for courier {courier_id} have been closed. Closed {len(shifts_data)} shift(s).")
         return response
 
+    @staticmethod
+    def _get_active_shifts_to_close(courier_data):
+        """Данные для закрытия только активных смен курьера."""
+        shifts_data = []
+        if "pickup_points" in courier_data:
+            for pickup_point in courier_data["pickup_points"]:
+                # Закрываем только те смены, которые сейчас открыты (online: true)
+                if pickup_point.get("online") is True:
+                    shifts_data.append({
+                        "pickup_point_id": pickup_point["id"],
+                        "online": False
+                    })
+        return shifts_data
+
     def update_courier_geo(self, get_test_name, courier_id, latitude, longitude, headers):
         """Обновление геопозиции курьера"""
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -98,10 +104,93 @@ class CourierService:
         def _get_batch_deliveries():
             response = self.request.get(
                 url=f"{self.courier_url.create_courier}/batch/deliveries",
-                headers=headers
+                headers=headers,
+                cache=False  # batch наполняется между попытками: ответ не берется из кэша
             )
             # print("response from _get_batch_deliveries:", response.json())
             self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
             return response.json()
         
         return _get_batch_deliveries()
+
+
+class AsyncCourierService(CourierService):
+    """Асинхронный аналог CourierService (методы возвращают корутины)."""
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def turn_on_shift(self, get_test_name, courier_id, pickup_point_id, headers):
+        """Включение смены для курьера"""
+        data = {"shifts": [{"pickup_point_id": pickup_point_id, "online": True}]}
+        response = await self.request.patch(
+            url=f"{self.courier_url.list_of_couriers}/{courier_id}/shifts",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"Courier {courier_id} shift on.")
+        return response
+
+    async def close_shift(self, get_test_name, courier_id, pickup_point_id, headers):
+        """Закрытие смены для курьера"""
+        data = {"shifts": [{"pickup_point_id": pickup_point_id, "online": False}]}
+        response = await self.request.patch(
+            url=f"{self.courier_url.list_of_couriers}/{courier_id}/shifts",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"Courier {courier_id} shift off.")
+        return response
+
+    async def close_all_active_shifts(self, get_test_name, courier_id, headers):
+        """Закрытие всех активных смен курьера на ПВ"""
+        response = await self.request.get(
+            url=f"{self.courier_url.list_of_couriers}/{courier_id}",
+            headers=headers
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
+
+        shifts_data = self._get_active_shifts_to_close(response.json())
+        if not shifts_data:
+            print(f"No active shifts found for courier {courier_id}")
+            return None
+
+        response = await self.request.patch(
+            url=f"{self.courier_url.list_of_couriers}/{courier_id}/shifts",
+            headers=headers,
+            data=json.dumps({"shifts": shifts_data})
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"All active shifts for courier {courier_id} have been closed. Closed {len(shifts_data)} shift(s).")
+        return response
+
+    async def update_courier_geo(self, get_test_name, courier_id, latitude, longitude, headers):
+        """Обновление геопозиции курьера"""
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        data = {"latitude": latitude, "longitude": longitude, "bearing": 0}
+
+        response = await self.request.patch(
+            url=f"{self.courier_url.list_of_couriers}/{courier_id}/geo_point",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
+        print(f"Courier {courier_id} geo point: {data}. Time: {current_time}.")
+        return response
+
+    async def get_courier_batch_deliveries(self, get_test_name, headers, max_attempts=3, delay=5):
+        """Получает заказы из batch курьера с ретраями."""
+        @retry(max_attempts=max_attempts, delay=delay)
+        async def _get_batch_deliveries():
+            response = await self.request.get(
+                url=f"{self.courier_url.create_courier}/batch/deliveries",
+                headers=headers,
+                cache=False  # batch наполняется между попытками: ответ не берется из кэша
+            )
+            self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
+            return response.json()
+
+        return await _get_batch_deliveries()
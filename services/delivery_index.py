@@ -0,0 +1,177 @@
+import time
+import asyncio
+import threading
+import weakref
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Dict, Optional
+
+from settings import settings
+from src.assertions import Assertions
+from src.http_methods import MyRequests, AsyncMyRequests
+from src.paginator import Paginator, AsyncPaginator
+from data import get_delivery_endpoints
+
+
+# Перекрытие инкрементальных обходов: заказ, записанный с более ранним created_at уже после обхода, не теряется
+_SWEEP_OVERLAP = timedelta(seconds=60)
+# Пауза между обновлениями индекса, пока ожидаемый заказ еще не пришел из iiko
+_REFRESH_INTERVAL = 2.0
+
+
+class DeliveryIndex:
+    """
+    Индекс заказов Курьерики пункта выдачи за текущий день по external_id и external_number (заказы iiko).
+
+    Первый промах загружает все заказы пункта за сегодня одним постраничным обходом, дальше индекс дополняется
+    только заказами, созданными после уже известных (created_at_from - наибольший created_at сервера, а не
+    локальное время), поэтому поиск заказа - обращение к словарю и не больше одного запроса при промахе.
+    Одновременные промахи из разных потоков выполняют одно обновление. Заказ, который еще не пришел из iiko,
+    ожидается до DELIVERY_INDEX_TIMEOUT; заказ с другим статусом перечитывается по id.
+    """
+
+    _indexes = {}
+    _lock = threading.Lock()
+
+    def __init__(self, pickup_point_id: str):
+        self.pickup_point_id = pickup_point_id
+        self.url = get_delivery_endpoints().list_of_deliveries
+        self.assertions = Assertions()
+        self._by_external_id: Dict[str, dict] = {}
+        self._by_external_number: Dict[str, dict] = {}
+        self._cursor: Optional[datetime] = None  # наибольший created_at заказов в индексе (время сервера)
+        self._generation = 0
+        self._state_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._async_locks = weakref.WeakKeyDictionary()  # event loop -> asyncio.Lock
+
+    @classmethod
+    def get_current(cls, pickup_point_id: str = None) -> "DeliveryIndex":
+        """Общий индекс сессии для пункта выдачи (по умолчанию COURIERICA_PICKUP_POINT_ID)."""
+        pickup_point_id = pickup_point_id or settings.COURIERICA_PICKUP_POINT_ID
+        with cls._lock:
+            index = cls._indexes.get(pickup_point_id)
+            if index is None:
+                index = cls._indexes[pickup_point_id] = cls(pickup_point_id)
+            return index
+
+    def get(self, external_id: str) -> Optional[dict]:
+        """Заказ из индекса по external_id без запросов (None - заказа в индексе нет)."""
+        with self._state_lock:
+            return self._by_external_id.get(external_id)
+
+    def get_by_external_number(self, external_number: str) -> Optional[dict]:
+        """Заказ из индекса по external_number без запросов."""
+        with self._state_lock:
+            return self._by_external_number.get(external_number)
+
+    def find(self, external_id: str, headers: dict, status: str = None, timeout: float = None,
+             request: MyRequests = None) -> Optional[dict]:
+        """
+        Заказ по external_id (и статусу, если задан); при промахе индекс обновляется.
+
+        :param timeout: Сколько ждать появления заказа (по умолчанию DELIVERY_INDEX_TIMEOUT).
+        :return: Заказ или None, если он не появился за timeout.
+        """
+        request = request or MyRequests()
+        deadline = time.monotonic() + (settings.DELIVERY_INDEX_TIMEOUT if timeout is None else timeout)
+        own_sweep = None
+        while True:
+            generation = self._generation
+            delivery = self.get(external_id)
+            if delivery is not None and status is not None and delivery.get("status") != status:
+                delivery = self._reload(request, delivery["id"], headers)
+            if delivery is not None and (status is None or delivery.get("status") == status):
+                return delivery
+            if time.monotonic() >= deadline:
+                return None
+            if own_sweep == generation:
+                # Собственное обновление заказ не нашло: он еще не пришел из iiko
+                time.sleep(min(_REFRESH_INTERVAL, max(0.0, deadline - time.monotonic())))
+            with self._refresh_lock:
+                if self._generation == generation:  # иначе обновление уже выполнил другой поток
+                    self._apply(self._sweep(Paginator(request=request, cache=False), headers), swept=True)
+                    own_sweep = self._generation
+
+    async def afind(self, external_id: str, headers: dict, status: str = None, timeout: float = None,
+                    request: AsyncMyRequests = None) -> Optional[dict]:
+        """Асинхронный аналог find."""
+        request = request or AsyncMyRequests()
+        deadline = time.monotonic() + (settings.DELIVERY_INDEX_TIMEOUT if timeout is None else timeout)
+        lock = self._async_lock()
+        own_sweep = None
+        while True:
+            generation = self._generation
+            delivery = self.get(external_id)
+            if delivery is not None and status is not None and delivery.get("status") != status:
+                delivery = await self._areload(request, delivery["id"], headers)
+            if delivery is not None and (status is None or delivery.get("status") == status):
+                return delivery
+            if time.monotonic() >= deadline:
+                return None
+            if own_sweep == generation:
+                await asyncio.sleep(min(_REFRESH_INTERVAL, max(0.0, deadline - time.monotonic())))
+            async with lock:
+                if self._generation == generation:
+                    self._apply(await self._asweep(AsyncPaginator(request=request, cache=False), headers), swept=True)
+                    own_sweep = self._generation
+
+    def _async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            return self._async_locks.setdefault(loop, asyncio.Lock())
+
+    def _sweep_params(self) -> dict:
+        """
+        Фильтры обхода: весь текущий день, пока в индексе нет заказов с created_at, дальше - заказы начиная
+        с наибольшего created_at сервера (с перекрытием _SWEEP_OVERLAP; повторы заменяются по external_id).
+        """
+        with self._state_lock:
+            cursor = self._cursor
+        if cursor is None:
+            created_at_from = datetime.now().strftime("%Y-%m-%d")
+        else:
+            created_at_from = (cursor - _SWEEP_OVERLAP).isoformat(timespec="seconds")
+        return {"pickup_point_id": self.pickup_point_id, "created_at_from": created_at_from}
+
+    def _sweep(self, paginator: Paginator, headers: dict):
+        return paginator.get_all(self.url, "deliveries", self._sweep_params(), headers)
+
+    async def _asweep(self, paginator: AsyncPaginator, headers: dict):
+        return await paginator.get_all(self.url, "deliveries", self._sweep_params(), headers)
+
+    def _reload(self, request: MyRequests, delivery_id: str, headers: dict) -> dict:
+        """Перечитывает заказ по id (статус в индексе мог устареть)."""
+        response = request.get(url=f"{self.url}/{delivery_id}", headers=headers, cache=False)
+        self.assertions.assert_status_code(response, HTTPStatus.OK)
+        delivery = response.json()
+        self._apply([delivery])
+        return delivery
+
+    async def _areload(self, request: AsyncMyRequests, delivery_id: str, headers: dict) -> dict:
+        response = await request.get(url=f"{self.url}/{delivery_id}", headers=headers, cache=False)
+        self.assertions.assert_status_code(response, HTTPStatus.OK)
+        delivery = response.json()
+        self._apply([delivery])
+        return delivery
+
+    @staticmethod
+    def _created_at(delivery: dict) -> Optional[datetime]:
+        """created_at заказа (None - поля нет или формат не ISO 8601)."""
+        try:
+            return datetime.fromisoformat(delivery["created_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _apply(self, deliveries, swept: bool = False):
+        with self._state_lock:
+            for delivery in deliveries:
+                if delivery.get("external_id"):
+                    self._by_external_id[delivery["external_id"]] = delivery
+                if delivery.get("external_number"):
+                    self._by_external_number[delivery["external_number"]] = delivery
+                created_at = self._created_at(delivery)
+                if created_at is not None and (self._cursor is None or created_at > self._cursor):
+                    self._cursor = created_at
+            if swept:
+                self._generation += 1
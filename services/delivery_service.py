@@ -1,5 +1,5 @@
 import json
-from src.http_methods import MyRequests
+from src.http_methods import MyRequests, AsyncMyRequests, RequestSpec
 from src.assertions import Assertions
 from http import HTTPStatus
 from data import get_delivery_endpoints
@@ -19,6 +19,27 @@ class DeliveryService:
         print(f"Order with ID {delivery_id} created.")
         return delivery_id
 
+    def create_deliveries(self, get_test_name, data_list, headers, concurrency=None):
+        """Массовое создание заказов одним bulk-вызовом. Возвращает ID в порядке входных данных."""
+        results = self.request.send_many(
+            [RequestSpec("POST", self.delivery_url.create_delivery, data, headers) for data in data_list],
+            concurrency=concurrency,
+        )
+        delivery_ids = []
+        for result in self._raise_bulk_errors(results):
+            self.assertions.assert_status_code(response=result.response, expected_status_code=HTTPStatus.CREATED, test_name=get_test_name)
+            delivery_ids.append(result.response.json().get("id"))
+        print(f"Orders with IDs {delivery_ids} created.")
+        return delivery_ids
+
+    @staticmethod
+    def _raise_bulk_errors(results):
+        """Пробрасывает первую сетевую ошибку из результатов send_many."""
+        for result in results:
+            if not result.ok:
+                raise result.error
+        return results
+
     def assign_delivery(self, get_test_name, delivery_id, courier_id, headers):
         """Назначение курьера на заказ"""
         response = self.request.patch(
@@ -71,3 +92,62 @@ class DeliveryService:
         # print(f"Причина завершения доставки: {response_order.json().get('events')[0].get('comment')}")
             
         return response
+
+
+class AsyncDeliveryService(DeliveryService):
+    """Асинхронный аналог DeliveryService (методы возвращают корутины)."""
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def create_delivery(self, get_test_name, data, headers):
+        """Создание заказа"""
+        response = await self.request.post(url=self.delivery_url.create_delivery, data=data, headers=headers)
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.CREATED, test_name=get_test_name)
+        delivery_id = response.json().get("id")
+        print(f"Order with ID {delivery_id} created.")
+        return delivery_id
+
+    async def assign_delivery(self, get_test_name, delivery_id, courier_id, headers):
+        """Назначение курьера на заказ"""
+        response = await self.request.patch(
+            url=f"{self.delivery_url.list_of_deliveries}/{delivery_id}/courier/{courier_id}",
+            headers=headers
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"Courier {courier_id} is assigned to order {delivery_id}")
+        return response
+
+    async def complete_delivery(self, get_test_name, delivery_id, status, headers):
+        """Завершение доставки заказа"""
+        response = await self.request.patch(
+            url=f"{self.delivery_url.list_of_deliveries}/{delivery_id}/status/{status}",
+            headers=headers
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"Completion of delivery. Status: {status}, Order ID: {delivery_id}")
+        return response
+
+    async def complete_delivery_with_reason(self, get_test_name, delivery_id, status, reason, headers):
+        """Завершение доставки заказа с указанием причины (только для 'delivered' в режиме 'reason')."""
+        if status != "delivered":
+            return await self.complete_delivery(get_test_name, delivery_id, status, headers)
+
+        if not reason:
+            raise ValueError("It is necessary to indicate the reason for the completion of delivery outside the address.")
+
+        request_payload = {
+            "delivered": {
+                "reason": reason.get("reason"),
+                "comment": reason.get("comment")
+            }
+        }
+        response = await self.request.patch(
+            url=f"{self.delivery_url.list_of_deliveries}/{delivery_id}/status/{status}",
+            headers=headers,
+            data=json.dumps(request_payload)
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        print(f"Completion of delivery. Payload: {request_payload}, Status: {status}, Order ID: {delivery_id}")
+        return response
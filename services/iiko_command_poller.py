@@ -0,0 +1,206 @@
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from settings import settings
+from functions import percentile
+from src.http_methods import MyRequests, AsyncMyRequests, RequestSpec
+from src.metrics import HttpMetrics
+from data import get_iiko_endpoints
+
+
+SUCCESS = "Success"
+ERROR = "Error"
+_BACKOFF = 1.6
+
+
+@dataclass
+class _Command:
+    correlation_id: str
+    organization_id: str
+    headers: dict
+    deadline: float
+    interval: float
+    submitted: float = field(default_factory=time.monotonic)
+    next_check: float = 0.0
+    in_flight: bool = False
+    future: Future = field(default_factory=Future)
+
+
+class CommandPoller:
+    """
+    Общий опрос статусов команд IIKO (/commands/status) для всех ожидающих correlationId.
+
+    Каждая команда получает Future с результатом (True - Success, False - Error или таймаут). Первая проверка -
+    через IIKO_POLL_INITIAL_INTERVAL, дальше интервал растет до IIKO_POLL_MAX_INTERVAL. Проверки всех команд,
+    подошедших по времени, отправляются одним раундом, не больше IIKO_POLL_CONCURRENCY запросов одновременно,
+    поэтому нагрузка на IIKO ограничена при любом числе команд. Раунды выполняет один из ожидающих потоков
+    (или одна из задач asyncio), остальные ждут свои Future.
+    """
+
+    _current = None
+    _lock = threading.Lock()
+
+    def __init__(self, initial_interval: float = None, max_interval: float = None, concurrency: int = None):
+        self.initial_interval = settings.IIKO_POLL_INITIAL_INTERVAL if initial_interval is None else initial_interval
+        self.max_interval = settings.IIKO_POLL_MAX_INTERVAL if max_interval is None else max_interval
+        self.concurrency = concurrency or settings.IIKO_POLL_CONCURRENCY
+        self.url = get_iiko_endpoints().check_status
+        self._commands: Dict[str, _Command] = {}
+        self._latencies: List[float] = []
+        self._state_lock = threading.Lock()
+        self._driver = threading.Lock()
+
+    @classmethod
+    def get_current(cls):
+        """Общий поллер сессии."""
+        if cls._current is None:
+            with cls._lock:
+                if cls._current is None:
+                    cls._current = cls()
+        return cls._current
+
+    def submit(self, headers: dict, organization_id: str, correlation_id: str, timeout: float = None) -> Future:
+        """Ставит команду на отслеживание (повторная постановка того же correlationId возвращает тот же Future)."""
+        timeout = settings.IIKO_COMMAND_TIMEOUT if timeout is None else timeout
+        with self._state_lock:
+            command = self._commands.get(correlation_id)
+            if command is None:
+                now = time.monotonic()
+                command = self._commands[correlation_id] = _Command(
+                    correlation_id, organization_id, headers,
+                    deadline=now + timeout, interval=self.initial_interval, next_check=now + self.initial_interval,
+                )
+            return command.future
+
+    def wait_all(self, headers: dict, organization_id: str, correlation_ids: List[str], timeout: float = None) -> dict:
+        """
+        Ожидает выполнения команд.
+
+        :return: Словарь correlationId -> True (Success) / False (Error или таймаут).
+        """
+        futures = {cid: self.submit(headers, organization_id, cid, timeout) for cid in correlation_ids}
+        pending = set(futures.values())
+        while pending:
+            if self._driver.acquire(blocking=False):
+                try:
+                    self._round(MyRequests().send_many)
+                finally:
+                    self._driver.release()
+                pending = {future for future in pending if not future.done()}
+            else:
+                pending = wait(pending, timeout=self.initial_interval, return_when=FIRST_COMPLETED).not_done
+        return {cid: future.result() for cid, future in futures.items()}
+
+    async def await_all(self, headers: dict, organization_id: str, correlation_ids: List[str],
+                        timeout: float = None) -> dict:
+        """Асинхронный аналог wait_all."""
+        futures = {cid: self.submit(headers, organization_id, cid, timeout) for cid in correlation_ids}
+        while not all(future.done() for future in futures.values()):
+            if self._driver.acquire(blocking=False):
+                try:
+                    await self._round_async(AsyncMyRequests().send_many)
+                finally:
+                    self._driver.release()
+            else:
+                await asyncio.sleep(self.initial_interval)
+        return {cid: future.result() for cid, future in futures.items()}
+
+    def _due(self):
+        """Команды для очередного раунда и пауза до следующей проверки, если проверять пока нечего."""
+        now = time.monotonic()
+        with self._state_lock:
+            for command in list(self._commands.values()):
+                if not command.in_flight and now >= command.deadline:
+                    self._resolve(command, False, "Timeout", now)
+            waiting = sorted((c for c in self._commands.values() if not c.in_flight), key=lambda c: c.next_check)
+            due = [command for command in waiting if command.next_check <= now][:self.concurrency]
+            for command in due:
+                command.in_flight = True
+        if due or not waiting:
+            return due, 0.0
+        return due, min(min(command.next_check, command.deadline) for command in waiting) - now
+
+    def _specs(self, due: List[_Command]) -> List[RequestSpec]:
+        return [
+            RequestSpec("POST", self.url, json.dumps({
+                "organizationId": command.organization_id,
+                "correlationId": command.correlation_id,
+            }), command.headers)
+            for command in due
+        ]
+
+    @staticmethod
+    def _state(result) -> Optional[str]:
+        """Состояние команды из ответа /commands/status (None - ошибка запроса, не 2xx или тело не разобрано)."""
+        if result is None or not result.ok or not result.response.is_success:
+            return None
+        try:
+            return result.response.json().get("state")
+        except (ValueError, AttributeError):
+            return None
+
+    def _apply(self, due: List[_Command], results):
+        """
+        Результаты раунда. Команда без ответа или с нераспознанным ответом считается ожидающей
+        и проверяется снова; results=None - раунд прерван ошибкой.
+        """
+        now = time.monotonic()
+        results = list(results or [])
+        states = [self._state(result) for result in results] + [None] * (len(due) - len(results))
+        with self._state_lock:
+            for command, state in zip(due, states):
+                command.in_flight = False
+                if state in (SUCCESS, ERROR):
+                    self._resolve(command, state == SUCCESS, state, now)
+                else:
+                    command.interval = min(self.max_interval, command.interval * _BACKOFF)
+                    command.next_check = now + command.interval
+
+    def _round(self, send_many):
+        due, pause = self._due()
+        if due:
+            results = None
+            try:
+                results = send_many(self._specs(due), concurrency=self.concurrency)
+            finally:
+                self._apply(due, results)
+        elif pause > 0:
+            time.sleep(pause)
+
+    async def _round_async(self, send_many):
+        due, pause = self._due()
+        if due:
+            results = None
+            try:
+                results = await send_many(self._specs(due), concurrency=self.concurrency)
+            finally:
+                self._apply(due, results)
+        elif pause > 0:
+            await asyncio.sleep(pause)
+
+    def _resolve(self, command: _Command, success: bool, state: str, now: float):
+        """Завершает команду (вызывается под _state_lock)."""
+        self._commands.pop(command.correlation_id, None)
+        latency = now - command.submitted
+        self._latencies.append(latency)
+        HttpMetrics.increment("iiko.commands")
+        HttpMetrics.increment("iiko.confirm_seconds", latency)
+        if not success:
+            HttpMetrics.increment("iiko.commands_failed")
+        print(f"Command {command.correlation_id}: {state} in {latency:.1f}s")
+        command.future.set_result(success)
+
+    @classmethod
+    def summary_line(cls) -> str:
+        """Строка с задержками подтверждения команд за сессию (пустая, если команд не было)."""
+        poller = cls._current
+        if poller is None or not poller._latencies:
+            return ""
+        latencies = poller._latencies
+        return (f"iiko command confirmation (s): count={len(latencies)} p50={percentile(latencies, 50):.1f} "
+                f"p95={percentile(latencies, 95):.1f} max={max(latencies):.1f}")
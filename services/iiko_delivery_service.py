@@ -1,19 +1,64 @@
 import json
-import time
+import asyncio
+import threading
 import allure
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from http import HTTPStatus
+from typing import List
 
 from settings import settings
-from functions import load_json, retry
-from src.http_methods import MyRequests
+from functions import load_json
+from src.http_methods import MyRequests, AsyncMyRequests, RequestSpec
 from src.assertions import Assertions
+from src.attachments import AllureAttachments
 from src.validator import Validator
+from services.iiko_command_poller import CommandPoller
+from services.delivery_index import DeliveryIndex
 from generator.iiko_delivery_generator import IikoDeliveryGenerator
 from src.prepare_data.prepare_iiko_delivery_data import PrepareIikoDeliveryData
 from data import get_delivery_endpoints, get_iiko_endpoints
 
 
+# Шаги очистки заказов IIKO
+CANCEL = "cancel"
+DELIVER = "deliver"
+CLOSE = "close"
+_CLEANUP_MESSAGES = {
+    CANCEL: 'Заказ - {} - успешно отменен',
+    DELIVER: 'Статус заказа - {} - успешно изменен на Delivered',
+    CLOSE: 'Заказ - {} - успешно закрыт',
+}
+# Окна по дате доставки для параллельной загрузки заказов дня (см. _today_orders_specs)
+_ORDERS_WINDOW_HOURS = 6
+_ORDERS_WINDOW_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass
+class CleanupSummary:
+    """Итог очистки заказов IIKO: число выполненных команд по шагам и ошибки (order_id, шаг, ошибка)."""
+    cancelled: int = 0
+    delivered: int = 0
+    closed: int = 0
+    failures: List[tuple] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, order_id, step, error=None):
+        with self._lock:
+            if error:
+                self.failures.append((order_id, step, error))
+                print(f'Ошибка ({step}) заказа {order_id}: {error}')
+                return
+            counter = {CANCEL: "cancelled", DELIVER: "delivered", CLOSE: "closed"}[step]
+            setattr(self, counter, getattr(self, counter) + 1)
+            print(_CLEANUP_MESSAGES[step].format(order_id))
+
+    def __str__(self):
+        return (f'Очистка заказов IIKO: отменено {self.cancelled}, доставлено {self.delivered}, '
+                f'закрыто {self.closed}, ошибок {len(self.failures)}')
+
+
 class IikoDeliveryService:
     def __init__(self):
         self.iiko_url = get_iiko_endpoints()
@@ -27,6 +72,76 @@ class IikoDeliveryService:
 
     @allure.step("Создание заказа в IIKO с заданным адресом и duration")
     def create_order(self, address_key, duration, iiko_headers):
+        info, data = self._prepare_order(address_key, duration)
+        response = self.request.post(url=self.iiko_url.create_order, data=data, headers=iiko_headers)
+        self.assertions.assert_status_code(response, HTTPStatus.OK)
+
+        correlation_id = response.json()["correlationId"]
+        order_id = response.json()["orderInfo"]["id"]
+
+        self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+        print(f"Created order: {order_id} ({address_key}), duration={(duration / 60):.2f} hours")
+        return order_id, info.delivery_point
+
+    @allure.step("Массовое создание заказов в IIKO")
+    def create_orders_bulk(self, specs, iiko_headers):
+        """
+        Создает заказы IIKO параллельно (send_many) и подтверждает все команды создания общими циклами опроса.
+
+        :param specs: Список пар (address_key, duration).
+        :return: Список (order_id, delivery_point) в порядке specs.
+        :raises AssertionError: Со всеми ошибками, если хотя бы один заказ не создан или команда не выполнена.
+        """
+        prepared = [self._prepare_order(address_key, duration) for address_key, duration in specs]
+        results = self.request.send_many([
+            RequestSpec("POST", self.iiko_url.create_order, data, iiko_headers) for _, data in prepared
+        ])
+        orders, correlation_ids, failures = self._created_orders(specs, prepared, results)
+        statuses = self.wait_for_order_statuses(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_ids)
+        self._check_created_orders(specs, orders, correlation_ids, statuses, failures)
+        self._print_created_orders(specs, orders)
+        return orders
+
+    def _created_orders(self, specs, prepared, results):
+        """
+        ID заказов с точками доставки и correlationId команд создания из результатов send_many.
+        Ошибки отдельных заказов не прерывают разбор, а возвращаются списком (failures).
+        """
+        orders, correlation_ids, failures = [], [], []
+        for (address_key, _), (info, _), result in zip(specs, prepared, results):
+            try:
+                if not result.ok:
+                    raise result.error
+                self.assertions.assert_status_code(result.response, HTTPStatus.OK)
+                body = result.response.json()
+                order = (body["orderInfo"]["id"], info.delivery_point)
+                correlation_id = body["correlationId"]
+            except Exception as ex:
+                failures.append(f"{address_key}: {type(ex).__name__}: {ex}")
+                continue
+            orders.append(order)
+            correlation_ids.append(correlation_id)
+        return orders, correlation_ids, failures
+
+    @staticmethod
+    def _check_created_orders(specs, orders, correlation_ids, statuses, failures):
+        """Все заказы созданы и команды создания выполнены (Success), иначе AssertionError со всеми ошибками."""
+        failures = failures + [
+            f"{order_id}: create command {correlation_id} was not confirmed (Error or timeout)"
+            for (order_id, _), correlation_id in zip(orders, correlation_ids) if not statuses.get(correlation_id)
+        ]
+        if failures:
+            raise AssertionError(
+                f"{len(failures)} of {len(specs)} IIKO orders were not created:\n" + "\n".join(failures)
+            )
+
+    @staticmethod
+    def _print_created_orders(specs, orders):
+        for (address_key, duration), (order_id, _) in zip(specs, orders):
+            print(f"Created order: {order_id} ({address_key}), duration={(duration / 60):.2f} hours")
+
+    def _prepare_order(self, address_key, duration):
+        """Генерация данных заказа IIKO для адреса из конфига. Возвращает (info, JSON-строка)."""
         if address_key not in self.address_data:
             raise ValueError(f"Address '{address_key}' not found in address config")
 
@@ -46,110 +161,159 @@ class IikoDeliveryService:
             }
         ))
         data = self.iiko_delivery_data.prepare_iiko_delivery_data(info=info)
-        response = self.request.post(url=self.iiko_url.create_order, data=data, headers=iiko_headers)
-        self.assertions.assert_status_code(response, HTTPStatus.OK)
-
-        correlation_id = response.json()["correlationId"]
-        order_id = response.json()["orderInfo"]["id"]
-
-        self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
-        print(f"Created order: {order_id} ({address_key}), duration={(duration / 60):.2f} hours")
-        return order_id, info.delivery_point
+        return info, data
     
     @allure.step("Ожидание успешного статуса заказа IIKO")
-    def wait_for_order_status(self, headers, organization_id, correlation_id, timeout=60):
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_response = self.request.post(
-                url=self.iiko_url.check_status,
-                data=json.dumps({
-                    "organizationId": organization_id,
-                    "correlationId": correlation_id
-                }),
-                headers=headers
-            )
-            print(status_response.json())
+    def wait_for_order_status(self, headers, organization_id, correlation_id, timeout=None):
+        """Ожидание выполнения команды IIKO через общий поллер (True - Success, False - Error или таймаут)."""
+        return self.wait_for_order_statuses(headers, organization_id, [correlation_id], timeout)[correlation_id]
+
+    @allure.step("Ожидание успешного статуса команд IIKO")
+    def wait_for_order_statuses(self, headers, organization_id, correlation_ids, timeout=None):
+        """
+        Ожидание выполнения нескольких команд IIKO через общий поллер (CommandPoller): статусы всех команд
+        проверяются общими раундами, поэтому время ожидания - как у самой медленной команды, а не сумма.
 
-            status = status_response.json().get("state")
-            if status == "Success":
-                return True
-            elif status == "Error":
-                break
-            time.sleep(3)
-        return False
+        :return: Словарь correlationId -> True (Success) / False (Error или таймаут).
+        """
+        return CommandPoller.get_current().wait_all(headers, organization_id, correlation_ids, timeout)
 
     @allure.step("Поиск заказа в Курьерике по external_id")
-    @retry(max_attempts=3, delay=10)
     def find_delivery_by_external_id(self, external_id, delivery_point, auth_headers, status="new"):
-        today = datetime.now().strftime("%Y-%m-%d")
-        search_address = delivery_point["address"]["line1"]
-        print(search_address)
-
-        response = self.request.get(
-            url=f"{self.saas_url.list_of_deliveries}"
-                f"?pickup_point_id={settings.COURIERICA_PICKUP_POINT_ID}"
-                f"&created_at_from={today}"
-                f"&statuses={status}"
-                f"&search={search_address}"
-                f"&page=1&per_page=10",
-            headers=auth_headers,
-        )
-        self.assertions.assert_status_code(response, HTTPStatus.OK)
+        """Заказ Курьерики по external_id через общий индекс пункта выдачи (см. DeliveryIndex)."""
+        delivery = DeliveryIndex.get_current().find(external_id, auth_headers, status, request=self.request)
+        return self._check_delivery_found(delivery, external_id, delivery_point)
 
-        deliveries = response.json().get("deliveries") or []
-        for delivery in deliveries:
-            if delivery.get("external_id") == external_id:
-                print("Delivery found:", delivery.get("external_number"))
-                return delivery
+    @staticmethod
+    def _check_delivery_found(delivery, external_id, delivery_point):
+        if delivery is None:
+            raise AssertionError(f"Delivery with external_id {external_id} not found. "
+                                 f"Delivery point: {delivery_point['address']['line1']}")
+        print("Delivery found:", delivery.get("external_number"))
+        return delivery
 
-        raise AssertionError(f"Delivery with external_id {external_id} not found. "
-                             f"Searched address: {search_address}")
-    
     @allure.step("Отмена заказа в IIKO")
     def cancel_order(self, order_id, iiko_headers, test_name=None):
-        cancel_response = self.request.post(
-            url=self.iiko_url.cancel_order,
-            data=json.dumps({
-                "organizationId": settings.IIKO_ORGANIZATION_ID,
-                "orderId": order_id
-            }),
-            headers=iiko_headers    
-        )
-        correlation_id = cancel_response.json()["correlationId"]
-        self.assertions.assert_status_code(cancel_response, HTTPStatus.OK, test_name)
-        self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+        self._send_order_command(self.iiko_url.cancel_order, order_id, iiko_headers, test_name)
 
     @allure.step("Доставка заказа в IIKO")
     def deliver_order(self, order_id, iiko_headers, test_name=None):
-        deliver_response = self.request.post(
-            url=self.iiko_url.deliver_order,
-            data=json.dumps({
-                "organizationId": settings.IIKO_ORGANIZATION_ID,
-                "orderId": order_id,
-                "deliveryStatus": "Delivered"
-            }),
-            headers=iiko_headers    
+        self._send_order_command(
+            self.iiko_url.deliver_order, order_id, iiko_headers, test_name, deliveryStatus="Delivered"
         )
-        correlation_id = deliver_response.json()["correlationId"]
-        self.assertions.assert_status_code(deliver_response, HTTPStatus.OK, test_name)
-        self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
 
     @allure.step("Закрытие заказа в IIKO")
     def close_order(self, order_id, iiko_headers, test_name=None):
-        close_response = self.request.post(
-            url=self.iiko_url.close_order,
-            data=json.dumps({
-                "organizationId": settings.IIKO_ORGANIZATION_ID,
-                "orderId": order_id
-            }),
+        self._send_order_command(self.iiko_url.close_order, order_id, iiko_headers, test_name)
+
+    def _send_order_command(self, url, order_id, iiko_headers, test_name=None, **extra):
+        """Отправка команды над заказом и ожидание её выполнения (True - команда выполнена)."""
+        response = self.request.post(
+            url=url,
+            data=self._order_command_payload(order_id, **extra),
             headers=iiko_headers
         )
-        correlation_id = close_response.json()["correlationId"]
-        self.assertions.assert_status_code(close_response, HTTPStatus.OK, test_name)
-        self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+        correlation_id = response.json()["correlationId"]
+        self.assertions.assert_status_code(response, HTTPStatus.OK, test_name)
+        return self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+
+    @staticmethod
+    def _order_command_payload(order_id, **extra):
+        """Тело запроса команды над заказом IIKO (отмена, доставка, закрытие)."""
+        return json.dumps({
+            "organizationId": settings.IIKO_ORGANIZATION_ID,
+            "orderId": order_id,
+            **extra
+        })
 
     @allure.step("Отмена и закрытие всех заказов в IIKO")
-    def cancel_and_close_all_orders(self, iiko_headers, test_name=None):
+    def cancel_and_close_all_orders(self, iiko_headers, test_name=None, concurrency=None):
+        """
+        Отмена, доставка и закрытие всех заказов IIKO за текущий день.
+
+        Заказы обрабатываются параллельно (не больше concurrency, по умолчанию HTTP_BULK_CONCURRENCY): отмены
+        выполняются одновременно, а доставленный заказ сразу переходит к закрытию, не дожидаясь остальных.
+
+        :return: CleanupSummary - число выполненных команд и ошибки.
+        """
+        results = self.request.send_many(self._today_orders_specs(iiko_headers))
+        plan = self._cleanup_plan(self._collect_orders(results, test_name))
+        summary = CleanupSummary()
+        if not plan:
+            print('Нет заказов для отмены или закрытия')
+            return summary
+        self._print_cleanup_plan(plan)
+
+        workers = min(concurrency or settings.HTTP_BULK_CONCURRENCY, len(plan))
+        with AllureAttachments.collect() as bind, ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                bind(lambda item: self._run_cleanup(item[0], item[1], iiko_headers, test_name, summary)), plan.items()
+            ))
+        print(summary)
+        return summary
+
+    def _run_cleanup(self, order_id, steps, iiko_headers, test_name, summary):
+        """Шаги очистки одного заказа по порядку; на первой ошибке обработка заказа прекращается."""
+        for step in steps:
+            url, extra = self._cleanup_command(step)
+            try:
+                confirmed = self._send_order_command(url, order_id, iiko_headers, test_name, **extra)
+                error = None if confirmed else "command was not confirmed"
+            except Exception as e:
+                error = str(e)
+            summary.record(order_id, step, error)
+            if error:
+                return
+
+    def _cleanup_command(self, step):
+        """URL и дополнительные поля команды для шага очистки."""
+        return {
+            CANCEL: (self.iiko_url.cancel_order, {}),
+            DELIVER: (self.iiko_url.deliver_order, {"deliveryStatus": "Delivered"}),
+            CLOSE: (self.iiko_url.close_order, {}),
+        }[step]
+
+    def _today_orders_specs(self, iiko_headers):
+        """
+        Запросы списка заказов IIKO за текущий день для параллельной отправки (send_many).
+
+        Это не постраничный обход: by_delivery_date_and_status не делит ответ на страницы и возвращает все заказы
+        из интервала дат доставки. Прежний единственный запрос (deliveryDateFrom - начало дня, без deliveryDateTo)
+        разбит на окна, которые вместе покрывают тот же интервал: последнее окно открыто, а соседние окна
+        перекрываются на _ORDERS_WINDOW_OVERLAP, поэтому заказ на границе окна попадает хотя бы в одно из них
+        при любой трактовке границ. Повторы убираются по id в _collect_orders.
+        """
+        day_start = datetime.combine(datetime.now().date(), datetime.min.time())
+        windows = range(0, 24, _ORDERS_WINDOW_HOURS)
+        specs = []
+        for index, hour in enumerate(windows):
+            payload = {
+                "organizationIds": [settings.IIKO_ORGANIZATION_ID],
+                "deliveryDateFrom": (day_start + timedelta(hours=hour)).isoformat(),
+                "status": []
+            }
+            if index < len(windows) - 1:
+                window_end = day_start + timedelta(hours=hour + _ORDERS_WINDOW_HOURS) + _ORDERS_WINDOW_OVERLAP
+                payload["deliveryDateTo"] = window_end.isoformat()
+            specs.append(RequestSpec("POST", self.iiko_url.list_of_orders_by_statuses_and_dates,
+                                     json.dumps(payload), iiko_headers))
+        return specs
+
+    def _collect_orders(self, results, test_name=None):
+        """Заказы всех организаций из всех окон (без повторов)."""
+        orders = {}
+        for result in results:
+            if not result.ok:
+                raise result.error
+            self.assertions.assert_status_code(result.response, HTTPStatus.OK, test_name)
+            for organization in result.response.json().get('ordersByOrganizations') or []:
+                for order in organization.get('orders') or []:
+                    orders[order['id']] = order
+        return list(orders.values())
+
+    @staticmethod
+    def _cleanup_plan(orders):
+        """Шаги очистки для каждого заказа: отмена, доставка и закрытие или только закрытие."""
         status_cancel = [
             "Unconfirmed",
             "WaitCooking",
@@ -161,71 +325,120 @@ class IikoDeliveryService:
         status_delivered = 'OnWay'
         status_closed = 'Delivered'
 
-        # Получаем все заказы за текущий день
-        current_date = datetime.now().date()
-        response = self.request.post(
-            url=self.iiko_url.list_of_orders_by_statuses_and_dates,
-            data=json.dumps({
-                "organizationIds": [settings.IIKO_ORGANIZATION_ID],
-                "deliveryDateFrom": f"{current_date}T00:00:00",
-                "status": []
-            }),
-            headers=iiko_headers
-        )
-        self.assertions.assert_status_code(response, HTTPStatus.OK, test_name)
-
-        data = response.json()
-        if not data.get('ordersByOrganizations'):
-            print('Нет заказов для отмены или закрытия')
-            return
-        
-        data_order_cancel = []
-        data_order_deliv = []
-        data_order_closed = []
-
-        for order in data['ordersByOrganizations'][0]['orders']:
+        plan = {}
+        for order in orders:
             if order['creationStatus'] == 'Success':
                 if order['order']['status'] in status_cancel:
-                    data_order_cancel.append(order['id'])
+                    plan[order['id']] = (CANCEL,)
                 elif order['order']['status'] == status_delivered:
-                    data_order_deliv.append(order['id'])
+                    plan[order['id']] = (DELIVER, CLOSE)
                 elif order['order']['status'] == status_closed:
-                    data_order_closed.append(order['id'])
+                    plan[order['id']] = (CLOSE,)
+        return plan
 
+    @staticmethod
+    def _print_cleanup_plan(plan):
+        """Вывод списков заказов, которые будут обработаны."""
+        data_order_cancel = [order_id for order_id, steps in plan.items() if steps[0] == CANCEL]
+        data_order_deliv = [order_id for order_id, steps in plan.items() if steps[0] == DELIVER]
+        data_order_closed = [order_id for order_id, steps in plan.items() if steps[0] == CLOSE]
         print(f'Заказы для отмены [{len(data_order_cancel)}]: {data_order_cancel}')
         print(f'Заказы для доставки [{len(data_order_deliv)}]: {data_order_deliv}')
         print(f'Заказы для закрытия [{len(data_order_closed)}]: {data_order_closed}')
 
-        # Обрабатываем заказы для отмены
-        if data_order_cancel:
-            for order_id in data_order_cancel:
-                try:
-                    self.cancel_order(order_id, iiko_headers, test_name)
-                    print(f'Заказ - {order_id} - успешно отменен')
-                except Exception as e:
-                    print(f'Ошибка отмены заказа {order_id}: {str(e)}')
-        else:
-            print('Нет заказов для отмены')
-
-        # Обрабатываем заказы для доставки
-        if data_order_deliv:
-            for order_id in data_order_deliv:
-                try:
-                    self.deliver_order(order_id, iiko_headers, test_name)
-                    data_order_closed.append(order_id)
-                    print(f'Статус заказа - {order_id} - успешно изменен на Delivered')
-                except Exception as e:
-                    print(f'Ошибка изменения статуса заказа {order_id}: {str(e)}')
-        else:
-            print('Нет заказов для изменения статуса')
-
-        # Обрабатываем заказы для закрытия
-        if data_order_closed:
-            for order_id in data_order_closed:
-                try:
-                    self.close_order(order_id, iiko_headers, test_name)
-                    print(f'Заказ - {order_id} - успешно закрыт')
-                except Exception as e:
-                    print(f'Ошибка закрытия заказа {order_id}: {str(e)}')
-        else:
-            print('Нет заказов для закрытия')
\ No newline at end of file
+
+class AsyncIikoDeliveryService(IikoDeliveryService):
+    """
+    Асинхронный аналог IikoDeliveryService (методы возвращают корутины).
+    Позволяет создавать и обрабатывать заказы конкурентно, например через asyncio.gather.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def create_order(self, address_key, duration, iiko_headers):
+        info, data = self._prepare_order(address_key, duration)
+        response = await self.request.post(url=self.iiko_url.create_order, data=data, headers=iiko_headers)
+        self.assertions.assert_status_code(response, HTTPStatus.OK)
+
+        correlation_id = response.json()["correlationId"]
+        order_id = response.json()["orderInfo"]["id"]
+
+        await self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+        print(f"Created order: {order_id} ({address_key}), duration={(duration / 60):.2f} hours")
+        return order_id, info.delivery_point
+
+    async def create_orders_bulk(self, specs, iiko_headers):
+        prepared = [self._prepare_order(address_key, duration) for address_key, duration in specs]
+        results = await self.request.send_many([
+            RequestSpec("POST", self.iiko_url.create_order, data, iiko_headers) for _, data in prepared
+        ])
+        orders, correlation_ids, failures = self._created_orders(specs, prepared, results)
+        statuses = await self.wait_for_order_statuses(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_ids)
+        self._check_created_orders(specs, orders, correlation_ids, statuses, failures)
+        self._print_created_orders(specs, orders)
+        return orders
+
+    async def wait_for_order_status(self, headers, organization_id, correlation_id, timeout=None):
+        return (await self.wait_for_order_statuses(headers, organization_id, [correlation_id], timeout))[correlation_id]
+
+    async def wait_for_order_statuses(self, headers, organization_id, correlation_ids, timeout=None):
+        return await CommandPoller.get_current().await_all(headers, organization_id, correlation_ids, timeout)
+
+    async def find_delivery_by_external_id(self, external_id, delivery_point, auth_headers, status="new"):
+        delivery = await DeliveryIndex.get_current().afind(external_id, auth_headers, status, request=self.request)
+        return self._check_delivery_found(delivery, external_id, delivery_point)
+
+    async def _send_order_command(self, url, order_id, iiko_headers, test_name=None, **extra):
+        """Отправка команды над заказом и ожидание её выполнения (True - команда выполнена)."""
+        response = await self.request.post(
+            url=url,
+            data=self._order_command_payload(order_id, **extra),
+            headers=iiko_headers
+        )
+        correlation_id = response.json()["correlationId"]
+        self.assertions.assert_status_code(response, HTTPStatus.OK, test_name)
+        return await self.wait_for_order_status(iiko_headers, settings.IIKO_ORGANIZATION_ID, correlation_id)
+
+    async def cancel_order(self, order_id, iiko_headers, test_name=None):
+        await self._send_order_command(self.iiko_url.cancel_order, order_id, iiko_headers, test_name)
+
+    async def deliver_order(self, order_id, iiko_headers, test_name=None):
+        await self._send_order_command(
+            self.iiko_url.deliver_order, order_id, iiko_headers, test_name, deliveryStatus="Delivered"
+        )
+
+    async def close_order(self, order_id, iiko_headers, test_name=None):
+        await self._send_order_command(self.iiko_url.close_order, order_id, iiko_headers, test_name)
+
+    async def cancel_and_close_all_orders(self, iiko_headers, test_name=None, concurrency=None):
+        results = await self.request.send_many(self._today_orders_specs(iiko_headers))
+        plan = self._cleanup_plan(self._collect_orders(results, test_name))
+        summary = CleanupSummary()
+        if not plan:
+            print('Нет заказов для отмены или закрытия')
+            return summary
+        self._print_cleanup_plan(plan)
+
+        semaphore = asyncio.Semaphore(concurrency or settings.HTTP_BULK_CONCURRENCY)
+
+        async def _run(order_id, steps):
+            async with semaphore:
+                await self._run_cleanup(order_id, steps, iiko_headers, test_name, summary)
+
+        await asyncio.gather(*[_run(order_id, steps) for order_id, steps in plan.items()])
+        print(summary)
+        return summary
+
+    async def _run_cleanup(self, order_id, steps, iiko_headers, test_name, summary):
+        for step in steps:
+            url, extra = self._cleanup_command(step)
+            try:
+                confirmed = await self._send_order_command(url, order_id, iiko_headers, test_name, **extra)
+                error = None if confirmed else "command was not confirmed"
+            except Exception as e:
+                error = str(e)
+            summary.record(order_id, step, error)
+            if error:
+                return
@@ -1,4 +1,4 @@
-from src.http_methods import MyRequests
+from src.http_methods import MyRequests, AsyncMyRequests
 from src.assertions import Assertions
 from http import HTTPStatus
 from data import get_pickup_point_endpoints
@@ -29,4 +29,33 @@ class PickupPointService:
         courier_delivered_mode_distance = response.json().get("courier_delivered_mode_distance")
         self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
         print(f"Courier delivery mode at pickup point {pickup_point_id}: {courier_delivered_mode}, {courier_delivered_mode_distance}")
-        return courier_delivered_mode, courier_delivered_mode_distance
\ No newline at end of file
+        return courier_delivered_mode, courier_delivered_mode_distance
+
+
+class AsyncPickupPointService(PickupPointService):
+    """Асинхронный аналог PickupPointService (методы возвращают корутины)."""
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def turn_on_delivery_mode_allow(self, get_test_name, pickup_point_id, headers):
+        """Включение режима доставки курьером 'Без ограничений'"""
+        response = await self.request.patch(
+            url=f"{self.pickup_point_url.list_of_pickup_points}/{pickup_point_id}/courier_delivered_mode/allow",
+            headers=headers
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.NO_CONTENT, test_name=get_test_name)
+        return response
+
+    async def get_courier_delivery_mode(self, get_test_name, pickup_point_id, headers):
+        """Получение настройки на пункте выдачи - Ограничение на кнопку 'Передал' в приложении курьера"""
+        response = await self.request.get(
+            url=f"{self.pickup_point_url.list_of_pickup_points}/{pickup_point_id}",
+            headers=headers
+        )
+        courier_delivered_mode = response.json().get("courier_delivered_mode")
+        courier_delivered_mode_distance = response.json().get("courier_delivered_mode_distance")
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
+        print(f"Courier delivery mode at pickup point {pickup_point_id}: {courier_delivered_mode}, {courier_delivered_mode_distance}")
+        return courier_delivered_mode, courier_delivered_mode_distance
@@ -1,6 +1,7 @@
 import json
-from src.http_methods import MyRequests
+from src.http_methods import MyRequests, AsyncMyRequests
 from src.assertions import Assertions
+from src.paginator import Paginator, AsyncPaginator
 from http import HTTPStatus
 from data import get_route_endpoints
 
@@ -11,33 +12,42 @@ class RouteService:
         self.route_url = get_route_endpoints() 
         self.assertions = Assertions()
 
-    def get_routes(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers):
+    def get_routes(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers, page=1):
         """
-        Получить маршруты на основе фильтров.
+        Получить страницу маршрутов на основе фильтров.
 
         :param company_id: ID компании.
         :param courier_id: ID курьера.
         :param pickup_point_id: ID пункта выдачи.
         :param date: Дата фильтрации (строка в формате 'YYYY-MM-DD').
+        :param page: Номер страницы.
         :return: JSON-ответ с маршрутами.
         """
-        params = {
-            "page": 1,
-            "company_id": company_id,
-            "courier_ids[]": courier_id,
-            "pickup_point_ids[]": pickup_point_id,
-            "status_updated_at_from": date,
-            "status_updated_at_till": date,
-        }
+        params = self._get_routes_params(company_id, courier_id, pickup_point_id, date)
 
+        # Статус маршрута опрашивается повторными запросами: ответ не должен браться из кэша
         response = self.request.get(
             url=self.route_url.list_of_routes,
-            data=params,
-            headers=headers
+            data={**params, "page": page},
+            headers=headers,
+            cache=False,
         )
         self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
         return response
 
+    def get_all_routes(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers):
+        """
+        Получить маршруты со всех страниц (страницы после первой загружаются параллельно).
+
+        :return: Список маршрутов.
+        """
+        return Paginator(request=self.request, test_name=get_test_name).get_all(
+            url=self.route_url.list_of_routes,
+            items_key="routes",
+            params=self._get_routes_params(company_id, courier_id, pickup_point_id, date),
+            headers=headers,
+        )
+
     def get_route_status(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers):
         """
         Получить и проверить статус первого маршрута на основе фильтров.
@@ -49,8 +59,21 @@ class RouteService:
         :return: Статус маршрута (строка).
         """
         routes = self.get_routes(get_test_name, company_id, courier_id, pickup_point_id, date, headers)
-        routes_data = routes.json()
+        return self._check_first_route(get_test_name, courier_id, routes.json())
+
+    @staticmethod
+    def _get_routes_params(company_id, courier_id, pickup_point_id, date):
+        """Параметры фильтрации списка маршрутов."""
+        return {
+            "company_id": company_id,
+            "courier_ids[]": courier_id,
+            "pickup_point_ids[]": pickup_point_id,
+            "status_updated_at_from": date,
+            "status_updated_at_till": date,
+        }
 
+    def _check_first_route(self, get_test_name, courier_id, routes_data):
+        """Проверка параметров первого маршрута из ответа со списком маршрутов."""
         if not routes_data["routes"]:
             raise ValueError("No routes found for the given parameters.") # добавить assert для логирования ошибки, если роут не найден
 
@@ -74,4 +97,37 @@ class RouteService:
         )
 
         print(f"route_id: {route_id}, route_courier_id: {route_courier_id}, route_deliveries_count: {route_deliveries_count}, route_status: {route_status}")
-        return route_id, route_courier_id, route_deliveries_count, route_status
\ No newline at end of file
+        return route_id, route_courier_id, route_deliveries_count, route_status
+
+
+class AsyncRouteService(RouteService):
+    """Асинхронный аналог RouteService (методы возвращают корутины)."""
+
+    def __init__(self):
+        super().__init__()
+        self.request = AsyncMyRequests()
+
+    async def get_routes(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers, page=1):
+        """Получить страницу маршрутов на основе фильтров."""
+        response = await self.request.get(
+            url=self.route_url.list_of_routes,
+            data={**self._get_routes_params(company_id, courier_id, pickup_point_id, date), "page": page},
+            headers=headers,
+            cache=False,
+        )
+        self.assertions.assert_status_code(response=response, expected_status_code=HTTPStatus.OK, test_name=get_test_name)
+        return response
+
+    async def get_all_routes(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers):
+        """Получить маршруты со всех страниц."""
+        return await AsyncPaginator(request=self.request, test_name=get_test_name).get_all(
+            url=self.route_url.list_of_routes,
+            items_key="routes",
+            params=self._get_routes_params(company_id, courier_id, pickup_point_id, date),
+            headers=headers,
+        )
+
+    async def get_route_status(self, get_test_name, company_id, courier_id, pickup_point_id, date, headers):
+        """Получить и проверить статус первого маршрута на основе фильтров."""
+        routes = await self.get_routes(get_test_name, company_id, courier_id, pickup_point_id, date, headers)
+        return self._check_first_route(get_test_name, courier_id, routes.json())
@@ -48,6 +48,45 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
 
+    # Настройки HTTP-клиента (пул соединений и таймауты)
+    HTTP_TIMEOUT: float = 5.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_BULK_CONCURRENCY: int = 10
+    HTTP2: bool = False  # мультиплексирование запросов в одном соединении (требует пакет h2)
+    HTTP_TRANSPORT: str = "network"  # network | mock:<module>:<attr> | wsgi:... | asgi:... | transport:...
+    HTTP_CASSETTE_MODE: str = "off"  # off | record | replay
+    HTTP_CASSETTE_PATH: str = "cassettes/session.jsonl.gz"
+    HTTP_TIMINGS_ENABLED: bool = True  # замеры фаз запросов и итоговая таблица p50/p95/p99
+    HTTP_CACHE_ENABLED: bool = False  # кэш GET-ответов на сессию
+    HTTP_CACHE_TTL: float = 60.0
+    HTTP_CACHE_MAX_ENTRIES: int = 512
+    HTTP_RATE_LIMITS: str = ""  # <host>[/<path>]=<rate>[:<burst>],... например "api-ru.iiko.services=5,*=20"
+    HTTP_RETRIES: int = 0  # 0 - без повторов; 502/503/504, ошибки чтения - идемпотентные, 429 и ошибки соединения - любые
+    HTTP_RETRY_BACKOFF: float = 0.5
+    HTTP_RETRY_MAX_DELAY: float = 10.0  # Retry-After больше этого значения не выжидается
+    HTTP_CIRCUIT_BREAKER_THRESHOLD: int = 5  # неудач подряд до открытия breaker хоста (0 - выключен)
+    HTTP_CIRCUIT_BREAKER_RESET: float = 30.0
+    HTTP_REQUEST_COMPRESSION: str = "off"  # off | gzip | zstd (zstd требует пакет zstandard)
+    HTTP_COMPRESSION_MIN_BYTES: int = 1024
+    HTTP_ACCEPT_ENCODING: str = ""  # пусто - все кодировки, которые умеет распаковывать httpx
+    HTTP_HAR_MODE: str = "off"  # off | session | test - запись трафика в HAR 1.2
+    HTTP_HAR_DIR: str = "har"
+    AUTH_TOKEN_CACHE_ENABLED: bool = True  # переиспользование токенов ролей и курьеров на сессию
+    AUTH_TOKEN_REFRESH_BEFORE: float = 60.0  # фоновое обновление токена за столько секунд до exp
+    AUTH_TOKEN_DEFAULT_TTL: float = 600.0  # срок жизни токена без claim exp
+    AUTH_TOKEN_STORE_DIR: str = ""  # общий для процессов каталог токенов (в воркерах xdist - временный каталог)
+    IIKO_POLL_INITIAL_INTERVAL: float = 0.5  # первая проверка статуса команды IIKO, дальше интервал растет
+    IIKO_POLL_MAX_INTERVAL: float = 5.0
+    IIKO_POLL_CONCURRENCY: int = 10  # максимум одновременных запросов /commands/status
+    IIKO_COMMAND_TIMEOUT: float = 60.0
+    IIKO_TOKEN_TTL: float = 3600.0  # срок жизни токена iiko Cloud API
+    DELIVERY_INDEX_TIMEOUT: float = 30.0  # ожидание заказа iiko в Курьерике при поиске по external_id
+    ALLURE_ATTACH_MAX_BYTES: int = 256 * 1024  # тела ответов больше лимита обрезаются или сжимаются
+    ALLURE_ATTACH_OVERSIZE: str = "truncate"  # truncate | gzip
+
     class Config:
         env_file = f".env.{os.getenv('TEST_ENV', 'dev')}"
 
@@ -1,5 +1,6 @@
 from httpx import Response
 from src.logger import get_logger
+from src.response import ParsedResponse
 
 
 class Assertions:
@@ -27,7 +28,7 @@ class Assertions:
 
     @staticmethod
     def assert_bool(response: Response, expected_bool: bool, field_name: str, test_name: str):
-        json_response = response.json()
+        json_response = ParsedResponse.of(response).json()
         actual_bool = json_response[field_name]
         assert actual_bool == expected_bool, get_logger(test_name).error(
             f"Expected {expected_bool} but got {actual_bool} instead"
@@ -41,7 +42,7 @@ class Assertions:
         expected_total: int,
         test_name: str,
     ):
-        json_response = response.json()
+        json_response = ParsedResponse.of(response).json()
         pagination = json_response["pagination"]
         # Проверка текущей страницы
         actual_page = pagination["page"]
@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import threading
+import functools
+from contextlib import contextmanager
+
+import allure
+from allure_commons import hookimpl, plugin_manager
+from allure_commons.types import AttachmentType
+
+from settings import settings
+from src.metrics import HttpMetrics, current_test_name
+from src.response import loads, dumps_pretty
+
+
+TRUNCATE = "truncate"
+GZIP = "gzip"
+
+
+class _Collector:
+    """Вложения рабочих потоков, ожидающие прикрепления в потоке теста."""
+
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def add(self, item):
+        with self.lock:
+            self.items.append(item)
+
+    def drain(self) -> list:
+        with self.lock:
+            items, self.items = self.items, []
+        return items
+
+
+class _StepBoundary:
+    """Прикрепляет накопленные вложения до начала и до окончания шага allure.step."""
+
+    @hookimpl(tryfirst=True)
+    def start_step(self, uuid, title, params):
+        AllureAttachments.flush()
+
+    @hookimpl(tryfirst=True)
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        AllureAttachments.flush()
+
+
+class AllureAttachments:
+    """
+    Вложения Allure для тел запросов и ответов.
+
+    Вложение не форматируется и не записывается на пути запроса: тело ставится в очередь теста, а очередь
+    прикрепляется (allure.attach) в потоке теста на границах шагов allure.step и хуками pytest после фаз
+    call и teardown (flush). Рабочие потоки получают контекст при постановке задачи (collect): их вложения
+    попадают в ту же очередь, когда задачи завершены. Вложения из остальных потоков (фоновое обновление
+    токенов) пропускаются - они не относятся ни к одному тесту.
+    Повторное тело в пределах теста заменяется ссылкой на первое вложение с тем же содержимым.
+    Тела больше ALLURE_ATTACH_MAX_BYTES обрезаются или сохраняются в gzip (ALLURE_ATTACH_OVERSIZE).
+    Если отчет Allure не собирается (нет --alluredir), вложения не формируются вовсе.
+    """
+
+    _local = threading.local()
+    _pending = []
+    _seen = {}  # sha1 тела -> имя первого вложения в текущем тесте
+    _step_boundary = _StepBoundary()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Отчет Allure собирается (зарегистрирован обработчик вложений)."""
+        return bool(plugin_manager.hook.attach_data.get_hookimpls())
+
+    @staticmethod
+    def _in_test_thread() -> bool:
+        """Вызывающий поток - поток теста: тесты pytest выполняются в главном потоке."""
+        return threading.current_thread() is threading.main_thread() and current_test_name() is not None
+
+    @classmethod
+    @contextmanager
+    def collect(cls):
+        """
+        Передает контекст вложений вызывающего потока рабочим потокам.
+
+        Пример использования:
+            with AllureAttachments.collect() as bind:
+                executor.map(bind(func), items)
+        Вложения, сделанные внутри bind(func), прикрепляются в вызывающем потоке при выходе из блока.
+        Вложенные вызовы (send_many внутри рабочего потока) используют внешний сборщик.
+        """
+        outer = getattr(cls._local, "collector", None)
+        collector = outer or _Collector()
+
+        def bind(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                previous = getattr(cls._local, "collector", None)
+                cls._local.collector = collector
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    cls._local.collector = previous
+            return wrapper
+
+        try:
+            yield bind
+        finally:
+            if outer is None:
+                for item in collector.drain():
+                    cls._attach(*item)
+
+    @classmethod
+    def install(cls):
+        """Подключает прикрепление очереди на границах шагов allure.step (вызывается из pytest_configure)."""
+        if not plugin_manager.is_registered(cls._step_boundary):
+            plugin_manager.register(cls._step_boundary)
+
+    @classmethod
+    def flush(cls, end_of_test: bool = False):
+        """
+        Прикрепляет очередь вложений к текущему шагу или тесту.
+
+        :param end_of_test: Тест завершен: набор тел для устранения повторов очищается.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        items, cls._pending = cls._pending, []
+        for raw, name, is_json in items:
+            reformat = isinstance(raw, bytes)
+            if not reformat:
+                raw = dumps_pretty(raw).encode("utf-8")
+            digest = hashlib.sha1(raw).hexdigest()
+            if digest in cls._seen:
+                HttpMetrics.increment("attachments.deduplicated")
+                body = f"Same body as \"{cls._seen[digest]}\" (sha1 {digest})"
+                attachment_type, extension = AttachmentType.TEXT, None
+            else:
+                cls._seen[digest] = name
+                body, attachment_type, extension = cls._format(raw, is_json, reformat)
+            allure.attach(body, name=name, attachment_type=attachment_type, extension=extension)
+        if end_of_test:
+            cls._seen = {}
+
+    @classmethod
+    def attach_body(cls, raw: bytes, name: str, is_json: bool = True):
+        """
+        Прикрепляет тело ответа к текущему тесту (JSON форматируется с отступами).
+
+        :param raw: Тело как есть.
+        :param name: Имя вложения в отчете.
+        :param is_json: Тело в формате JSON.
+        """
+        cls._attach(raw, name, is_json)
+
+    @classmethod
+    def attach_json(cls, data, name: str):
+        """Прикрепляет объект, сериализуемый в JSON (сериализуется при прикреплении очереди)."""
+        cls._attach(data, name, True)
+
+    @classmethod
+    def _attach(cls, raw, name: str, is_json: bool):
+        """Ставит вложение в очередь: raw - тело (bytes) или объект для сериализации в JSON."""
+        if not cls.enabled():
+            return
+        collector = getattr(cls._local, "collector", None)
+        if collector is not None:
+            collector.add((raw, name, is_json))
+            return
+        if not cls._in_test_thread():
+            HttpMetrics.increment("attachments.skipped")
+            return
+        cls._pending.append((raw, name, is_json))
+
+    @staticmethod
+    def _format(raw: bytes, is_json: bool, reformat: bool):
+        """Тело вложения, тип и расширение с учетом ALLURE_ATTACH_MAX_BYTES."""
+        max_bytes = settings.ALLURE_ATTACH_MAX_BYTES
+        if len(raw) <= max_bytes:
+            if is_json and reformat:
+                try:
+                    raw = dumps_pretty(loads(raw))
+                except ValueError:
+                    pass
+            return raw, AttachmentType.JSON if is_json else AttachmentType.TEXT, None
+        if settings.ALLURE_ATTACH_OVERSIZE == GZIP:
+            HttpMetrics.increment(f"attachments.{GZIP}")
+            return gzip.compress(raw), "application/gzip", "json.gz" if is_json else "txt.gz"
+        HttpMetrics.increment(f"attachments.{TRUNCATE}")
+        notice = f"\n\n... truncated: {len(raw)} bytes total, first {max_bytes} shown".encode("utf-8")
+        return raw[:max_bytes] + notice, AttachmentType.TEXT, None
@@ -0,0 +1,119 @@
+import httpx
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from src.transports import (
+    PluggableTransport, Cassette, CassetteTransport, TimingTransport, ResponseCache, CacheTransport,
+    RateLimiter, RateLimitTransport, RetryTransport, CompressionTransport, HarRecorder, HarTransport,
+)
+from settings import settings
+
+
+def get_limits() -> httpx.Limits:
+    """
+    Возвращает лимиты пула соединений из настроек.
+
+    :return: Объект httpx.Limits.
+    """
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_timeout() -> httpx.Timeout:
+    """
+    Возвращает таймауты HTTP-запросов из настроек.
+
+    :return: Объект httpx.Timeout.
+    """
+    return httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+
+def _no_cookies() -> CookieJar:
+    """
+    Хранилище cookies, которое ничего не сохраняет и не отправляет: клиенты общие для потоков и тестов,
+    поэтому cookies из ответов не переиспользуются (cookies запроса передаются заголовком Cookie).
+    """
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _use_http2(http2: bool = None) -> bool:
+    """Режим HTTP/2: явное значение или настройка HTTP2 (для HTTP/2 нужен пакет h2)."""
+    return settings.HTTP2 if http2 is None else http2
+
+
+def _wrap_transport(transport):
+    """
+    Оборачивает базовый транспорт слоями клиента (изнутри наружу): замеры фаз запроса, лимиты частоты,
+    повторы с circuit breaker, сжатие тел и учет трафика, кассета record/replay, запись HAR, кэш ответов.
+    Каждый повтор заново проходит лимиты и замеряется; ответы из кассеты и кэша не расходуют лимит.
+    """
+    if settings.HTTP_TIMINGS_ENABLED:
+        transport = TimingTransport(transport)
+    limiter = RateLimiter.get_current()
+    if limiter is not None:
+        transport = RateLimitTransport(transport, limiter)
+    transport = RetryTransport(transport)
+    transport = CompressionTransport(transport)
+    cassette = Cassette.get_current()
+    if cassette is not None:
+        transport = CassetteTransport(transport, cassette)
+    recorder = HarRecorder.get_current()
+    if recorder is not None:
+        transport = HarTransport(transport, recorder)
+    cache = ResponseCache.get_current()
+    if cache is not None:
+        transport = CacheTransport(transport, cache)
+    return transport
+
+
+def build_transport(http2: bool = None) -> httpx.BaseTransport:
+    """
+    Транспорт для httpx.Client: подключенный через PluggableTransport или сетевой пул соединений.
+
+    :param http2: Включить HTTP/2 для сетевого транспорта (по умолчанию из настройки HTTP2).
+    :return: Транспорт httpx.
+    """
+    transport = PluggableTransport.get_sync_transport()
+    if transport is None:
+        transport = httpx.HTTPTransport(limits=get_limits(), http2=_use_http2(http2))
+    return _wrap_transport(transport)
+
+
+def build_async_transport(http2: bool = None) -> httpx.AsyncBaseTransport:
+    """
+    Транспорт для httpx.AsyncClient: подключенный через PluggableTransport или сетевой пул соединений.
+
+    :param http2: Включить HTTP/2 для сетевого транспорта (по умолчанию из настройки HTTP2).
+    :return: Асинхронный транспорт httpx.
+    """
+    transport = PluggableTransport.get_async_transport()
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(limits=get_limits(), http2=_use_http2(http2))
+    return _wrap_transport(transport)
+
+
+def create_client(base_url: str = "", http2: bool = None) -> httpx.Client:
+    """
+    Создает долгоживущий httpx.Client с keep-alive и настроенным пулом соединений.
+
+    :param base_url: Базовый URL клиента (пустая строка - запросы по абсолютным URL).
+    :param http2: Включить HTTP/2 (по умолчанию берется из настройки HTTP2).
+    :return: Настроенный httpx.Client.
+    """
+    return httpx.Client(
+        base_url=base_url, timeout=get_timeout(), transport=build_transport(http2), cookies=_no_cookies()
+    )
+
+
+def create_async_client(base_url: str = "", http2: bool = None) -> httpx.AsyncClient:
+    """
+    Создает httpx.AsyncClient с теми же настройками пула и таймаутов, что и create_client.
+
+    :param base_url: Базовый URL клиента (пустая строка - запросы по абсолютным URL).
+    :param http2: Включить HTTP/2 (по умолчанию берется из настройки HTTP2).
+    :return: Настроенный httpx.AsyncClient.
+    """
+    return httpx.AsyncClient(
+        base_url=base_url, timeout=get_timeout(), transport=build_async_transport(http2), cookies=_no_cookies()
+    )
@@ -1,19 +1,104 @@
 import os
+import asyncio
+import threading
+import weakref
 import httpx
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlsplit
+from src.http_client import create_client, create_async_client
+from src.transports import CACHE_EXTENSION
 from src.prepare_data.prepare_basic_data import BaseTestData
+from src.attachments import AllureAttachments
+from src.response import ParsedResponse
+from src.token_cache import TokenCache, TokenHeaders
 from settings import settings
 
 
+class HttpRequestError(Exception):
+    """Запрос не выполнен: сетевая ошибка, таймаут или открытый circuit breaker (исходная ошибка - в __cause__)."""
+
+
+@dataclass
+class RequestSpec:
+    """Описание одного запроса для массовой отправки (send_many)."""
+    method: str
+    url: str
+    data: object = None
+    headers: dict = None
+    cookies: dict = None
+
+
+@dataclass
+class RequestResult:
+    """Результат одного запроса из send_many: ответ либо ошибка."""
+    spec: RequestSpec
+    response: Optional[httpx.Response] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _get_host_key(url: str) -> str:
+    """Ключ пула клиентов: схема и хост (с портом) из URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _build_request(url: str, data, headers: dict, cookies: dict, method: str, cache: bool = True) -> dict:
+    """
+    Формирует аргументы для client.request: полный URL, заголовки по умолчанию, query/тело.
+    cache=False - ответ не берется из кэша ответов и не сохраняется в нем.
+
+    :return: Словарь аргументов для httpx.Client.request / httpx.AsyncClient.request.
+    """
+    if url.startswith(('http://', 'https://')):
+        base_url = url
+    else:
+        base_url = f"{settings.BASE_URL}{url}"
+    # print(f"Sending {method} request to {base_url} with data: {data} and headers: {headers}\n\n")
+
+    if headers is None:
+        headers = {"Content-Type": "application/json"}
+    if cookies:
+        # Cookies запроса передаются заголовком: клиент общий для потоков, его хранилище cookies не используется
+        headers = {**headers, "Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+
+    request_kwargs = {
+        "method": method,
+        "url": base_url,
+        "headers": headers,
+    }
+    if not cache:
+        request_kwargs["extensions"] = {CACHE_EXTENSION: False}
+    # Если метод GET, передаем параметры как query string, иначе - как тело запроса
+    if method == "GET":
+        request_kwargs["params"] = data
+    elif isinstance(data, (str, bytes)):
+        request_kwargs["content"] = data  # готовое тело (JSON-строка) отправляется как есть
+    else:
+        request_kwargs["data"] = data
+    return request_kwargs
+
+
 class MyRequests:
     """
     Класс для выполнения HTTP-запросов с поддержкой различных методов (GET, POST, PUT, PATCH, DELETE).
+    Держит по одному долгоживущему httpx.Client (keep-alive, пул соединений) на каждый хост.
     """
 
+    _clients = {}
+    _lock = threading.Lock()
+
     def post(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
         return self.__send(url, data, headers, cookies, method="POST")
 
-    def get(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
-        return self.__send(url, data, headers, cookies, method="GET")
+    def get(self, url: str, data: str = None, headers: dict = None, cookies: dict = None, cache: bool = True):
+        return self.__send(url, data, headers, cookies, method="GET", cache=cache)
 
     def put(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
         return self.__send(url, data, headers, cookies, method="PUT")
@@ -25,30 +110,200 @@ class MyRequests:
     def delete(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
         return self.__send(url, data, headers, cookies, method="DELETE")
 
-    @staticmethod
-    def __send(url: str, data: str, headers: dict, cookies: dict, method: str):
-        if url.startswith(('http://', 'https://')):
-            base_url = url
-        else:
-            base_url = f"{settings.BASE_URL}{url}"
-        # print(f"Sending {method} request to {base_url} with data: {data} and headers: {headers}\n\n")
+    @contextmanager
+    def stream(self, url: str, data: str = None, headers: dict = None, cookies: dict = None, method: str = "GET"):
+        """
+        Запрос с потоковым чтением тела: ответ отдается сразу после заголовков, тело читается по мере загрузки
+        (например, через src.json_stream.iter_json_items). Тело не прикрепляется к отчету Allure
+        и не кэшируется (запрос идет мимо кэша ответов). TokenHeaders разрешаются так же, как в остальных методах:
+        при 401 запрос один раз повторяется с новым токеном.
+
+        :return: Контекстный менеджер с httpx.Response в потоковом режиме.
+        """
+        resolve = isinstance(headers, TokenHeaders)
+        for attempt in range(2 if resolve else 1):
+            request_kwargs = _build_request(url, data, headers.resolve() if resolve else headers, cookies, method,
+                                            cache=False)
+            client = self._get_client(request_kwargs["url"])
+            try:
+                with client.stream(**request_kwargs) as response:
+                    if response.status_code == 401:
+                        TokenCache.reject(request_kwargs["headers"])
+                        if resolve and attempt == 0:
+                            # Как в __send: один повтор с новым токеном, тело отклоненного ответа не читается
+                            continue
+                    yield response
+                    return
+            except httpx.RequestError as ex:
+                raise HttpRequestError(f"HTTP request failed: {ex}") from ex
+
+    def send_many(self, specs: List[RequestSpec], concurrency: int = None) -> List[RequestResult]:
+        """
+        Отправляет набор запросов параллельно с ограничением конкурентности.
+
+        Ошибка отдельного запроса не прерывает остальные - она возвращается в RequestResult.error.
+
+        :param specs: Список описаний запросов.
+        :param concurrency: Максимум одновременных запросов (по умолчанию HTTP_BULK_CONCURRENCY).
+        :return: Результаты в порядке входного списка.
+        """
+        if not specs:
+            return []
+        concurrency = concurrency or settings.HTTP_BULK_CONCURRENCY
+
+        def _send_one(spec: RequestSpec) -> RequestResult:
+            try:
+                response = self.__send(spec.url, spec.data, spec.headers, spec.cookies, method=spec.method.upper())
+                return RequestResult(spec=spec, response=response)
+            except Exception as ex:
+                return RequestResult(spec=spec, error=ex)
+
+        # Вложения рабочих потоков прикрепляются к тесту вызывающего потока
+        with AllureAttachments.collect() as bind, ThreadPoolExecutor(max_workers=min(concurrency, len(specs))) as executor:
+            return list(executor.map(bind(_send_one), specs))
 
-        if headers is None:
-            headers = {"Content-Type": "application/json"}
+    @classmethod
+    def _get_client(cls, url: str) -> httpx.Client:
+        """Возвращает клиент из пула для хоста из URL (создается при первом обращении)."""
+        host_key = _get_host_key(url)
+        client = cls._clients.get(host_key)
+        if client is None:
+            with cls._lock:
+                client = cls._clients.get(host_key)
+                if client is None:
+                    client = create_client()
+                    cls._clients[host_key] = client
+        return client
 
-        if cookies is None:
-            cookies = {}
+    @classmethod
+    def close(cls):
+        """Закрытие всех клиентов пула (вызывается по завершении сессии)."""
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            client.close()
 
+    @classmethod
+    def __send(cls, url: str, data: str, headers: dict, cookies: dict, method: str, cache: bool = True):
+        if not isinstance(headers, TokenHeaders):
+            return cls.__send_once(url, data, headers, cookies, method, cache)
+        response = cls.__send_once(url, data, headers.resolve(), cookies, method, cache)
+        if response.status_code == 401:
+            # Отклоненный токен уже удален из кэша: один повтор с новым токеном
+            response = cls.__send_once(url, data, headers.resolve(), cookies, method, cache)
+        return response
+
+    @classmethod
+    def __send_once(cls, url: str, data: str, headers: dict, cookies: dict, method: str, cache: bool = True):
+        request_kwargs = _build_request(url, data, headers, cookies, method, cache)
+        client = cls._get_client(request_kwargs["url"])
         try:
-            # Если метод GET, передаем параметры как query string
-            if method == "GET":
-                # Используем `params` для передачи параметров в строке запроса
-                response = httpx.request(method=method, url=base_url, params=data, headers=headers, cookies=cookies)
-            else:
-                # Для остальных методов передаем данные как тело запроса
-                response = httpx.request(method=method, url=base_url, data=data, headers=headers, cookies=cookies)
+            response = ParsedResponse(client.request(**request_kwargs))
+            BaseTestData.attach_response(response=response, method=method)
+            if response.status_code == 401:
+                TokenCache.reject(request_kwargs["headers"])
+            return response
+        except httpx.RequestError as ex:
+            raise HttpRequestError(f"HTTP request failed: {ex}") from ex
+
+
+class AsyncMyRequests:
+    """
+    Асинхронный аналог MyRequests на базе httpx.AsyncClient.
+    Клиенты привязаны к event loop, поэтому пул хранится отдельно для каждого loop.
+    """
+
+    _clients = weakref.WeakKeyDictionary()
+
+    async def post(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
+        return await self.__send(url, data, headers, cookies, method="POST")
+
+    async def get(self, url: str, data: str = None, headers: dict = None, cookies: dict = None, cache: bool = True):
+        return await self.__send(url, data, headers, cookies, method="GET", cache=cache)
+
+    async def put(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
+        return await self.__send(url, data, headers, cookies, method="PUT")
 
+    async def patch(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
+        return await self.__send(url, data, headers, cookies, method="PATCH")
+
+    async def delete(self, url: str, data: str = None, headers: dict = None, cookies: dict = None):
+        return await self.__send(url, data, headers, cookies, method="DELETE")
+
+    @asynccontextmanager
+    async def stream(self, url: str, data: str = None, headers: dict = None, cookies: dict = None, method: str = "GET"):
+        """Асинхронный аналог MyRequests.stream (тело читается через src.json_stream.aiter_json_items)."""
+        resolve = isinstance(headers, TokenHeaders)
+        for attempt in range(2 if resolve else 1):
+            request_kwargs = _build_request(url, data, await headers.aresolve() if resolve else headers, cookies, method,
+                                            cache=False)
+            client = self._get_client(request_kwargs["url"])
+            try:
+                async with client.stream(**request_kwargs) as response:
+                    if response.status_code == 401:
+                        TokenCache.reject(request_kwargs["headers"])
+                        if resolve and attempt == 0:
+                            continue
+                    yield response
+                    return
+            except httpx.RequestError as ex:
+                raise HttpRequestError(f"HTTP request failed: {ex}") from ex
+
+    async def send_many(self, specs: List[RequestSpec], concurrency: int = None) -> List[RequestResult]:
+        """
+        Асинхронный аналог MyRequests.send_many: конкурентная отправка с ограничением через семафор.
+
+        :param specs: Список описаний запросов.
+        :param concurrency: Максимум одновременных запросов (по умолчанию HTTP_BULK_CONCURRENCY).
+        :return: Результаты в порядке входного списка.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.HTTP_BULK_CONCURRENCY)
+
+        async def _send_one(spec: RequestSpec) -> RequestResult:
+            async with semaphore:
+                try:
+                    response = await self.__send(spec.url, spec.data, spec.headers, spec.cookies, method=spec.method.upper())
+                    return RequestResult(spec=spec, response=response)
+                except Exception as ex:
+                    return RequestResult(spec=spec, error=ex)
+
+        return list(await asyncio.gather(*[_send_one(spec) for spec in specs]))
+
+    @classmethod
+    def _get_client(cls, url: str) -> httpx.AsyncClient:
+        """Возвращает клиент текущего event loop для хоста из URL."""
+        loop_clients = cls._clients.setdefault(asyncio.get_running_loop(), {})
+        host_key = _get_host_key(url)
+        if host_key not in loop_clients:
+            loop_clients[host_key] = create_async_client()
+        return loop_clients[host_key]
+
+    @classmethod
+    async def aclose(cls):
+        """Закрытие клиентов текущего event loop (вызывать перед завершением loop)."""
+        loop_clients = cls._clients.pop(asyncio.get_running_loop(), {})
+        for client in loop_clients.values():
+            await client.aclose()
+
+    @classmethod
+    async def __send(cls, url: str, data: str, headers: dict, cookies: dict, method: str, cache: bool = True):
+        if not isinstance(headers, TokenHeaders):
+            return await cls.__send_once(url, data, headers, cookies, method, cache)
+        response = await cls.__send_once(url, data, await headers.aresolve(), cookies, method, cache)
+        if response.status_code == 401:
+            response = await cls.__send_once(url, data, await headers.aresolve(), cookies, method, cache)
+        return response
+
+    @classmethod
+    async def __send_once(cls, url: str, data: str, headers: dict, cookies: dict, method: str, cache: bool = True):
+        request_kwargs = _build_request(url, data, headers, cookies, method, cache)
+        client = cls._get_client(request_kwargs["url"])
+        try:
+            response = ParsedResponse(await client.request(**request_kwargs))
             BaseTestData.attach_response(response=response, method=method)
+            if response.status_code == 401:
+                TokenCache.reject(request_kwargs["headers"])
             return response
         except httpx.RequestError as ex:
-            raise Exception(f"HTTP request failed: {ex}")
+            raise HttpRequestError(f"HTTP request failed: {ex}") from ex
@@ -0,0 +1,166 @@
+import re
+from typing import AsyncIterator, Iterator, List
+
+import httpx
+from src.response import loads
+
+
+_STRUCTURAL_RE = re.compile(rb'["{}\[\],:]')
+_STRING_RE = re.compile(rb'["\\]')
+
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_OPEN = (ord("{"), ord("["))
+_CLOSE = (ord("}"), ord("]"))
+_COMMA, _COLON, _OPEN_ARRAY = ord(","), ord(":"), ord("[")
+
+
+class JsonArrayScanner:
+    """
+    Инкрементальный разбор ответа-списка вида {"<items_key>": [...], "pagination": {...}}.
+
+    Байты подаются кусками (feed), элементы массива items_key возвращаются по мере того, как каждый
+    из них полностью получен, - в памяти держится только текущий элемент. Остальные поля корневого
+    объекта (например, pagination) доступны в envelope после разбора всего тела (close).
+    """
+
+    def __init__(self, items_key: str):
+        self.items_key = items_key
+        self.envelope = {}
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._key = None         # текущий ключ корневого объекта
+        self._key_start = None   # начало строки-ключа корневого объекта
+        self._value_start = None  # начало значения корневого ключа (кроме массива элементов)
+        self._item_start = None  # начало текущего элемента массива items_key
+        self._in_items = False
+        self._done = False
+
+    def feed(self, chunk: bytes) -> List[object]:
+        """
+        Добавляет очередной кусок тела.
+
+        :return: Элементы массива, полностью полученные в этом куске.
+        """
+        buf = self._buf
+        buf += chunk
+        items = []
+        pos = self._pos
+        while not self._done:
+            if self._in_string:
+                match = _STRING_RE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                i = match.start()
+                if buf[i] == _BACKSLASH:
+                    if i + 1 >= len(buf):
+                        pos = i  # экранированный символ придет в следующем куске
+                        break
+                    pos = i + 2
+                    continue
+                self._in_string = False
+                pos = i + 1
+                if self._key_start is not None:
+                    self._key = loads(bytes(buf[self._key_start:pos]))
+                    self._key_start = None
+                continue
+
+            match = _STRUCTURAL_RE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            i = match.start()
+            char = buf[i]
+            pos = i + 1
+            if char == _QUOTE:
+                self._in_string = True
+                if self._depth == 1 and self._key is None and not self._in_items:
+                    self._key_start = i
+            elif char in _OPEN:
+                self._depth += 1
+                if (self._depth == 2 and char == _OPEN_ARRAY and self._key == self.items_key
+                        and self._value_start is not None and not bytes(buf[self._value_start:i]).strip()):
+                    self._in_items = True
+                    self._value_start = None
+                    self._item_start = pos
+            elif char == _COLON:
+                if self._depth == 1:
+                    self._value_start = pos
+            elif char == _COMMA:
+                if self._in_items and self._depth == 2:
+                    self._emit(buf, i, items)
+                    self._item_start = pos
+                elif self._depth == 1:
+                    self._finish_value(buf, i)
+            elif char in _CLOSE:
+                if self._in_items and self._depth == 2:
+                    self._emit(buf, i, items)
+                    self._in_items = False
+                    self._item_start = None
+                elif self._depth == 1:
+                    self._finish_value(buf, i)
+                    self._done = True
+                self._depth -= 1
+
+        # Отбрасываем уже разобранные байты, оставляя незавершенный элемент/значение
+        starts = [start for start in (self._key_start, self._value_start, self._item_start) if start is not None]
+        cut = min(starts + [pos])
+        del buf[:cut]
+        self._pos = pos - cut
+        for name in ("_key_start", "_value_start", "_item_start"):
+            if getattr(self, name) is not None:
+                setattr(self, name, getattr(self, name) - cut)
+        return items
+
+    def _emit(self, buf: bytearray, end: int, items: list):
+        raw = bytes(buf[self._item_start:end]).strip()
+        if raw:
+            items.append(loads(raw))
+
+    def _finish_value(self, buf: bytearray, end: int):
+        if self._value_start is not None:
+            self.envelope[self._key] = loads(bytes(buf[self._value_start:end]))
+        self._key = None
+        self._value_start = None
+
+    def close(self) -> dict:
+        """
+        Завершает разбор.
+
+        :return: Поля корневого объекта, кроме массива элементов.
+        :raises ValueError: Если тело оборвалось или не является JSON-объектом.
+        """
+        if not self._done:
+            raise ValueError(f"Incomplete JSON body while streaming '{self.items_key}'")
+        return self.envelope
+
+
+def iter_json_items(response: httpx.Response, items_key: str, envelope: dict = None) -> Iterator[object]:
+    """
+    Элементы списка из потокового ответа (MyRequests.stream) по мере загрузки тела.
+
+    :param response: Ответ, открытый в потоковом режиме.
+    :param items_key: Ключ массива элементов (deliveries, companies, pickup_points, routes).
+    :param envelope: Словарь, который будет дополнен остальными полями ответа (pagination) после разбора.
+    """
+    scanner = JsonArrayScanner(items_key)
+    for chunk in response.iter_bytes():
+        yield from scanner.feed(chunk)
+    if envelope is not None:
+        envelope.update(scanner.close())
+    else:
+        scanner.close()
+
+
+async def aiter_json_items(response: httpx.Response, items_key: str, envelope: dict = None) -> AsyncIterator[object]:
+    """Асинхронный аналог iter_json_items (AsyncMyRequests.stream)."""
+    scanner = JsonArrayScanner(items_key)
+    async for chunk in response.aiter_bytes():
+        for item in scanner.feed(chunk):
+            yield item
+    if envelope is not None:
+        envelope.update(scanner.close())
+    else:
+        scanner.close()
@@ -0,0 +1,166 @@
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from functions import percentile
+
+
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_NUMBER_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url) -> str:
+    """
+    Шаблон эндпоинта для агрегации: путь без query, идентификаторы заменены на {id}.
+    Например, /couriers/3f1c...e2/shifts -> /couriers/{id}/shifts.
+    """
+    path = urlsplit(str(url)).path or "/"
+    return _NUMBER_SEGMENT_RE.sub("/{id}", _UUID_RE.sub("{id}", path))
+
+
+def current_test_name() -> Optional[str]:
+    """Имя текущего теста pytest без фазы (setup/call/teardown)."""
+    test_name = os.environ.get("PYTEST_CURRENT_TEST")
+    return test_name.rsplit(" (", 1)[0] if test_name else None
+
+
+@dataclass
+class RequestTiming:
+    """Замеры одного HTTP-обмена (все длительности в секундах)."""
+    method: str
+    endpoint: str
+    url: str
+    test: Optional[str] = None
+    status: Optional[int] = None
+    queued: float = 0.0  # ожидание в ограничителе частоты запросов (до отправки)
+    connect: float = 0.0
+    tls: float = 0.0
+    wait: float = 0.0  # от отправки запроса до заголовков ответа (время сервера + сеть)
+    ttfb: float = 0.0
+    download: float = 0.0
+    total: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    request_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class HttpMetrics:
+    """
+    Сборщик метрик HTTP-клиента за сессию: замеры запросов и счетчики (потокобезопасный).
+    Данные доступны по тесту и агрегированно по шаблонам эндпоинтов для итогового отчета.
+    """
+
+    _lock = threading.Lock()
+    _timings: List[RequestTiming] = []
+    _counters = defaultdict(float)
+    _traffic = defaultdict(lambda: defaultdict(int))
+
+    @classmethod
+    def record_timing(cls, timing: RequestTiming):
+        with cls._lock:
+            cls._timings.append(timing)
+
+    @classmethod
+    def increment(cls, name: str, value: float = 1):
+        """Увеличивает именованный счетчик сессии."""
+        with cls._lock:
+            cls._counters[name] += value
+
+    @classmethod
+    def record_traffic(cls, method: str, endpoint: str, **values: int):
+        """Суммирует объемы трафика (в байтах) по методу и шаблону эндпоинта."""
+        with cls._lock:
+            traffic = cls._traffic[(method, endpoint)]
+            for name, value in values.items():
+                traffic[name] += value
+
+    @classmethod
+    def get_counters(cls) -> dict:
+        with cls._lock:
+            return dict(cls._counters)
+
+    @classmethod
+    def get_timings(cls, test: str = None) -> List[RequestTiming]:
+        """Замеры всех запросов сессии или только запросов указанного теста."""
+        with cls._lock:
+            return [timing for timing in cls._timings if test is None or timing.test == test]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._timings.clear()
+            cls._counters.clear()
+            cls._traffic.clear()
+
+    @staticmethod
+    def format_timings(timings: List[RequestTiming]) -> str:
+        """Таблица замеров отдельных запросов (для вложения в отчет теста)."""
+        lines = [
+            f"{'method':<6} {'endpoint':<45} {'status':>6} {'queued':>8} {'connect':>8} {'tls':>8} {'wait':>8} "
+            f"{'ttfb':>8} {'download':>8} {'total':>8} {'req_b':>7} {'resp_b':>8}  x-request-id"
+        ]
+        for t in timings:
+            lines.append(
+                f"{t.method:<6} {t.endpoint[:45]:<45} {str(t.status or t.error):>6} {t.queued * 1000:>8.1f} "
+                f"{t.connect * 1000:>8.1f} "
+                f"{t.tls * 1000:>8.1f} {t.wait * 1000:>8.1f} {t.ttfb * 1000:>8.1f} {t.download * 1000:>8.1f} "
+                f"{t.total * 1000:>8.1f} {t.request_bytes:>7} {t.response_bytes:>8}  {t.request_id or ''}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def summary_lines(cls) -> List[str]:
+        """Итоговая таблица сессии: p50/p95/p99 по шаблонам эндпоинтов (мс)."""
+        by_endpoint = defaultdict(list)
+        for timing in cls.get_timings():
+            by_endpoint[(timing.method, timing.endpoint)].append(timing)
+        if not by_endpoint:
+            return []
+
+        lines = [
+            f"{'method':<6} {'endpoint':<45} {'count':>5} {'err':>4} {'ttfb_p50':>9} "
+            f"{'total_p50':>9} {'total_p95':>9} {'total_p99':>9} {'connect_sum':>11} {'queued_sum':>10}"
+        ]
+        for (method, endpoint), timings in sorted(by_endpoint.items(), key=lambda item: item[0][1]):
+            totals = [t.total * 1000 for t in timings]
+            errors = sum(1 for t in timings if t.error or (t.status or 0) >= 500)
+            lines.append(
+                f"{method:<6} {endpoint[:45]:<45} {len(timings):>5} {errors:>4} "
+                f"{percentile([t.ttfb * 1000 for t in timings], 50):>9.1f} {percentile(totals, 50):>9.1f} "
+                f"{percentile(totals, 95):>9.1f} {percentile(totals, 99):>9.1f} "
+                f"{sum(t.connect + t.tls for t in timings) * 1000:>11.1f} {sum(t.queued for t in timings) * 1000:>10.1f}"
+            )
+        return lines
+
+    @classmethod
+    def traffic_lines(cls) -> List[str]:
+        """
+        Итоговая таблица трафика по шаблонам эндпоинтов (байты): тело запроса до/после сжатия
+        и тело ответа на проводе/после распаковки, число сжатых запросов и ответов.
+        """
+        with cls._lock:
+            traffic = {key: dict(values) for key, values in cls._traffic.items()}
+        if not traffic:
+            return []
+
+        def saved(raw: int, wire: int) -> str:
+            return f"{(1 - wire / raw) * 100:.0f}%" if raw else "-"
+
+        lines = [
+            f"{'method':<6} {'endpoint':<45} {'count':>5} {'req_raw':>10} {'req_sent':>10} {'saved':>6} "
+            f"{'resp_wire':>10} {'resp_raw':>10} {'saved':>6} {'gz_req':>6} {'gz_resp':>7}"
+        ]
+        for (method, endpoint), t in sorted(traffic.items(), key=lambda item: item[0][1]):
+            lines.append(
+                f"{method:<6} {endpoint[:45]:<45} {t.get('count', 0):>5} {t.get('request_raw', 0):>10} "
+                f"{t.get('request_sent', 0):>10} {saved(t.get('request_raw', 0), t.get('request_sent', 0)):>6} "
+                f"{t.get('response_wire', 0):>10} {t.get('response_raw', 0):>10} "
+                f"{saved(t.get('response_raw', 0), t.get('response_wire', 0)):>6} "
+                f"{t.get('compressed_requests', 0):>6} {t.get('compressed_responses', 0):>7}"
+            )
+        return lines
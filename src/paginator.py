@@ -0,0 +1,122 @@
+import math
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import AsyncIterator, Iterator, List
+
+from settings import settings
+from src.assertions import Assertions
+from src.attachments import AllureAttachments
+from src.http_methods import MyRequests, AsyncMyRequests
+
+
+class Paginator:
+    """
+    Обход списочных эндпоинтов с блоком pagination (page, per_page, total).
+
+    Первая страница запрашивается сразу, по ее total вычисляется число страниц, остальные загружаются
+    параллельно скользящим окном (не больше window запросов одновременно). Элементы отдаются строго
+    в порядке страниц; если обход прерван (например, нужный элемент найден), оставшиеся страницы не запрашиваются.
+    """
+
+    def __init__(self, request: MyRequests = None, per_page: int = 100, window: int = None, test_name: str = None,
+                 cache: bool = True):
+        """
+        :param request: Клиент запросов (по умолчанию MyRequests).
+        :param per_page: Размер страницы.
+        :param window: Максимум одновременно загружаемых страниц (по умолчанию HTTP_BULK_CONCURRENCY).
+        :param test_name: Имя теста для логирования ошибок статуса.
+        :param cache: False - страницы запрашиваются мимо кэша ответов (повторные обходы меняющегося списка).
+        """
+        self.request = request or MyRequests()
+        self.per_page = per_page
+        self.window = window or settings.HTTP_BULK_CONCURRENCY
+        self.assertions = Assertions()
+        self.test_name = test_name
+        self.cache = cache
+
+    def _page_params(self, params: dict, page: int) -> dict:
+        return {**(params or {}), "page": page, "per_page": self.per_page}
+
+    def _page_count(self, pagination: dict) -> int:
+        """Число страниц по блоку pagination первой страницы (per_page берется из ответа - сервер мог его ограничить)."""
+        if not pagination:
+            return 1
+        per_page = pagination.get("per_page") or self.per_page
+        return max(1, math.ceil(pagination.get("total", 0) / per_page))
+
+    def _get_page(self, url: str, params: dict, headers: dict, page: int) -> dict:
+        response = self.request.get(url=url, data=self._page_params(params, page), headers=headers, cache=self.cache)
+        self.assertions.assert_status_code(response, HTTPStatus.OK, self.test_name)
+        return response.json()
+
+    def iter_items(self, url: str, items_key: str, params: dict = None, headers: dict = None) -> Iterator[dict]:
+        """
+        Элементы всех страниц по порядку.
+
+        :param url: URL списка (параметры page/per_page подставляются автоматически).
+        :param items_key: Ключ массива элементов в ответе (deliveries, routes, companies...).
+        :param params: Фильтры запроса.
+        :param headers: Заголовки запроса.
+        """
+        first_page = self._get_page(url, params, headers, 1)
+        yield from first_page.get(items_key) or []
+        pages = self._page_count(first_page.get("pagination"))
+        if pages == 1:
+            return
+
+        # Вложения рабочих потоков прикрепляются к тесту вызывающего потока по завершении обхода
+        with AllureAttachments.collect() as bind, ThreadPoolExecutor(max_workers=min(self.window, pages - 1)) as executor:
+            pending = deque()
+            next_page = 2
+            try:
+                while pending or next_page <= pages:
+                    while next_page <= pages and len(pending) < self.window:
+                        pending.append(executor.submit(bind(self._get_page), url, params, headers, next_page))
+                        next_page += 1
+                    yield from pending.popleft().result().get(items_key) or []
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_all(self, url: str, items_key: str, params: dict = None, headers: dict = None) -> List[dict]:
+        """Все элементы списка (см. iter_items)."""
+        return list(self.iter_items(url, items_key, params, headers))
+
+
+class AsyncPaginator(Paginator):
+    """Асинхронный аналог Paginator на базе AsyncMyRequests."""
+
+    def __init__(self, request: AsyncMyRequests = None, per_page: int = 100, window: int = None, test_name: str = None,
+                 cache: bool = True):
+        super().__init__(request or AsyncMyRequests(), per_page, window, test_name, cache)
+
+    async def _get_page(self, url: str, params: dict, headers: dict, page: int) -> dict:
+        response = await self.request.get(url=url, data=self._page_params(params, page), headers=headers, cache=self.cache)
+        self.assertions.assert_status_code(response, HTTPStatus.OK, self.test_name)
+        return response.json()
+
+    async def iter_items(self, url: str, items_key: str, params: dict = None, headers: dict = None) -> AsyncIterator[dict]:
+        """Элементы всех страниц по порядку (async for)."""
+        first_page = await self._get_page(url, params, headers, 1)
+        for item in first_page.get(items_key) or []:
+            yield item
+        pages = self._page_count(first_page.get("pagination"))
+
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= pages:
+                while next_page <= pages and len(pending) < self.window:
+                    pending.append(asyncio.ensure_future(self._get_page(url, params, headers, next_page)))
+                    next_page += 1
+                for item in (await pending.popleft()).get(items_key) or []:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_all(self, url: str, items_key: str, params: dict = None, headers: dict = None) -> List[dict]:
+        """Все элементы списка (см. iter_items)."""
+        return [item async for item in self.iter_items(url, items_key, params, headers)]
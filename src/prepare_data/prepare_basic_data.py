@@ -1,6 +1,8 @@
 import json
-import allure
 from httpx import Response, Request
+from settings import settings
+from src.attachments import AllureAttachments
+from src.response import ParsedResponse
 
 
 class BaseTestData:
@@ -16,30 +18,23 @@ class BaseTestData:
 
     @staticmethod
     def attach_request(request: Request):
-        # request_data = request.json()
-
-        formatted_request = json.dumps(request, indent=4, ensure_ascii=False)
-        allure.attach(
-            name="Request",
-            body=formatted_request,
-            attachment_type=allure.attachment_type.JSON,
-        )
+        AllureAttachments.attach_json(request, name="Request")
 
     @staticmethod
     def attach_response(response: Response, method: str):
-        if response.status_code == 204:
-            print("No content to attach (204 status code).")
+        if response.status_code == 204 or not response.content:
+            print(f"No content to attach ({response.status_code} status code).")
             return
-            
-        try:
-            response_data = response.json()
-        except ValueError:
-            print("Response is not valid JSON.")
-            response_data = {}
 
-        formatted_response = json.dumps(response_data, indent=4, ensure_ascii=False)
-        allure.attach(
-            name=f"{method} Response",
-            body=formatted_response,
-            attachment_type=allure.attachment_type.JSON,
-        )
+        if not AllureAttachments.enabled():
+            return
+        name = f"{method} Response"
+        is_json = "json" in response.headers.get("Content-Type", "")
+        if is_json and len(response.content) <= settings.ALLURE_ATTACH_MAX_BYTES:
+            try:
+                # Разобранный JSON общий с Validator/Assertions: тело не разбирается повторно
+                AllureAttachments.attach_json(ParsedResponse.of(response).json(), name=name)
+                return
+            except ValueError:
+                pass
+        AllureAttachments.attach_body(response.content, name=name, is_json=is_json)
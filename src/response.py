@@ -0,0 +1,76 @@
+import json
+import httpx
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен: без него используется стандартный json
+    orjson = None
+
+
+def loads(content):
+    """Разбор JSON из bytes/str (orjson, если установлен)."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_pretty(data) -> str:
+    """JSON с отступами и кириллицей без экранирования (для вложений Allure)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            # orjson не сериализует, например, целые больше 64 бит - отдаем стандартному json
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+class ParsedResponse:
+    """
+    Обертка над httpx.Response, разбирающая JSON тела один раз (лениво, при первом вызове json()).
+
+    Все остальные атрибуты и методы делегируются исходному ответу, поэтому обертку можно передавать
+    везде, где ожидается httpx.Response. json() возвращает один и тот же объект всем потребителям
+    (Validator, Assertions, вложение Allure, сервисы) - изменять его на месте не следует.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._json = None
+        self._json_error = None
+        self._parsed = False
+
+    @classmethod
+    def of(cls, response):
+        """Возвращает обертку для ответа (ту же самую, если ответ уже обернут)."""
+        return response if isinstance(response, cls) else cls(response)
+
+    @property
+    def response(self) -> httpx.Response:
+        """Исходный httpx.Response."""
+        return self._response
+
+    def json(self, **kwargs):
+        if kwargs:
+            return self._response.json(**kwargs)
+        if not self._parsed:
+            try:
+                self._json = self._decode()
+            except ValueError as ex:
+                self._json_error = ex
+            self._parsed = True
+        if self._json_error is not None:
+            raise self._json_error
+        return self._json
+
+    def _decode(self):
+        encoding = self._response.charset_encoding
+        if encoding is None or encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+            return loads(self._response.content)
+        return loads(self._response.text)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __repr__(self) -> str:
+        return repr(self._response)
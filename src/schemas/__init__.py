@@ -9,15 +9,18 @@ class GetCompanySchemas:
     create_company = company_response_schema.CompanyDetailsSchema
     get_company_by_id = company_response_schema.CompanyDetailsSchema
     get_companies = company_response_schema.CompaniesListSchema
+    companies_item = company_response_schema.CompanyDetailsSchema  # элемент списка (потоковая валидация)
 
 class GetDeliverySchemas:
     """Класс для хранения схем получения информации о доставках."""
     create_delivery = delivery_response_schema.DeliveryDetailsSchema
     get_delivery_by_id = delivery_response_schema.DeliveryDetailsSchema
     get_deliveries = delivery_response_schema.DeliveriesListSchema
+    deliveries_item = delivery_response_schema.DeliveryDetailsSchema  # элемент списка (потоковая валидация)
 
 class GetPickupPointSchemas:
     """Класс для хранения схем получения информации о пунктах выдачи."""
     create_pickup_point = pickup_point_response_schema.PickupPointCreateResponse
     get_pickup_point_by_id = pickup_point_response_schema.PickupPointByIdResponse
-    get_pickup_points = pickup_point_response_schema.PickupPointsListSchema
\ No newline at end of file
+    get_pickup_points = pickup_point_response_schema.PickupPointsListSchema
+    pickup_points_item = pickup_point_response_schema.PickupPointItem  # элемент списка (потоковая валидация)
\ No newline at end of file
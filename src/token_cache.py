@@ -0,0 +1,295 @@
+import json
+import time
+import asyncio
+import base64
+import threading
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Tuple
+
+from settings import settings
+from src.logger import get_logger
+from src.metrics import HttpMetrics
+from src.token_store import FileTokenStore
+
+
+# Токен, которому осталось жить меньше, считается истекшим: запрос с ним может не успеть дойти до сервера
+_EXPIRY_MARGIN = 5.0
+# Интервал опроса блокировки ключа из aget, пока логин выполняет другой поток или event loop
+_LOCK_POLL_INTERVAL = 0.01
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Время истечения JWT (claim exp, unix time) или None, если токен не JWT или exp не задан."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _Entry:
+    token: str
+    expires_at: float
+    login: Callable[[], str]
+    timer: Optional[threading.Timer] = None
+
+
+class TokenCache:
+    """
+    Кэш токенов доступа на сессию по ключу (роль, id курьера).
+
+    Токен переиспользуется до истечения (claim exp; без exp - AUTH_TOKEN_DEFAULT_TTL) и обновляется
+    заранее в фоновом потоке за AUTH_TOKEN_REFRESH_BEFORE секунд до истечения, поэтому тест не ждет логина.
+    Если фоновое обновление не удалось, токен запрашивается заново при следующем обращении.
+    С общим хранилищем (FileTokenStore) токен берется из него, а логинится только один процесс из нескольких.
+    Токен, отклоненный сервером (401, см. reject), удаляется из кэша и при следующем обращении запрашивается заново.
+    Одновременные запросы одного ключа из потоков (get) и задач asyncio (aget), в том числе из разных event loop,
+    выполняют один логин.
+    """
+
+    logger = get_logger(__name__)
+    _instances = weakref.WeakSet()
+
+    def __init__(self, enabled: bool = None, refresh_before: float = None, default_ttl: float = None,
+                 store: FileTokenStore = None):
+        self.enabled = settings.AUTH_TOKEN_CACHE_ENABLED if enabled is None else enabled
+        self.refresh_before = settings.AUTH_TOKEN_REFRESH_BEFORE if refresh_before is None else refresh_before
+        self.default_ttl = settings.AUTH_TOKEN_DEFAULT_TTL if default_ttl is None else default_ttl
+        self.store = FileTokenStore.from_settings() if store is None and self.enabled else store
+        self._entries = {}
+        self._rejected = set()
+        self._key_locks = {}
+        self._inflight = weakref.WeakKeyDictionary()  # event loop -> {ключ: задача логина}
+        self._lock = threading.Lock()
+        self._instances.add(self)
+
+    def get(self, key: str, login: Callable[[], str]) -> str:
+        """
+        Токен из кэша или результат login(), сохраненный в кэш.
+
+        :param key: Ключ идентичности (например, "admin" или "courier:<id>").
+        :param login: Функция логина, возвращающая токен; используется и для фонового обновления.
+        """
+        if not self.enabled:
+            HttpMetrics.increment("auth.login")
+            return login()
+        token = self._cached(key)
+        if token is not None:
+            return token
+        # Single-flight: логин выполняет первый поток, остальные ждут блокировку ключа и получают его токен
+        with self._key_lock(key):
+            token = self._cached(key)
+            if token is None:
+                token, expires_at = self._obtain(key, login, time.time() + _EXPIRY_MARGIN)
+                self._store(key, token, expires_at, login)
+        return token
+
+    async def aget(self, key: str, alogin: Callable[[], Awaitable[str]], login: Callable[[], str]) -> str:
+        """
+        Асинхронный аналог get.
+
+        :param key: Ключ идентичности.
+        :param alogin: Асинхронная функция логина.
+        :param login: Синхронная функция логина для фонового обновления токена.
+        """
+        if not self.enabled:
+            HttpMetrics.increment("auth.login")
+            return await alogin()
+        token = self._cached(key)
+        if token is not None:
+            return token
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.setdefault(loop, {})
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = loop.create_task(self._aobtain(key, alogin, login))
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # shield: отмена одной ожидающей задачи не отменяет общий логин
+        return await asyncio.shield(task)
+
+    def _cached(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.expires_at - time.time() > _EXPIRY_MARGIN:
+            HttpMetrics.increment("auth.cache_hit")
+            return entry.token
+        return None
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _read_shared(self, key: str, valid_after: float) -> Tuple[Optional[str], float]:
+        """Токен из общего хранилища, если он не отклонен и действует позже valid_after."""
+        token, expires_at = self.store.read(key)
+        if token is not None and token not in self._rejected and expires_at > valid_after:
+            HttpMetrics.increment("auth.shared_hit")
+            return token, expires_at
+        return None, 0.0
+
+    def _obtain(self, key: str, login: Callable[[], str], valid_after: float) -> Tuple[str, float]:
+        """
+        Токен из общего хранилища, если он действует позже valid_after, иначе новый логин.
+        С хранилищем все выполняется под межпроцессной блокировкой ключа.
+        """
+        if self.store is None:
+            HttpMetrics.increment("auth.login")
+            token = login()
+            return token, self._expires_at(token)
+        with self.store.lock(key):
+            token, expires_at = self._read_shared(key, valid_after)
+            if token is None:
+                HttpMetrics.increment("auth.login")
+                token = login()
+                expires_at = self._expires_at(token)
+                self.store.write(key, token, expires_at)
+            return token, expires_at
+
+    async def _aobtain(self, key: str, alogin: Callable[[], Awaitable[str]], login: Callable[[], str]) -> str:
+        """
+        Асинхронный аналог _obtain; полученный токен сохраняется в кэш.
+        Блокировка ключа общая с get и фоновым обновлением: один логин на ключ из потоков и из разных event loop.
+        """
+        lock = self._key_lock(key)
+        # Опрос без ожидания в потоке: event loop не блокируется, а отмененная задача не оставляет блокировку занятой
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+        try:
+            return await self._aobtain_locked(key, alogin, login)
+        finally:
+            lock.release()
+
+    async def _aobtain_locked(self, key: str, alogin: Callable[[], Awaitable[str]], login: Callable[[], str]) -> str:
+        token = self._cached(key)  # мог появиться, пока задача ждала блокировку
+        if token is not None:
+            return token
+        valid_after = time.time() + _EXPIRY_MARGIN
+        if self.store is None:
+            HttpMetrics.increment("auth.login")
+            token = await alogin()
+            expires_at = self._expires_at(token)
+        else:
+            # Межпроцессная блокировка ожидается в отдельном потоке, чтобы не останавливать event loop
+            lock = self.store.lock(key)
+            await asyncio.to_thread(lock.__enter__)
+            try:
+                token, expires_at = self._read_shared(key, valid_after)
+                if token is None:
+                    HttpMetrics.increment("auth.login")
+                    token = await alogin()
+                    expires_at = self._expires_at(token)
+                    self.store.write(key, token, expires_at)
+            finally:
+                lock.__exit__(None, None, None)
+        self._store(key, token, expires_at, login)
+        return token
+
+    def _expires_at(self, token: str) -> float:
+        return jwt_expiry(token) or time.time() + self.default_ttl
+
+    def _store(self, key: str, token: str, expires_at: float, login: Callable[[], str]):
+        now = time.time()
+        lifetime = max(0.0, expires_at - now)
+        # Короткоживущие токены обновляются не раньше середины срока жизни, чтобы не логиниться непрерывно
+        delay = max(lifetime / 2, lifetime - self.refresh_before)
+        entry = _Entry(token, expires_at, login)
+        entry.timer = threading.Timer(delay, self._refresh, args=(key, entry))
+        entry.timer.daemon = True
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = entry
+        if previous is not None and previous.timer is not None:
+            previous.timer.cancel()
+        entry.timer.start()
+
+    def _refresh(self, key: str, entry: _Entry):
+        with self._key_lock(key):
+            with self._lock:
+                if self._entries.get(key) is not entry:
+                    return  # токен уже заменен или кэш очищен
+            try:
+                # Токен, уже обновленный другим процессом, годится, только если он новее текущего
+                token, expires_at = self._obtain(key, entry.login, entry.expires_at)
+            except Exception as ex:
+                HttpMetrics.increment("auth.refresh_failed")
+                self.logger.warning(f"Background token refresh failed for {key}: {ex}")
+                return
+            HttpMetrics.increment("auth.refreshed")
+            self._store(key, token, expires_at, entry.login)
+
+    @classmethod
+    def reject(cls, headers: dict):
+        """
+        Отмечает токен из заголовка Authorization как отклоненный сервером: кэш, выдавший его, удаляет токен,
+        и следующий запрос токена выполняет новый логин (вызывается клиентом при ответе 401).
+        """
+        authorization = (headers or {}).get("Authorization") or ""
+        token = authorization.partition(" ")[2] or authorization
+        if not token:
+            return
+        for cache in list(cls._instances):
+            with cache._lock:
+                keys = [key for key, entry in cache._entries.items() if entry.token == token]
+                if keys:
+                    cache._rejected.add(token)
+            for key in keys:
+                HttpMetrics.increment("auth.rejected")
+                cache.invalidate(key)
+
+    def invalidate(self, key: str):
+        """Удаляет токен из кэша (например, если сервер его отклонил)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None and entry.timer is not None:
+            entry.timer.cancel()
+
+    def clear(self):
+        """Очищает кэш и останавливает фоновые обновления."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.timer is not None:
+                entry.timer.cancel()
+
+
+class TokenHeaders(Mapping):
+    """
+    Заголовки с токеном из кэша: Authorization вычисляется при каждой отправке запроса, поэтому объект можно
+    хранить на всю сессию. Если сервер отклонил токен (401), MyRequests/AsyncMyRequests повторяют запрос
+    один раз с новым токеном.
+    """
+
+    def __init__(self, token: Callable[[], str], atoken: Callable[[], Awaitable[str]] = None, extra: dict = None):
+        """
+        :param token: Функция, возвращающая актуальный токен (например, TokenCache.get).
+        :param atoken: Асинхронный аналог token для AsyncMyRequests.
+        :param extra: Остальные заголовки.
+        """
+        self._token = token
+        self._atoken = atoken
+        self._extra = dict(extra or {})
+
+    def _headers(self, token: str) -> dict:
+        return {**self._extra, "Authorization": f"Bearer {token}"}
+
+    def resolve(self) -> dict:
+        """Заголовки с текущим токеном."""
+        return self._headers(self._token())
+
+    async def aresolve(self) -> dict:
+        """Асинхронный аналог resolve."""
+        return self._headers(await self._atoken() if self._atoken is not None else self._token())
+
+    def __getitem__(self, name: str) -> str:
+        return self.resolve()[name]
+
+    def __iter__(self):
+        return iter([*self._extra, "Authorization"])
+
+    def __len__(self) -> int:
+        return len(self._extra) + 1
@@ -0,0 +1,95 @@
+import os
+import json
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple
+
+from settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки через msvcrt
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Эксклюзивная межпроцессная блокировка файла (ожидает освобождения)."""
+    with open(path, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK сдается после 10 попыток по секунде - ждем дальше
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileTokenStore:
+    """
+    Общее хранилище токенов на локальном диске для нескольких процессов (воркеры pytest-xdist и т.п.).
+
+    Каждый ключ - отдельный файл с токеном и временем истечения и свой файл блокировки: логин под одним ключом
+    выполняет только один процесс, остальные ждут и читают готовый токен. Ключи включают BASE_URL,
+    поэтому токены разных окружений не смешиваются.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls) -> Optional["FileTokenStore"]:
+        """
+        Хранилище из настройки AUTH_TOKEN_STORE_DIR; в воркерах pytest-xdist без настройки - каталог во временной папке.
+        None - токены не разделяются между процессами.
+        """
+        directory = settings.AUTH_TOKEN_STORE_DIR
+        if not directory and os.environ.get("PYTEST_XDIST_WORKER"):
+            directory = os.path.join(tempfile.gettempdir(), "courierica_tokens")
+        return cls(directory) if directory else None
+
+    def _path(self, key: str, suffix: str) -> Path:
+        digest = hashlib.sha1(f"{settings.BASE_URL}|{key}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{suffix}"
+
+    @contextmanager
+    def lock(self, key: str):
+        """Блокировка ключа на время чтения и логина (single-flight между процессами)."""
+        with _file_lock(self._path(key, ".lock")):
+            yield
+
+    def read(self, key: str) -> Tuple[Optional[str], float]:
+        """Токен и время его истечения (unix time) или (None, 0), если токена нет."""
+        try:
+            with open(self._path(key, ".json"), encoding="utf-8") as file:
+                data = json.load(file)
+            return data["token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0.0
+
+    def write(self, key: str, token: str, expires_at: float):
+        path = self._path(key, ".json")
+        # Токен пишется во временный файл (только для владельца) и атомарно заменяет старый
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"token": token, "expires_at": expires_at}, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,8 @@
+from src.transports.pluggable import PluggableTransport
+from src.transports.cassette import Cassette, CassetteTransport
+from src.transports.timing import TimingTransport
+from src.transports.cache import ResponseCache, CacheTransport, CACHE_EXTENSION
+from src.transports.rate_limit import RateLimiter, RateLimitTransport
+from src.transports.retry import RetryTransport, CircuitBreaker, CircuitOpenError
+from src.transports.compression import CompressionTransport
+from src.transports.har import HarRecorder, HarTransport
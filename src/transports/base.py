@@ -0,0 +1,52 @@
+import httpx
+
+
+class TransportWrapper(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Базовая обертка над httpx-транспортом: по умолчанию просто делегирует запрос внутреннему транспорту.
+    Одна и та же обертка работает и для httpx.Client, и для httpx.AsyncClient.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    def close(self):
+        self._transport.close()
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def read_raw(response: httpx.Response) -> bytes:
+    """
+    Читает тело ответа транспорта как есть (без распаковки Content-Encoding) и закрывает ответ.
+    Поток читается напрямую: ответы с httpx.ByteStream (mock-транспорт, кассета) уже помечены прочитанными.
+    """
+    try:
+        return b"".join(response.stream)
+    finally:
+        response.close()
+
+
+async def aread_raw(response: httpx.Response) -> bytes:
+    """Асинхронный аналог read_raw."""
+    try:
+        return b"".join([chunk async for chunk in response.stream])
+    finally:
+        await response.aclose()
+
+
+def rebuild_response(response: httpx.Response, raw: bytes) -> httpx.Response:
+    """Новый ответ транспорта с уже прочитанным сырым телом (клиент распакует его сам)."""
+    return httpx.Response(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=httpx.ByteStream(raw),
+        extensions=response.extensions,
+    )
@@ -0,0 +1,228 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import httpx
+from settings import settings
+from src.metrics import HttpMetrics
+from src.transports.base import TransportWrapper, read_raw, aread_raw, rebuild_response
+
+
+_CACHEABLE_METHODS = ("GET",)
+# Расширение запроса httpx: {"cache": False} - запрос идет мимо кэша (потоковое чтение, опрос состояния)
+CACHE_EXTENSION = "cache"
+_MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+# Эндпоинты одноразовых значений (SMS-код входа): каждый GET должен вернуть актуальное значение
+_ONE_TIME_PATH_SUFFIXES = ("/sms_code",)
+
+
+@dataclass
+class _CacheEntry:
+    path: str
+    response: httpx.Response
+    raw: bytes
+    etag: str
+    stored_at: float
+
+
+def _cache_key(request: httpx.Request) -> str:
+    """Ключ кэша: метод, URL с отсортированными параметрами и хэш авторизации (Authorization + Cookie)."""
+    parts = urlsplit(str(request.url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    identity = hashlib.sha1(
+        f"{request.headers.get('Authorization', '')}|{request.headers.get('Cookie', '')}".encode("utf-8")
+    ).hexdigest()
+    return f"{request.method} {parts.scheme}://{parts.netloc}{parts.path}?{query} {identity}"
+
+
+def _related_paths(path: str, other: str) -> bool:
+    """Пути относятся к одному ресурсу: совпадают или один вложен в другой (/couriers и /couriers/{id})."""
+    path, other = path.rstrip("/"), other.rstrip("/")
+    return path == other or path.startswith(other + "/") or other.startswith(path + "/")
+
+
+def _no_store(headers: httpx.Headers) -> bool:
+    cache_control = headers.get("Cache-Control", "").lower()
+    return "no-store" in cache_control or "no-cache" in cache_control
+
+
+class ResponseCache:
+    """
+    Кэш GET-ответов на время сессии (LRU с TTL), общий для всех клиентов.
+
+    Ответ кэшируется для пары URL + авторизация, поэтому разные пользователи не видят ответы друг друга.
+    POST/PUT/PATCH/DELETE сбрасывают записи того же ресурса, вложенных и родительских путей.
+    Устаревшая запись с ETag не удаляется, а перепроверяется запросом с If-None-Match.
+    Запросы с расширением {"cache": False} (потоковое чтение, опрос состояния) и запросы одноразовых значений
+    (SMS-код) идут мимо кэша.
+    """
+
+    _current = None
+    _configured = False
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, enabled: bool = None, ttl: float = None, max_entries: int = None):
+        """
+        Включает кэш для клиентов, созданных после вызова (None - значения из настроек).
+
+        :param enabled: Включить кэш ответов.
+        :param ttl: Время жизни записи в секундах.
+        :param max_entries: Максимальное число записей (LRU).
+        """
+        enabled = settings.HTTP_CACHE_ENABLED if enabled is None else enabled
+        ttl = settings.HTTP_CACHE_TTL if ttl is None else ttl
+        max_entries = settings.HTTP_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        with cls._lock:
+            cls._current = cls(ttl, max_entries) if enabled else None
+            cls._configured = True
+
+    @classmethod
+    def get_current(cls):
+        """Текущий кэш или None, если кэш выключен."""
+        if not cls._configured:
+            cls.configure()
+        return cls._current
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str):
+        """
+        Запись кэша по ключу.
+
+        :return: Пара (запись или None, свежая ли запись).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            fresh = time.monotonic() - entry.stored_at < self.ttl
+            if not fresh and not entry.etag:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return entry, fresh
+
+    def put(self, key: str, path: str, response: httpx.Response, raw: bytes, generation: int):
+        """Сохраняет ответ, если с начала запроса не было изменений ресурсов (generation не изменился)."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _CacheEntry(path, response, raw, response.headers.get("ETag", ""), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                HttpMetrics.increment("cache.evicted")
+
+    def touch(self, key: str):
+        """Продлевает запись после ответа 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate(self, path: str):
+        """Удаляет записи ресурса path, а также вложенных и родительских путей."""
+        with self._lock:
+            self._generation += 1
+            keys = [key for key, entry in self._entries.items() if _related_paths(entry.path, path)]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            HttpMetrics.increment("cache.invalidated", len(keys))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def _cached_response(entry: _CacheEntry) -> httpx.Response:
+    return rebuild_response(entry.response, entry.raw)
+
+
+class CacheTransport(TransportWrapper):
+    """Обертка транспорта: отдает GET-ответы из ResponseCache и сбрасывает кэш при изменении ресурсов."""
+
+    def __init__(self, transport, cache: ResponseCache):
+        super().__init__(transport)
+        self.cache = cache
+
+    def _lookup(self, request: httpx.Request):
+        """Запись для запроса: (ключ, свежая запись) или (ключ, устаревшая запись с ETag для перепроверки)."""
+        if (request.method not in _CACHEABLE_METHODS or request.extensions.get(CACHE_EXTENSION) is False
+                or request.url.path.rstrip("/").endswith(_ONE_TIME_PATH_SUFFIXES)
+                or _no_store(request.headers) or "If-None-Match" in request.headers):
+            return None, None, False
+        key = _cache_key(request)
+        entry, fresh = self.cache.get(key)
+        if entry is None:
+            HttpMetrics.increment("cache.miss")
+        elif fresh:
+            HttpMetrics.increment("cache.hit")
+        else:
+            HttpMetrics.increment("cache.stale")
+            request.headers["If-None-Match"] = entry.etag
+        return key, entry, fresh
+
+    def _store(self, key: str, request: httpx.Request, response: httpx.Response, raw: bytes, generation: int):
+        if response.status_code == 200 and not _no_store(response.headers):
+            self.cache.put(key, request.url.path, response, raw, generation)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method in _MUTATING_METHODS:
+            try:
+                return self._transport.handle_request(request)
+            finally:
+                self.cache.invalidate(request.url.path)
+
+        key, entry, fresh = self._lookup(request)
+        if key is None:
+            return self._transport.handle_request(request)
+        if fresh:
+            return _cached_response(entry)
+
+        generation = self.cache.generation
+        response = self._transport.handle_request(request)
+        raw = read_raw(response)
+        if entry is not None and response.status_code == 304:
+            HttpMetrics.increment("cache.revalidated")
+            self.cache.touch(key)
+            return _cached_response(entry)
+        self._store(key, request, response, raw, generation)
+        return rebuild_response(response, raw)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method in _MUTATING_METHODS:
+            try:
+                return await self._transport.handle_async_request(request)
+            finally:
+                self.cache.invalidate(request.url.path)
+
+        key, entry, fresh = self._lookup(request)
+        if key is None:
+            return await self._transport.handle_async_request(request)
+        if fresh:
+            return _cached_response(entry)
+
+        generation = self.cache.generation
+        response = await self._transport.handle_async_request(request)
+        raw = await aread_raw(response)
+        if entry is not None and response.status_code == 304:
+            HttpMetrics.increment("cache.revalidated")
+            self.cache.touch(key)
+            return _cached_response(entry)
+        self._store(key, request, response, raw, generation)
+        return rebuild_response(response, raw)
@@ -0,0 +1,197 @@
+import re
+import gzip
+import json
+import base64
+import hashlib
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import httpx
+from functions import get_current_path
+from settings import settings
+from src.transports.base import TransportWrapper, read_raw, aread_raw, rebuild_response
+
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+
+
+class CassetteMissError(httpx.TransportError):
+    """В кассете нет записи для запроса (режим replay)."""
+
+
+def _normalize(text: str) -> str:
+    """Заменяет изменчивые значения (UUID из BaseGenerator.get_id, даты и время) на плейсхолдеры."""
+    return _DATETIME_RE.sub("<datetime>", _UUID_RE.sub("<uuid>", text))
+
+
+def _normalize_url(url: httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return _normalize(f"{parts.scheme}://{parts.netloc}{parts.path}?{query}")
+
+
+def _body_hash(content: bytes) -> str:
+    """Хэш тела запроса после нормализации (для JSON - с сортировкой ключей)."""
+    if not content:
+        return ""
+    text = content.decode("utf-8", errors="replace")
+    try:
+        text = json.dumps(json.loads(text), sort_keys=True, ensure_ascii=False)
+    except ValueError:
+        pass
+    return hashlib.sha1(_normalize(text).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Кассета запросов/ответов на диске (JSON Lines в gzip).
+
+    В режиме record каждая пара запрос/ответ дописывается в файл, в режиме replay ответы отдаются из файла без сети.
+    Запрос сопоставляется с записью по методу, нормализованному URL и хэшу нормализованного тела;
+    если тело не совпало (например, другие случайные данные Faker) - по методу и URL.
+    Записи с одинаковым ключом отдаются в порядке записи, поэтому воспроизведение детерминировано.
+    """
+
+    _current = None
+    _configured = False
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, mode: str):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Invalid cassette mode '{mode}', must be one of {(OFF, RECORD, REPLAY)}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_mode = "wt"  # новая запись перезаписывает кассету, после close - дописываем
+        self._by_body = defaultdict(deque)
+        self._by_url = defaultdict(deque)
+        if mode == REPLAY:
+            self._load()
+
+    @classmethod
+    def configure(cls, mode: str = None, path: str = None):
+        """
+        Включает кассету для клиентов, созданных после вызова (None - значения из настроек).
+
+        :param mode: off | record | replay.
+        :param path: Путь к файлу кассеты.
+        """
+        mode = mode or settings.HTTP_CASSETTE_MODE
+        path = path or settings.HTTP_CASSETTE_PATH
+        with cls._lock:
+            if cls._current is not None:
+                cls._current.close()
+            cls._current = None if mode == OFF else cls(get_current_path(path), mode)
+            cls._configured = True
+
+    @classmethod
+    def get_current(cls):
+        """Текущая кассета или None, если режим off."""
+        if not cls._configured:
+            cls.configure()
+        return cls._current
+
+    @classmethod
+    def close_current(cls):
+        with cls._lock:
+            if cls._current is not None:
+                cls._current.close()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    entry = json.loads(line)
+                    self._by_body[(entry["method"], entry["url"], entry["body_hash"])].append(entry)
+                    self._by_url[(entry["method"], entry["url"])].append(entry)
+            except (EOFError, gzip.BadGzipFile):
+                # Запись могла оборваться на последней строке - используем то, что успели прочитать
+                pass
+
+    def record(self, request: httpx.Request, response: httpx.Response, raw: bytes):
+        try:
+            body, encoding = raw.decode("utf-8"), "text"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(raw).decode("ascii"), "base64"
+        entry = {
+            "method": request.method,
+            "url": _normalize_url(request.url),
+            "body_hash": _body_hash(request.content),
+            "status": response.status_code,
+            "headers": response.headers.multi_items(),
+            "body": body,
+            "encoding": encoding,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, self._file_mode, encoding="utf-8")
+                self._file_mode = "at"
+            self._file.write(line)
+            self._file.flush()
+
+    def replay(self, request: httpx.Request) -> httpx.Response:
+        method, url = request.method, _normalize_url(request.url)
+        with self._lock:
+            entries = self._by_body.get((method, url, _body_hash(request.content)))
+            if not entries:
+                entries = self._by_url.get((method, url))
+            if not entries:
+                raise CassetteMissError(f"No cassette entry for {method} {url}", request=request)
+            entry = entries.popleft()
+            # Запись используется один раз: удаляем ее и из второго индекса
+            for index, key in ((self._by_url, (method, url)),
+                               (self._by_body, (method, url, entry["body_hash"]))):
+                if entry in index.get(key, ()):
+                    index[key].remove(entry)
+
+        raw = entry["body"].encode("utf-8") if entry["encoding"] == "text" else base64.b64decode(entry["body"])
+        return httpx.Response(
+            status_code=entry["status"],
+            headers=entry["headers"],
+            stream=httpx.ByteStream(raw),
+            request=request,
+        )
+
+
+class CassetteTransport(TransportWrapper):
+    """Обертка транспорта: записывает обмен в кассету или отвечает из нее без сети."""
+
+    def __init__(self, transport, cassette: Cassette):
+        super().__init__(transport)
+        self.cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self.cassette.mode == REPLAY:
+            return self.cassette.replay(request)
+        response = self._transport.handle_request(request)
+        raw = read_raw(response)
+        self.cassette.record(request, response, raw)
+        return rebuild_response(response, raw)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self.cassette.mode == REPLAY:
+            return self.cassette.replay(request)
+        response = await self._transport.handle_async_request(request)
+        raw = await aread_raw(response)
+        self.cassette.record(request, response, raw)
+        return rebuild_response(response, raw)
@@ -0,0 +1,203 @@
+import gzip
+import zlib
+import threading
+from typing import Optional
+
+import httpx
+from settings import settings
+from src.metrics import HttpMetrics, endpoint_template
+from src.transports.base import TransportWrapper
+
+try:
+    import zstandard
+except ImportError:  # zstd необязателен: нужен только при HTTP_REQUEST_COMPRESSION=zstd
+    zstandard = None
+
+
+OFF = "off"
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+class _ZlibDecoder:
+    """Распаковка gzip/deflate из стандартной библиотеки (если распаковщики httpx недоступны)."""
+
+    def __init__(self, wbits: int):
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decode(self, data: bytes) -> bytes:
+        try:
+            return self._decompressor.decompress(data)
+        except zlib.error as ex:
+            raise httpx.DecodingError(str(ex)) from ex
+
+    def flush(self) -> bytes:
+        try:
+            return self._decompressor.flush()
+        except zlib.error as ex:
+            raise httpx.DecodingError(str(ex)) from ex
+
+
+try:
+    # Распаковщики Content-Encoding самого httpx (включая br/zstd): модуль приватный и может измениться
+    from httpx._decoders import SUPPORTED_DECODERS
+except ImportError:
+    SUPPORTED_DECODERS = {
+        "gzip": lambda: _ZlibDecoder(zlib.MAX_WBITS | 16),
+        "deflate": lambda: _ZlibDecoder(zlib.MAX_WBITS),
+    }
+
+
+class _TrafficStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Поток тела ответа, считающий байты на проводе и после распаковки Content-Encoding."""
+
+    def __init__(self, stream, encoding: str, on_close):
+        self._stream = stream
+        self._decoder = SUPPORTED_DECODERS[encoding]() if encoding in SUPPORTED_DECODERS else None
+        self._on_close = on_close
+        self._wire = 0
+        self._raw = 0
+
+    def _count(self, chunk: bytes):
+        self._wire += len(chunk)
+        self._raw += len(self._decoder.decode(chunk)) if self._decoder else len(chunk)
+
+    def _finish(self):
+        if self._on_close is None:
+            return
+        if self._decoder:
+            try:
+                self._raw += len(self._decoder.flush())
+            except httpx.DecodingError:
+                pass
+        self._on_close(self._wire, self._raw)
+        self._on_close = None
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._count(chunk)
+            yield chunk
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._count(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class CompressionTransport(TransportWrapper):
+    """
+    Обертка транспорта: сжатие тел запросов (gzip/zstd), явный Accept-Encoding и учет трафика по эндпоинтам.
+
+    Сжимаются тела от HTTP_COMPRESSION_MIN_BYTES, если сжатие уменьшает их размер. Эндпоинт, ответивший
+    на сжатое тело 415 Unsupported Media Type, запоминается: запрос повторяется без сжатия, и дальше
+    тела для него не сжимаются.
+    """
+
+    _unsupported = set()
+    _lock = threading.Lock()
+
+    def __init__(self, transport, encoding: str = None, min_bytes: int = None, accept_encoding: str = None):
+        super().__init__(transport)
+        self.encoding = (settings.HTTP_REQUEST_COMPRESSION if encoding is None else encoding).lower()
+        if self.encoding not in (OFF, GZIP, ZSTD):
+            raise ValueError(f"Invalid request compression '{self.encoding}', must be one of {(OFF, GZIP, ZSTD)}")
+        if self.encoding == ZSTD and zstandard is None:
+            raise ImportError("Request compression 'zstd' requires the 'zstandard' package")
+        self.min_bytes = settings.HTTP_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+        self.accept_encoding = settings.HTTP_ACCEPT_ENCODING if accept_encoding is None else accept_encoding
+
+    def _compress(self, request: httpx.Request, key: tuple) -> Optional[httpx.Request]:
+        """Сжатая копия запроса или None, если сжимать не нужно."""
+        content = request.content
+        if (self.encoding == OFF or len(content) < max(self.min_bytes, 1)
+                or "Content-Encoding" in request.headers or key in self._unsupported):
+            return None
+        if self.encoding == GZIP:
+            body = gzip.compress(content, compresslevel=6)
+        else:
+            body = zstandard.ZstdCompressor().compress(content)
+        if len(body) >= len(content):
+            return None
+
+        headers = request.headers.copy()
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        return httpx.Request(request.method, request.url, headers=headers, content=body, extensions=request.extensions)
+
+    def _prepare(self, request: httpx.Request):
+        if self.accept_encoding:
+            request.headers["Accept-Encoding"] = self.accept_encoding
+        key = (request.method, endpoint_template(request.url))
+        return key, self._compress(request, key)
+
+    def _reject(self, key: tuple):
+        with self._lock:
+            self._unsupported.add(key)
+        HttpMetrics.increment("compression.rejected")
+
+    @staticmethod
+    def _track(key: tuple, request: httpx.Request, sent: httpx.Request, response: httpx.Response):
+        method, endpoint = key
+        HttpMetrics.record_traffic(
+            method, endpoint,
+            count=1,
+            request_raw=len(request.content),
+            request_sent=len(sent.content),
+            compressed_requests=int(sent is not request),
+        )
+        encoding = response.headers.get("Content-Encoding", "").strip().lower()
+
+        def on_close(wire: int, raw: int):
+            HttpMetrics.record_traffic(
+                method, endpoint,
+                response_wire=wire,
+                response_raw=raw,
+                compressed_responses=int(bool(encoding) and encoding != "identity"),
+            )
+
+        if isinstance(response.stream, httpx.ByteStream):
+            # Тело уже в памяти (mock-транспорт, кассета): считаем сразу
+            stream = _TrafficStream(response.stream, encoding, on_close)
+            for _ in stream:
+                pass
+            stream.close()
+        else:
+            response.stream = _TrafficStream(response.stream, encoding, on_close)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        key, compressed = self._prepare(request)
+        sent = compressed or request
+        response = self._transport.handle_request(sent)
+        if compressed is not None and response.status_code == 415:
+            response.close()
+            self._reject(key)
+            sent = request
+            response = self._transport.handle_request(request)
+        self._track(key, request, sent, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key, compressed = self._prepare(request)
+        sent = compressed or request
+        response = await self._transport.handle_async_request(sent)
+        if compressed is not None and response.status_code == 415:
+            await response.aclose()
+            self._reject(key)
+            sent = request
+            response = await self._transport.handle_async_request(request)
+        self._track(key, request, sent, response)
+        return response
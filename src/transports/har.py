@@ -0,0 +1,273 @@
+import re
+import json
+import time
+import base64
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from functions import get_current_path
+from settings import settings
+from src.metrics import current_test_name
+from src.transports.base import TransportWrapper
+
+
+OFF = "off"
+SESSION = "session"
+TEST = "test"
+
+_MASKED_HEADERS = ("authorization", "cookie", "set-cookie")
+_HEADER = '{"log": {"version": "1.2", "creator": {"name": "courierica_testing", "version": "1.0"}, "entries": [\n'
+_FOOTER = "\n]}}\n"
+
+
+def _file_name(test_name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", test_name).strip("_")[:200] or "unknown"
+
+
+def _headers(headers: httpx.Headers) -> list:
+    # Токены и cookies в файл не попадают
+    return [
+        {"name": name, "value": "***" if name.lower() in _MASKED_HEADERS else value}
+        for name, value in headers.multi_items()
+    ]
+
+
+def _text(content: bytes) -> dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"text": base64.b64encode(content).decode("ascii"), "encoding": "base64"}
+
+
+class HarRecorder:
+    """
+    Запись трафика сессии в HAR 1.2 (один файл на сессию или на тест).
+
+    Записи дописываются в файл по мере завершения запросов, поэтому память не растет на длинных прогонах;
+    заголовок и окончание JSON пишутся при открытии и закрытии файла.
+    """
+
+    _current = None
+    _configured = False
+    _lock = threading.Lock()
+
+    def __init__(self, mode: str, directory: str):
+        if mode not in (SESSION, TEST):
+            raise ValueError(f"Invalid HAR mode '{mode}', must be one of {(OFF, SESSION, TEST)}")
+        self.mode = mode
+        self.directory = Path(directory)
+        self._files = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, mode: str = None, directory: str = None):
+        """
+        Включает запись HAR для клиентов, созданных после вызова (None - значения из настроек).
+
+        :param mode: off | session | test.
+        :param directory: Каталог для HAR-файлов.
+        """
+        mode = mode or settings.HTTP_HAR_MODE
+        directory = directory or settings.HTTP_HAR_DIR
+        with cls._lock:
+            if cls._current is not None:
+                cls._current.close()
+            cls._current = None if mode == OFF else cls(mode, get_current_path(directory))
+            cls._configured = True
+
+    @classmethod
+    def get_current(cls):
+        """Текущий HAR-рекордер или None, если запись выключена."""
+        if not cls._configured:
+            cls.configure()
+        return cls._current
+
+    @classmethod
+    def close_current(cls):
+        with cls._lock:
+            if cls._current is not None:
+                cls._current.close()
+
+    @classmethod
+    def close_test(cls, test_name: str):
+        """Закрывает HAR-файл теста (в режиме test)."""
+        recorder = cls._current
+        if recorder is not None and recorder.mode == TEST and test_name:
+            recorder._close_file(_file_name(test_name))
+
+    def write(self, entry: dict):
+        name = "session" if self.mode == SESSION else _file_name(entry.get("_testName") or "no_test")
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            file = self._files.get(name)
+            if file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                file = open(self.directory / f"{name}.har", "w", encoding="utf-8")
+                file.write(_HEADER)
+                self._files[name] = file
+            else:
+                file.write(",\n")
+            file.write(line)
+            file.flush()
+
+    def _close_file(self, name: str):
+        with self._lock:
+            file = self._files.pop(name, None)
+            if file is not None:
+                file.write(_FOOTER)
+                file.close()
+
+    def close(self):
+        for name in list(self._files):
+            self._close_file(name)
+
+
+class _HarExchange:
+    """Одна пара запрос/ответ: собирает тело ответа и пишет запись HAR при закрытии потока."""
+
+    def __init__(self, recorder: HarRecorder, request: httpx.Request):
+        self.recorder = recorder
+        self.request = request
+        self.test_name = current_test_name()
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+
+    def finish(self, response: httpx.Response, wire: bytes):
+        content = wire
+        if response.headers.get("Content-Encoding", "").strip().lower() not in ("", "identity"):
+            # Распаковку Content-Encoding выполняет httpx.Response (кодировки, которые поддерживает httpx)
+            try:
+                content = httpx.Response(
+                    response.status_code, headers={"Content-Encoding": response.headers["Content-Encoding"]}, content=wire
+                ).content
+            except httpx.DecodingError:
+                pass
+        self.recorder.write(self._entry(response, wire, content))
+
+    def _timings(self, response: httpx.Response) -> dict:
+        timing = response.extensions.get("timing")
+        if timing is None:
+            # Ответ без сети (кассета) или замеры выключены: известна только общая длительность
+            return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0,
+                    "wait": (time.perf_counter() - self.started) * 1000, "receive": 0}
+        send = max(0.0, timing.ttfb - timing.connect - timing.tls - timing.wait)
+        return {
+            "blocked": timing.queued * 1000,
+            "dns": -1,
+            "connect": timing.connect * 1000 if timing.connect else -1,
+            "ssl": timing.tls * 1000 if timing.tls else -1,
+            "send": send * 1000,
+            "wait": timing.wait * 1000,
+            "receive": timing.download * 1000,
+        }
+
+    def _entry(self, response: httpx.Response, wire: bytes, content: bytes) -> dict:
+        request = self.request
+        http_version = response.extensions.get("http_version", b"HTTP/1.1").decode("ascii")
+        timings = self._timings(response)
+        har_request = {
+            "method": request.method,
+            "url": str(request.url),
+            "httpVersion": http_version,
+            "cookies": [],
+            "headers": _headers(request.headers),
+            "queryString": [{"name": name, "value": value} for name, value in request.url.params.multi_items()],
+            "headersSize": -1,
+            "bodySize": len(request.content),
+        }
+        if request.content:
+            har_request["postData"] = {
+                "mimeType": request.headers.get("Content-Type", ""),
+                **_text(request.content),
+            }
+        return {
+            "startedDateTime": self.started_at.isoformat(),
+            "time": sum(value for value in timings.values() if value > 0),
+            "request": har_request,
+            "response": {
+                "status": response.status_code,
+                "statusText": response.reason_phrase,
+                "httpVersion": http_version,
+                "cookies": [],
+                "headers": _headers(response.headers),
+                "content": {
+                    "size": len(content),
+                    "compression": len(content) - len(wire),
+                    "mimeType": response.headers.get("Content-Type", ""),
+                    **_text(content),
+                },
+                "redirectURL": response.headers.get("Location", ""),
+                "headersSize": -1,
+                "bodySize": len(wire),
+            },
+            "cache": {},
+            "timings": timings,
+            "_testName": self.test_name,
+            "_requestId": response.headers.get("X-Request-ID"),
+        }
+
+
+class _HarStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Поток тела ответа, передающий тело в запись HAR после закрытия."""
+
+    def __init__(self, stream, exchange: _HarExchange, response: httpx.Response):
+        self._stream = stream
+        self._exchange = exchange
+        self._response = response
+        self._chunks = []
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._chunks.append(chunk)
+            yield chunk
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._chunks.append(chunk)
+            yield chunk
+
+    def _finish(self):
+        if self._exchange is not None:
+            self._exchange.finish(self._response, b"".join(self._chunks))
+            self._exchange = None
+            self._chunks = []
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class HarTransport(TransportWrapper):
+    """Обертка транспорта: записывает каждый обмен в HAR через HarRecorder."""
+
+    def __init__(self, transport, recorder: HarRecorder):
+        super().__init__(transport)
+        self.recorder = recorder
+
+    def _wrap(self, exchange: _HarExchange, response: httpx.Response) -> httpx.Response:
+        if isinstance(response.stream, httpx.ByteStream):
+            # Тело уже в памяти (mock-транспорт, кассета): пишем запись сразу
+            exchange.finish(response, b"".join(response.stream))
+        else:
+            response.stream = _HarStream(response.stream, exchange, response)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        exchange = _HarExchange(self.recorder, request)
+        return self._wrap(exchange, self._transport.handle_request(request))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        exchange = _HarExchange(self.recorder, request)
+        return self._wrap(exchange, await self._transport.handle_async_request(request))
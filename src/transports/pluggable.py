@@ -0,0 +1,143 @@
+import asyncio
+import importlib
+import threading
+import httpx
+from settings import settings
+
+
+NETWORK = "network"
+_SCHEMES = ("mock", "wsgi", "asgi", "transport")
+
+
+class _AsyncToSyncTransport(httpx.BaseTransport):
+    """Позволяет синхронному клиенту работать с async-транспортом (например, ASGI-приложением)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        async def _handle():
+            response = await self._transport.handle_async_request(request)
+            content = await response.aread()
+            return httpx.Response(
+                response.status_code, headers=response.headers, content=content, extensions=response.extensions
+            )
+
+        return asyncio.run(_handle())
+
+
+class _SyncToAsyncTransport(httpx.AsyncBaseTransport):
+    """Позволяет async-клиенту работать с синхронным транспортом (например, WSGI-приложением)."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+
+        def _handle():
+            response = self._transport.handle_request(request)
+            content = response.read()
+            return httpx.Response(
+                response.status_code, headers=response.headers, content=content, extensions=response.extensions
+            )
+
+        return await asyncio.to_thread(_handle)
+
+
+class PluggableTransport:
+    """
+    Точка подключения транспорта для MyRequests, AsyncMyRequests и AuthService.
+
+    Транспорт задается строкой (настройка HTTP_TRANSPORT или опция pytest --http-transport):
+        network                     - реальная сеть (по умолчанию);
+        mock:<module>:<handler>     - httpx.MockTransport с функцией handler(request) -> httpx.Response;
+        wsgi:<module>:<app>         - WSGI-приложение in-process (httpx.WSGITransport);
+        asgi:<module>:<app>         - ASGI-приложение in-process (httpx.ASGITransport);
+        transport:<module>:<obj>    - готовый httpx-транспорт или фабрика без аргументов, его возвращающая.
+    Вместо строки можно передать готовый объект транспорта.
+    """
+
+    _spec = None  # None - берется из настройки HTTP_TRANSPORT
+    _transport = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, spec=None):
+        """
+        Устанавливает транспорт. Уже созданные клиенты нужно пересоздать (MyRequests.close(), AuthService.close()).
+
+        :param spec: Строка-описание транспорта, объект httpx-транспорта или None (вернуть настройку HTTP_TRANSPORT).
+        """
+        with cls._lock:
+            cls._spec = spec
+            cls._transport = None
+
+    @classmethod
+    def get_spec(cls):
+        return settings.HTTP_TRANSPORT if cls._spec is None else cls._spec
+
+    @classmethod
+    def is_network(cls) -> bool:
+        return cls.get_spec() == NETWORK
+
+    @classmethod
+    def get_transport(cls):
+        """Возвращает подключенный транспорт (None - реальная сеть)."""
+        if cls.is_network():
+            return None
+        with cls._lock:
+            if cls._transport is None:
+                cls._transport = cls._resolve(cls.get_spec())
+            return cls._transport
+
+    @classmethod
+    def get_sync_transport(cls):
+        """Подключенный транспорт для httpx.Client (None - реальная сеть)."""
+        transport = cls.get_transport()
+        if transport is None or isinstance(transport, httpx.BaseTransport):
+            return transport
+        return _AsyncToSyncTransport(transport)
+
+    @classmethod
+    def get_async_transport(cls):
+        """Подключенный транспорт для httpx.AsyncClient (None - реальная сеть)."""
+        transport = cls.get_transport()
+        if transport is None or isinstance(transport, httpx.AsyncBaseTransport):
+            return transport
+        return _SyncToAsyncTransport(transport)
+
+    @classmethod
+    def _resolve(cls, spec):
+        if not isinstance(spec, str):
+            return spec
+
+        scheme, _, target = spec.partition(":")
+        if scheme not in _SCHEMES or not target:
+            raise ValueError(
+                f"Invalid HTTP transport '{spec}', expected '{NETWORK}' or '<{'|'.join(_SCHEMES)}>:<module>:<attr>'"
+            )
+        obj = cls._import_object(target)
+
+        if scheme == "mock":
+            return httpx.MockTransport(obj)
+        if scheme == "wsgi":
+            return httpx.WSGITransport(app=obj)
+        if scheme == "asgi":
+            return httpx.ASGITransport(app=obj)
+        if not isinstance(obj, (httpx.BaseTransport, httpx.AsyncBaseTransport)) and callable(obj):
+            obj = obj()
+        if not isinstance(obj, (httpx.BaseTransport, httpx.AsyncBaseTransport)):
+            raise TypeError(f"'{target}' is not an httpx transport: {type(obj).__name__}")
+        return obj
+
+    @staticmethod
+    def _import_object(target: str):
+        """Импорт объекта по пути вида 'package.module:attr'."""
+        module_name, _, attr = target.partition(":")
+        if not attr:
+            raise ValueError(f"Invalid import path '{target}', expected '<module>:<attr>'")
+        obj = importlib.import_module(module_name)
+        for part in attr.split("."):
+            obj = getattr(obj, part)
+        return obj
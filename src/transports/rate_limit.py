@@ -0,0 +1,152 @@
+import time
+import asyncio
+import threading
+from typing import List, Tuple
+
+import httpx
+from settings import settings
+from src.metrics import HttpMetrics
+from src.transports.base import TransportWrapper
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket: rate запросов в секунду, всплеск до burst запросов.
+
+    Токен резервируется сразу (баланс может уйти в минус), а вызывающему возвращается время ожидания,
+    поэтому один и тот же bucket подходит и для потоков, и для async-задач.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Резервирует токен и возвращает, сколько секунд нужно подождать перед запросом."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Лимиты частоты запросов по хостам и эндпоинтам, общие для всех клиентов сессии.
+
+    Лимиты задаются строкой (настройка HTTP_RATE_LIMITS) через запятую, каждый в формате
+    <host>[/<path-prefix>]=<rate>[:<burst>], например:
+        api-ru.iiko.services=5,api-ru.iiko.services/api/1/deliveries/create=1:2,*=20
+    '*' - лимит для каждого хоста без собственного лимита. Запрос ждет токен во всех подходящих bucket.
+    """
+
+    _current = None
+    _configured = False
+    _lock = threading.Lock()
+
+    def __init__(self, spec: str):
+        self._host_limits = {}
+        self._endpoint_limits: List[Tuple[str, str, TokenBucket]] = []
+        self._default = None
+        self._default_buckets = {}
+        self._buckets_lock = threading.Lock()
+        for rule in filter(None, (part.strip() for part in spec.split(","))):
+            self._add_rule(rule)
+
+    def _add_rule(self, rule: str):
+        target, _, limit = rule.partition("=")
+        rate, _, burst = limit.partition(":")
+        try:
+            rate, burst = float(rate), float(burst) if burst else None
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{rule}', expected '<host>[/<path>]=<rate>[:<burst>]'")
+        if not rate > 0 or (burst is not None and not burst >= 1):
+            raise ValueError(f"Invalid rate limit '{rule}': rate must be greater than 0 and burst at least 1")
+        host, slash, path = target.strip().partition("/")
+        if host == "*":
+            self._default = (rate, burst)
+        elif slash:
+            self._endpoint_limits.append((host, f"/{path}", TokenBucket(rate, burst)))
+        else:
+            self._host_limits[host] = TokenBucket(rate, burst)
+
+    @classmethod
+    def configure(cls, spec: str = None):
+        """
+        Устанавливает лимиты для клиентов, созданных после вызова.
+
+        :param spec: Строка лимитов (None - настройка HTTP_RATE_LIMITS, пустая строка - без лимитов).
+        """
+        spec = settings.HTTP_RATE_LIMITS if spec is None else spec
+        with cls._lock:
+            cls._current = cls(spec) if spec.strip() else None
+            cls._configured = True
+
+    @classmethod
+    def get_current(cls):
+        """Текущий ограничитель или None, если лимиты не заданы."""
+        if not cls._configured:
+            cls.configure()
+        return cls._current
+
+    def _buckets(self, url: httpx.URL) -> List[TokenBucket]:
+        host = url.host
+        buckets = [bucket for bucket_host, prefix, bucket in self._endpoint_limits
+                   if bucket_host == host and url.path.startswith(prefix)]
+        bucket = self._host_limits.get(host)
+        if bucket is None and self._default is not None:
+            with self._buckets_lock:
+                bucket = self._default_buckets.get(host)
+                if bucket is None:
+                    bucket = self._default_buckets[host] = TokenBucket(*self._default)
+        if bucket is not None:
+            buckets.append(bucket)
+        return buckets
+
+    def reserve(self, request: httpx.Request) -> float:
+        """Резервирует токены для запроса и возвращает время ожидания в секундах."""
+        return max([bucket.reserve() for bucket in self._buckets(request.url)], default=0.0)
+
+
+class RateLimitTransport(TransportWrapper):
+    """
+    Обертка транспорта: выдерживает лимиты RateLimiter перед отправкой запроса.
+    Время ожидания попадает в замеры запроса (queued) и в счетчики сессии.
+    """
+
+    def __init__(self, transport, limiter: RateLimiter):
+        super().__init__(transport)
+        self.limiter = limiter
+
+    def _reserve(self, request: httpx.Request) -> float:
+        delay = self.limiter.reserve(request)
+        request.extensions = {**request.extensions, "queued": delay}
+        if delay > 0:
+            HttpMetrics.increment("ratelimit.queued")
+            HttpMetrics.increment("ratelimit.queued_seconds", delay)
+        return delay
+
+    @staticmethod
+    def _check_throttled(response: httpx.Response):
+        if response.status_code == 429:
+            HttpMetrics.increment("ratelimit.429")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._reserve(request)
+        if delay > 0:
+            time.sleep(delay)
+        response = self._transport.handle_request(request)
+        self._check_throttled(response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._reserve(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = await self._transport.handle_async_request(request)
+        self._check_throttled(response)
+        return response
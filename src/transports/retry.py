@@ -0,0 +1,208 @@
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+from settings import settings
+from src.metrics import HttpMetrics
+from src.transports.base import TransportWrapper
+
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# Повтор безопасен для любого метода: запрос не ушел на сервер или сервер явно отказал его обрабатывать
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_IDEMPOTENT_RETRY_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.WriteError, httpx.RemoteProtocolError)
+_THROTTLED_STATUSES = (429,)
+_UNAVAILABLE_STATUSES = (502, 503, 504)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Хост недоступен: запрос отклонен без отправки (circuit breaker открыт)."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker одного хоста.
+
+    После threshold неудач подряд (сетевые ошибки, 502/503/504) запросы к хосту отклоняются сразу
+    на reset_timeout секунд. Затем пропускается один пробный запрос: успех закрывает breaker, неудача - снова открывает.
+    """
+
+    _breakers = {}
+    _lock = threading.Lock()
+
+    def __init__(self, host: str, threshold: int, reset_timeout: float):
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probe = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_host(cls, host: str):
+        """Breaker хоста (общий для всех клиентов сессии)."""
+        with cls._lock:
+            breaker = cls._breakers.get(host)
+            if breaker is None:
+                breaker = cls._breakers[host] = cls(
+                    host, settings.HTTP_CIRCUIT_BREAKER_THRESHOLD, settings.HTTP_CIRCUIT_BREAKER_RESET
+                )
+            return breaker
+
+    @classmethod
+    def reset_all(cls):
+        with cls._lock:
+            cls._breakers.clear()
+
+    def before_request(self, request: httpx.Request):
+        """Пропускает запрос или бросает CircuitOpenError."""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if not self._probe and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._probe = True  # half-open: пропускаем один пробный запрос
+                return
+        HttpMetrics.increment("circuit.rejected")
+        raise CircuitOpenError(
+            f"Circuit breaker is open for {self.host} after {self._failures} consecutive failures", request=request
+        )
+
+    def record(self, success: bool):
+        with self._lock:
+            self._probe = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if 0 < self.threshold <= self._failures:
+                if self._opened_at is None:
+                    HttpMetrics.increment("circuit.opened")
+                self._opened_at = time.monotonic()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Значение заголовка Retry-After в секундах (число секунд или HTTP-дата)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(TransportWrapper):
+    """
+    Обертка транспорта: повторы с экспоненциальной задержкой и джиттером, учет Retry-After и circuit breaker по хостам.
+
+    Повторяются идемпотентные методы при сетевых ошибках и ответах 429/502/503/504; любые методы - если запрос
+    не был отправлен (ошибка соединения) или получен 429. Задержка Retry-After больше HTTP_RETRY_MAX_DELAY не выжидается:
+    возвращается исходный ответ.
+    """
+
+    def __init__(self, transport, retries: int = None, backoff: float = None, max_delay: float = None):
+        super().__init__(transport)
+        self.retries = settings.HTTP_RETRIES if retries is None else retries
+        self.backoff = settings.HTTP_RETRY_BACKOFF if backoff is None else backoff
+        self.max_delay = settings.HTTP_RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # "Full jitter": случайная задержка до экспоненциальной границы
+        return random.uniform(0, min(self.max_delay, self.backoff * 2 ** attempt))
+
+    def _error_delay(self, request: httpx.Request, attempt: int, error: Exception) -> Optional[float]:
+        """Задержка перед повтором после ошибки или None, если повторять нельзя."""
+        if attempt >= self.retries or isinstance(error, CircuitOpenError):
+            return None
+        if isinstance(error, _NOT_SENT_ERRORS) or (
+                request.method in IDEMPOTENT_METHODS and isinstance(error, _IDEMPOTENT_RETRY_ERRORS)):
+            return self._backoff_delay(attempt)
+        return None
+
+    def _response_delay(self, request: httpx.Request, attempt: int, response: httpx.Response) -> Optional[float]:
+        """Задержка перед повтором после ответа или None, если ответ окончательный."""
+        status = response.status_code
+        retryable = status in _THROTTLED_STATUSES or (
+            status in _UNAVAILABLE_STATUSES and request.method in IDEMPOTENT_METHODS)
+        if attempt >= self.retries or not retryable:
+            return None
+        retry_after = _retry_after(response)
+        if retry_after is None:
+            return self._backoff_delay(attempt)
+        return retry_after if retry_after <= self.max_delay else None
+
+    @staticmethod
+    def _is_failure(response: httpx.Response) -> bool:
+        return response.status_code in _UNAVAILABLE_STATUSES
+
+    @staticmethod
+    def _count_retry(delay: float):
+        HttpMetrics.increment("retry.attempts")
+        HttpMetrics.increment("retry.wait_seconds", delay)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        breaker = CircuitBreaker.for_host(request.url.host)
+        attempt = 0
+        while True:
+            breaker.before_request(request)
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as ex:
+                breaker.record(success=False)
+                delay = self._error_delay(request, attempt, ex)
+                if delay is None:
+                    if attempt:
+                        HttpMetrics.increment("retry.exhausted")
+                    raise
+            else:
+                breaker.record(success=not self._is_failure(response))
+                delay = self._response_delay(request, attempt, response)
+                if delay is None:
+                    if attempt and response.status_code >= 429:
+                        HttpMetrics.increment("retry.exhausted")
+                    return response
+                response.close()
+            self._count_retry(delay)
+            time.sleep(delay)
+            attempt += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        breaker = CircuitBreaker.for_host(request.url.host)
+        attempt = 0
+        while True:
+            breaker.before_request(request)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as ex:
+                breaker.record(success=False)
+                delay = self._error_delay(request, attempt, ex)
+                if delay is None:
+                    if attempt:
+                        HttpMetrics.increment("retry.exhausted")
+                    raise
+            else:
+                breaker.record(success=not self._is_failure(response))
+                delay = self._response_delay(request, attempt, response)
+                if delay is None:
+                    if attempt and response.status_code >= 429:
+                        HttpMetrics.increment("retry.exhausted")
+                    return response
+                await response.aclose()
+            self._count_retry(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
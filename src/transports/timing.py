@@ -0,0 +1,137 @@
+import time
+import httpx
+
+from src.metrics import HttpMetrics, RequestTiming, endpoint_template, current_test_name
+from src.transports.base import TransportWrapper
+
+
+class _PhaseTracer:
+    """Собирает фазы запроса из событий trace-расширения httpcore."""
+
+    def __init__(self, request: httpx.Request):
+        self.started = time.perf_counter()
+        self.marks = {}
+        self.headers_received = None
+        self.timing = RequestTiming(
+            method=request.method,
+            endpoint=endpoint_template(request.url),
+            url=str(request.url),
+            test=current_test_name(),
+            request_bytes=len(request.content),
+            queued=request.extensions.get("queued", 0.0),
+        )
+        self._finished = False
+
+    def on_event(self, name: str, info: dict):
+        # Имена событий вида "connection.connect_tcp.complete" или "http11.receive_response_headers.started"
+        _, _, event = name.partition(".")
+        self.marks[event] = time.perf_counter()
+
+    async def on_async_event(self, name: str, info: dict):
+        self.on_event(name, info)
+
+    def _span(self, phase: str) -> float:
+        start, end = self.marks.get(f"{phase}.started"), self.marks.get(f"{phase}.complete")
+        return end - start if start is not None and end is not None else 0.0
+
+    def on_headers(self, response: httpx.Response):
+        timing = self.timing
+        headers_received = self.marks.get("receive_response_headers.complete", time.perf_counter())
+        request_sent = self.marks.get("send_request_body.complete", self.started)
+        timing.status = response.status_code
+        timing.request_id = response.headers.get("X-Request-ID")
+        timing.connect = self._span("connect_tcp")
+        timing.tls = self._span("start_tls")
+        timing.wait = headers_received - request_sent
+        timing.ttfb = headers_received - self.started
+        self.headers_received = headers_received
+
+    def finish(self, response_bytes: int = 0, error: Exception = None):
+        if self._finished:
+            return
+        self._finished = True
+        finished = time.perf_counter()
+        timing = self.timing
+        timing.response_bytes = response_bytes
+        timing.total = finished - self.started
+        if error is not None:
+            timing.error = type(error).__name__
+        else:
+            timing.download = finished - self.headers_received
+        HttpMetrics.record_timing(timing)
+
+
+class _TimedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Поток тела ответа, фиксирующий время и объем загрузки."""
+
+    def __init__(self, stream, tracer: _PhaseTracer):
+        self._stream = stream
+        self._tracer = tracer
+        self._bytes = 0
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._tracer.finish(self._bytes)
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._tracer.finish(self._bytes)
+
+
+class TimingTransport(TransportWrapper):
+    """
+    Обертка транспорта, замеряющая фазы каждого запроса: connect, TLS, ожидание ответа, TTFB, загрузку и общее время,
+    а также размеры запроса/ответа и X-Request-ID. Замеры сохраняются в HttpMetrics.
+    """
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        tracer = _PhaseTracer(request)
+        request.extensions = {**request.extensions, "trace": tracer.on_event}
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as ex:
+            tracer.finish(error=ex)
+            raise
+        tracer.on_headers(response)
+        # Замер доступен внешним слоям (HAR); поля загрузки заполняются при закрытии тела
+        response.extensions["timing"] = tracer.timing
+        if isinstance(response.stream, httpx.ByteStream):
+            # Тело уже в памяти (mock-транспорт, кассета): клиент не будет читать поток
+            tracer.finish(sum(len(chunk) for chunk in response.stream))
+        else:
+            response.stream = _TimedStream(response.stream, tracer)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        tracer = _PhaseTracer(request)
+        request.extensions = {**request.extensions, "trace": tracer.on_async_event}
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as ex:
+            tracer.finish(error=ex)
+            raise
+        tracer.on_headers(response)
+        # Замер доступен внешним слоям (HAR); поля загрузки заполняются при закрытии тела
+        response.extensions["timing"] = tracer.timing
+        if isinstance(response.stream, httpx.ByteStream):
+            # Тело уже в памяти (mock-транспорт, кассета): клиент не будет читать поток
+            tracer.finish(sum(len(chunk) for chunk in response.stream))
+        else:
+            response.stream = _TimedStream(response.stream, tracer)
+        return response
@@ -1,7 +1,8 @@
-from typing import Type, TypeVar
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Type, TypeVar
 from pydantic import ValidationError, BaseModel
 from httpx import Response
 from src.logger import get_logger
+from src.response import ParsedResponse
 
 # Создаём TypeVar для типизации Pydantic-моделей
 T = TypeVar("T", bound=BaseModel)
@@ -32,9 +33,10 @@ class Validator:
             JSONDecodeError: Если тело ответа не является валидным JSON.
         """
         try:
-            validation = model.model_validate_json(response.text)
-            if validation.model_dump():
-                return model(**response.json())
+            # Тело разбирается один раз (ParsedResponse), модель строится из уже разобранных данных
+            validation = model.model_validate(ParsedResponse.of(response).json())
+            if type(validation).model_fields:
+                return validation
         except ValidationError as ex:
             Validator.logger.error(ex)
             raise ex
@@ -42,4 +44,38 @@ class Validator:
             Validator.logger.error(
                 f"Unexpected error during validation of {model.__name__}: {ex}"
             )
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def validate_items(items: Iterable, model: Type[T]) -> Iterator[T]:
+        """
+        Валидирует элементы списка по одному по мере поступления (например, из src.json_stream.iter_json_items).
+
+        Args:
+            items: Итерируемые элементы списка (словари).
+            model: Pydantic-модель одного элемента (например, DeliveryDetailsSchema).
+
+        Yields:
+            Экземпляры модели в порядке поступления.
+
+        Raises:
+            ValidationError: На первом элементе, не соответствующем модели (остаток тела не загружается).
+        """
+        for index, item in enumerate(items):
+            try:
+                yield model.model_validate(item)
+            except ValidationError as ex:
+                Validator.logger.error(f"Item #{index} is not a valid {model.__name__}: {ex}")
+                raise
+
+    @staticmethod
+    async def avalidate_items(items: AsyncIterable, model: Type[T]) -> AsyncIterator[T]:
+        """Асинхронный аналог validate_items (для src.json_stream.aiter_json_items)."""
+        index = 0
+        async for item in items:
+            try:
+                yield model.model_validate(item)
+            except ValidationError as ex:
+                Validator.logger.error(f"Item #{index} is not a valid {model.__name__}: {ex}")
+                raise
+            index += 1
@@ -0,0 +1,89 @@
+import time
+import asyncio
+import allure
+import pytest
+from http import HTTPStatus
+
+from settings import settings
+from functions import percentile
+from src.http_client import create_async_client
+from data import get_delivery_endpoints, get_courier_endpoints, get_route_endpoints
+
+
+CONCURRENCY_LEVELS = [1, 10, 50]
+ROUNDS_PER_LEVEL = 3  # на каждом уровне отправляется concurrency * ROUNDS_PER_LEVEL запросов
+
+
+@allure.epic("Benchmark: HTTP/1.1 pooled vs HTTP/2 multiplexing")
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestHttpTransportBenchmark:
+    """
+    Сравнение транспортов на одном наборе эндпоинтов:
+    HTTP/1.1 с пулом keep-alive соединений против HTTP/2 (все запросы в одном соединении).
+    Тест ничего не утверждает о скорости - только печатает и прикрепляет таблицу результатов.
+    """
+
+    @staticmethod
+    def _get_endpoints():
+        return [
+            f"{get_delivery_endpoints().list_of_deliveries}?page=1&per_page=10",
+            f"{get_courier_endpoints().list_of_couriers}/{settings.COURIER_SAAS_ID}",
+            f"{get_route_endpoints().list_of_routes}?page=1",
+        ]
+
+    @staticmethod
+    async def _run_level(http2, concurrency, endpoints, headers):
+        """Отправляет concurrency * ROUNDS_PER_LEVEL запросов не более чем по concurrency одновременно."""
+        semaphore = asyncio.Semaphore(concurrency)
+        total_requests = concurrency * ROUNDS_PER_LEVEL
+        latencies = []
+        statuses = []
+
+        async with create_async_client(base_url=settings.BASE_URL, http2=http2) as client:
+            # Прогрев: устанавливаем соединение до начала замеров
+            warmup = await client.get(endpoints[0], headers=headers)
+            http_version = warmup.http_version
+
+            async def _send(i):
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(endpoints[i % len(endpoints)], headers=headers)
+                    latencies.append(time.perf_counter() - start)
+                    statuses.append(response.status_code)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[_send(i) for i in range(total_requests)])
+            wall_time = time.perf_counter() - started
+
+        return {
+            "transport": "HTTP/2" if http2 else "HTTP/1.1",
+            "negotiated": http_version,
+            "concurrency": concurrency,
+            "requests": total_requests,
+            "wall_s": wall_time,
+            "rps": total_requests / wall_time,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "errors": sum(1 for status in statuses if status != HTTPStatus.OK),
+        }
+
+    @allure.title("HTTP/1.1 pooled vs HTTP/2 at 1/10/50 concurrent streams")
+    def test_http1_vs_http2(self, admin_auth_headers):
+        endpoints = self._get_endpoints()
+        results = []
+        for http2 in (False, True):
+            for concurrency in CONCURRENCY_LEVELS:
+                results.append(asyncio.run(self._run_level(http2, concurrency, endpoints, admin_auth_headers)))
+
+        header = f"{'transport':<9} {'negotiated':<10} {'conc':>4} {'reqs':>5} {'wall_s':>7} {'rps':>7} {'p50_ms':>8} {'p95_ms':>8} {'errors':>6}"
+        lines = [header] + [
+            f"{r['transport']:<9} {r['negotiated']:<10} {r['concurrency']:>4} {r['requests']:>5} {r['wall_s']:>7.2f} "
+            f"{r['rps']:>7.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['errors']:>6}"
+            for r in results
+        ]
+        report = "\n".join(lines)
+        print(f"\n{report}")
+        allure.attach(report, name="HTTP transport benchmark", attachment_type=allure.attachment_type.TEXT)
+
+        assert all(r["errors"] == 0 for r in results), f"Some benchmark requests failed:\n{report}"
@@ -1,4 +1,3 @@
-import json
 import random
 import pytest
 from pathlib import Path
@@ -6,8 +5,9 @@ from http import HTTPStatus
 
 from settings import settings
 from functions import load_json
+from services.auth_service import CourierHeaders, IikoAuthService
 from src.http_methods import MyRequests
-from data import get_iiko_endpoints, get_company_endpoints, get_pickup_point_endpoints
+from data import get_company_endpoints, get_pickup_point_endpoints
 from src.prepare_data.prepare_company_data import PrepareCompanyData
 from src.prepare_data.prepare_pickup_point_data import PreparePickupPointData
 from generator.company_generator import CompanyGenerator
@@ -25,18 +25,25 @@ def courier_iiko_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def courier_headers(auth_headers):
+    """
+    Заголовки авторизации курьеров из couriers.{env}.json по имени: courier_headers["Семен"].
+    Все курьеры авторизуются параллельно один раз за сессию.
+    """
+    couriers = load_json(f"tests/e2e/config/couriers.{settings.TEST_ENV}.json")
+    headers = CourierHeaders(couriers)
+    headers.warm_up()
+    return headers
+
+
+@pytest.fixture(scope="session")
 def iiko_headers():
-    request = MyRequests()
-    response = request.post(
-        url=get_iiko_endpoints().access_token,
-        data=json.dumps({"apiLogin": settings.IIKO_API_LOGIN}),
-    )
-    token = response.json().get("token")
-    return {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+    """
+    Заголовки iiko API на сессию: токен кэшируется и обновляется в фоне,
+    при 401 запрос повторяется с новым токеном (см. IikoAuthService).
+    """
+    return IikoAuthService.get_headers()
 
 
 @pytest.fixture(scope='session')
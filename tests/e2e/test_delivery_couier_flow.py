@@ -200,8 +200,8 @@ class TestDeliveryCourierFlow:
     def create_deliveries(
         self, test_name, company_id, pickup_point_id, orders, headers
     ):
-        """Создает заказы и возвращает их ID."""
-        order_ids = []
+        """Создает заказы одним bulk-вызовом и возвращает их ID в порядке orders."""
+        data_list = []
         for order in orders:
             info = next(
                 self.delivery_generator.generate_delivery(
@@ -215,17 +215,18 @@ class TestDeliveryCourierFlow:
                     time_till=order.time_till,
                 )
             )
-            data = self.delivery_data.prepare_delivery_data(info=info)
-            delivery_id = self.delivery_service.create_delivery(
-                test_name, data, headers
-            )
-            order_ids.append(delivery_id)
-            time.sleep(10)
+            data_list.append(self.delivery_data.prepare_delivery_data(info=info))
 
+        order_ids = self.delivery_service.create_deliveries(test_name, data_list, headers)
+        # Заказ становится доступен для назначения не сразу после создания
+        time.sleep(10)
         return order_ids
 
     def assign_deliveries(self, test_name, order_ids, courier_id, headers):
-        """Назначает курьера на заказы."""
+        """
+        Назначает курьера на заказы по одному в порядке order_ids: от порядка назначения зависит
+        порядок точек маршрута, с которым сопоставляются geo_updates.
+        """
         for order_id in order_ids:
             self.delivery_service.assign_delivery(
                 test_name, order_id, courier_id, headers
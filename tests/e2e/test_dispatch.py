@@ -4,7 +4,6 @@ import time
 from datetime import datetime, timedelta
 
 from data import get_iiko_endpoints
-from services.auth_service import AuthService
 from services.iiko_delivery_service import IikoDeliveryService
 from services.courier_service import CourierService
 from src.http_methods import MyRequests
@@ -30,7 +29,8 @@ class TestDispatchIIKO:
     ADDRESS_DATA = load_json("tests/e2e/config/iiko_address_data.json")
     pickup_point = ADDRESS_DATA["ПВ Курьерика"]
     
-    def _setup_required_couriers(self, get_test_name, admin_auth_headers, courier_iiko_data, courier_names=None):
+    def _setup_required_couriers(self, get_test_name, admin_auth_headers, courier_iiko_data, courier_headers,
+                                 courier_names=None):
         """Фикстура для настройки только указанных курьеров перед тестами."""
         if courier_names is None:
             courier_names = ["Семен", "Федор"]  # значения по умолчанию
@@ -38,8 +38,6 @@ class TestDispatchIIKO:
         # Открываем смены и устанавливаем координаты для курьеров
         for courier_name in courier_names:
             courier_id = courier_iiko_data["couriers"][courier_name]
-            # Авторизуемся под курьером
-            courier_headers = AuthService.get_courier_headers(courier_id, admin_auth_headers)
 
             # Открываем смену
             self.courier_service.turn_on_shift(
@@ -55,12 +53,12 @@ class TestDispatchIIKO:
                 courier_id,
                 self.pickup_point["latitude"],
                 self.pickup_point["longitude"],
-                courier_headers
+                courier_headers[courier_name]
             )
 
     @allure.title("2 - Перебэтч	- Новый заказ проходит по критериям только в один из незахлопнутых бэтчей")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_order_rebatch_to_specific_batch(self, get_test_name, iiko_headers, admin_auth_headers, courier_iiko_data):
+    def test_order_rebatch_to_specific_batch(self, get_test_name, iiko_headers, courier_headers):
         """
         1. Создаем первый батч (ближние адреса)
         2. Создаем второй батч (дальние адреса)
@@ -87,16 +85,10 @@ class TestDispatchIIKO:
 
         # 4. Проверки батчинга
         # Получаем информацию о курьерах и их батчах
-        couriers = {
-            "Семен": courier_iiko_data["couriers"]["Семен"],
-            "Федор": courier_iiko_data["couriers"]["Федор"]
-        }
-        
         target_batch, other_batch = None, None
 
-        for courier_name, courier_id in couriers.items():
-            courier_headers = AuthService.get_courier_headers(courier_id, admin_auth_headers)
-            batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers)
+        for courier_name in ["Семен", "Федор"]:
+            batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers[courier_name])
 
             if not batch_info.get('deliveries'):
                 print(f"У курьера {courier_name} нет доставок")
@@ -691,7 +683,7 @@ class TestDispatchIIKO:
 
     @allure.title("25 - Захлопывание батча - Завершено приготовление всех заказов в батче")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_batch_close_all_orders_completed(self, get_test_name, iiko_headers, admin_auth_headers, courier_iiko_data):
+    def test_batch_close_all_orders_completed(self, get_test_name, iiko_headers, courier_headers):
         """
         1. Создаем незахлопнутый батч с несколькими заказами (1..N)
         2. Все заказы завершают приготовление
@@ -709,9 +701,7 @@ class TestDispatchIIKO:
         time.sleep(60)  # Ждем завершения приготовления
         
         # 3. Проверяем что батч захлопнут
-        courier_id = courier_iiko_data["couriers"]["Семен"]
-        courier_headers = AuthService.get_courier_headers(courier_id, admin_auth_headers)
-        batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers)
+        batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers["Семен"])
         print(batch_info)
         
         # Проверяем что все заказы в статусе готово к доставке
@@ -722,7 +712,7 @@ class TestDispatchIIKO:
 
     @allure.title("26 - Захлопывание ботча - Завершено приготовление единственного заказа в батче")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_batch_close_single_order_completed(self, get_test_name, iiko_headers, admin_auth_headers, courier_iiko_data):
+    def test_batch_close_single_order_completed(self, get_test_name, iiko_headers, courier_headers):
         """
         1. Создаем батч ровно с одним заказом
         2. Заказ завершает приготовление
@@ -737,9 +727,7 @@ class TestDispatchIIKO:
         time.sleep(30) # Ждем завершения приготовления
         
         # 3. Проверяем статус батча
-        courier_id = courier_iiko_data["couriers"]["Семен"]
-        courier_headers = AuthService.get_courier_headers(courier_id, admin_auth_headers)
-        batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers)
+        batch_info = self.courier_service.get_courier_batch_deliveries(get_test_name, courier_headers["Семен"])
         print(batch_info)
 
         # Проверяем что все заказы в статусе готово к доставке
@@ -120,8 +120,7 @@ class TestRegularDispatch:
         durations = [20, 40, 60, 80, 100, 120, 140, 160, 180, 200,
                      30, 45, 90, 110, 130, 150, 170, 190, 210, 230,
                      50, 70, 95, 115, 135, 155, 175, 195, 215, 240]
-        for addr, dur in zip(addresses, durations):
-            self.iiko_delivery_service.create_order(addr, dur, iiko_headers)
+        self.iiko_delivery_service.create_orders_bulk(list(zip(addresses, durations)), iiko_headers)
 
     @allure.title("9 - Имитация реального маршрута с фиксированным временем доставки")
     def test_real_route_with_fixed_duration(self, iiko_headers):
@@ -163,8 +162,7 @@ class TestRegularDispatch:
             "Волжский Бульвар 5"
         ]
         durations = [VRP_MAX_ROUTE_DURATION] * len(addresses)
-        for addr, dur in zip(addresses, durations):
-            self.iiko_delivery_service.create_order(addr, dur, iiko_headers)
+        self.iiko_delivery_service.create_orders_bulk(list(zip(addresses, durations)), iiko_headers)
 
     @allure.title("11 - Имитация оптимизированного маршрута")
     def test_optimized_route(self, iiko_headers):
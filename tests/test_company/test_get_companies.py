@@ -6,6 +6,7 @@ from src.http_methods import MyRequests
 from src.assertions import Assertions
 from src.validator import Validator
 from src.schemas import GetCompanySchemas
+from src.json_stream import iter_json_items
 from http import HTTPStatus
 
 
@@ -40,6 +41,27 @@ class TestGetCompanies:
         )
         self.validator.validate_response(response=response, model=GetCompanySchemas.get_companies)
 
+    @allure.title("Stream large companies page with per-item validation")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.extended
+    def test_stream_companies_page(self, get_test_name, admin_auth_headers, total_companies):
+        pagination = {}
+        with self.request.stream(
+            url=f"{self.url.list_of_companies}?page=1&per_page=100", headers=admin_auth_headers
+        ) as response:
+            self.assertions.assert_status_code(
+                response=response,
+                expected_status_code=HTTPStatus.OK,
+                test_name=get_test_name,
+            )
+            companies = list(self.validator.validate_items(
+                iter_json_items(response, "companies", envelope=pagination),
+                GetCompanySchemas.companies_item,
+            ))
+
+        assert pagination["pagination"]["total"] == total_companies
+        assert len(companies) == min(100, total_companies)
+
     @allure.title("Get companies without auth")
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.critical_path
@@ -0,0 +1,40 @@
+import httpx
+import pytest
+
+from services.auth_service import AuthService, IikoAuthService
+from services.iiko_command_poller import CommandPoller
+from src.http_methods import MyRequests
+from src.transports import PluggableTransport
+
+
+def _reset_clients():
+    MyRequests.close()
+    AuthService.close()
+    IikoAuthService.close()
+
+
+@pytest.fixture
+def mock_api():
+    """
+    Подключает httpx.MockTransport к MyRequests, AsyncMyRequests и AuthService на время теста.
+
+    Пример использования:
+        mock_api(handler)  # handler(request: httpx.Request) -> httpx.Response
+    Клиенты пересоздаются, поэтому запросы проходят через все слои транспорта (повторы, лимиты, кэш...).
+    """
+
+    def _install(handler):
+        _reset_clients()
+        PluggableTransport.configure(httpx.MockTransport(handler))
+
+    yield _install
+    _reset_clients()
+    PluggableTransport.configure(None)
+
+
+@pytest.fixture
+def fast_poller():
+    """Общий CommandPoller с короткими интервалами опроса на время теста."""
+    CommandPoller._current = CommandPoller(initial_interval=0.01, max_interval=0.02)
+    yield CommandPoller._current
+    CommandPoller._current = None
@@ -0,0 +1,88 @@
+import json
+import threading
+import allure
+import httpx
+import pytest
+from allure_commons import hookimpl, plugin_manager
+
+from src.attachments import AllureAttachments
+from src.http_methods import MyRequests, RequestSpec
+
+
+class _AttachRecorder:
+    """Записывает вложения, переданные в allure.attach, и поток, из которого они пришли."""
+
+    def __init__(self):
+        self.attached = []
+        self.bodies = []
+
+    @hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        self.attached.append((name, threading.current_thread()))
+        self.bodies.append(body)
+
+
+@pytest.fixture
+def recorder():
+    recorder = _AttachRecorder()
+    plugin_manager.register(recorder)
+    yield recorder
+    AllureAttachments.flush(end_of_test=True)
+    plugin_manager.unregister(recorder)
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+@allure.epic("HTTP client: Allure attachments")
+@pytest.mark.offline
+class TestAllureAttachments:
+    request = MyRequests()
+
+    @allure.title("send_many attachments are attached in the test thread")
+    def test_send_many_attaches_in_test_thread(self, mock_api, recorder):
+        mock_api(_ok)
+        specs = [RequestSpec("GET", f"https://api.test/deliveries/{i}") for i in range(8)]
+        self.request.send_many(specs, concurrency=4)
+        AllureAttachments.flush()
+        assert len(recorder.attached) == 8
+        assert {thread for _, thread in recorder.attached} == {threading.main_thread()}
+
+    @allure.title("Attachments from threads without a test context are skipped")
+    def test_background_thread_is_skipped(self, mock_api, recorder):
+        mock_api(_ok)
+        worker = threading.Thread(target=lambda: self.request.get(url="https://api.test/token"))
+        worker.start()
+        worker.join()
+        AllureAttachments.flush()
+        assert recorder.attached == []
+
+    @allure.title("Nested worker pools share the outer collector")
+    def test_nested_collect(self, recorder):
+        with AllureAttachments.collect() as bind:
+            worker = threading.Thread(target=bind(lambda: AllureAttachments.attach_json({"a": 1}, name="inner")))
+            worker.start()
+            worker.join()
+            assert recorder.attached == []
+        AllureAttachments.flush()
+        assert [name for name, _ in recorder.attached] == ["inner"]
+
+    @allure.title("Attachments are queued until flush and repeated bodies become references")
+    def test_queue_and_dedup(self, mock_api, recorder):
+        mock_api(_ok)
+        for _ in range(2):
+            self.request.get(url="https://api.test/deliveries")
+        assert recorder.attached == []
+        AllureAttachments.flush()
+        first, second = recorder.bodies
+        assert json.loads(first) == {"path": "/deliveries"}
+        assert second.startswith('Same body as "GET Response"')
+
+    @allure.title("Attachments made inside a step are attached before the step closes")
+    def test_step_boundary(self, mock_api, recorder):
+        mock_api(_ok)
+        with allure.step("Request in a step"):
+            self.request.get(url="https://api.test/deliveries")
+            assert recorder.attached == []
+        assert len(recorder.attached) == 1
@@ -0,0 +1,71 @@
+import asyncio
+import allure
+import httpx
+import pytest
+
+from src.http_methods import AsyncMyRequests
+
+
+class _StatusApi:
+    """/commands/status: ответы по очереди, последний повторяется."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        return response
+
+
+@allure.epic("iiko: command poller")
+@pytest.mark.offline
+class TestCommandPoller:
+
+    @allure.title("Success and Error states resolve the commands")
+    def test_states(self, mock_api, fast_poller):
+        def _handler(request: httpx.Request) -> httpx.Response:
+            state = "Error" if b"cid-error" in request.content else "Success"
+            return httpx.Response(200, json={"state": state})
+
+        mock_api(_handler)
+        assert fast_poller.wait_all({}, "org", ["cid-ok", "cid-error"]) == {"cid-ok": True, "cid-error": False}
+
+    @allure.title("Non-JSON and non-2xx status responses keep the command pending")
+    def test_bad_responses_are_rescheduled(self, mock_api, fast_poller):
+        api = _StatusApi(
+            httpx.Response(200, text="<html>gateway</html>"),
+            httpx.Response(500, json={"state": "Success"}),
+            httpx.Response(200, json=["unexpected"]),
+            httpx.Response(200, json={"state": "InProgress"}),
+            httpx.Response(200, json={"state": "Success"}),
+        )
+        mock_api(api)
+        assert fast_poller.wait_all({}, "org", ["cid"]) == {"cid": True}
+        assert api.calls == 5
+
+    @allure.title("Async waiters survive a non-JSON status response")
+    def test_async_bad_response(self, mock_api, fast_poller):
+        mock_api(_StatusApi(httpx.Response(200, text="not json"), httpx.Response(200, json={"state": "Success"})))
+
+        async def _wait():
+            try:
+                return await fast_poller.await_all({}, "org", ["cid"])
+            finally:
+                await AsyncMyRequests.aclose()
+
+        assert asyncio.run(_wait()) == {"cid": True}
+
+    @allure.title("Failed round releases its commands for the next round")
+    def test_failed_round(self, fast_poller):
+        fast_poller.submit({}, "org", "cid", timeout=5)
+        fast_poller._commands["cid"].next_check = 0
+
+        def _broken_send_many(specs, concurrency):
+            raise RuntimeError("pool is gone")
+
+        with pytest.raises(RuntimeError):
+            fast_poller._round(_broken_send_many)
+        command = fast_poller._commands["cid"]
+        assert not command.in_flight and not command.future.done()
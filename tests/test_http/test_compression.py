@@ -0,0 +1,72 @@
+import gzip
+import zlib
+import allure
+import httpx
+import pytest
+
+from src.metrics import HttpMetrics
+from src.transports import CompressionTransport
+from src.transports.compression import _TrafficStream, _ZlibDecoder
+
+
+BODY = b'{"items": [' + b",".join(b'{"id": %d}' % i for i in range(500)) + b"]}"
+
+
+@allure.epic("HTTP client: compression")
+@pytest.mark.offline
+class TestCompressionTransport:
+    url = "https://api.test/orders/create"
+
+    @allure.title("Large request bodies are gzipped and 415 falls back to plain bodies")
+    def test_request_compression_and_415(self):
+        received = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            received.append(request.headers.get("Content-Encoding"))
+            if request.headers.get("Content-Encoding") == "gzip":
+                assert gzip.decompress(request.content) == BODY
+                return httpx.Response(415)
+            return httpx.Response(200)
+
+        transport = CompressionTransport(httpx.MockTransport(_handler), encoding="gzip", min_bytes=100)
+        CompressionTransport._unsupported.clear()
+        try:
+            with httpx.Client(transport=transport) as client:
+                assert client.post(self.url, content=BODY).status_code == 200
+                assert client.post(self.url, content=BODY).status_code == 200
+        finally:
+            CompressionTransport._unsupported.clear()
+        assert received == ["gzip", None, None]
+
+    @allure.title("Response traffic is counted on the wire and after decoding")
+    def test_response_traffic(self):
+        wire = gzip.compress(BODY)
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=wire, headers={"Content-Encoding": "gzip"})
+
+        transport = CompressionTransport(httpx.MockTransport(_handler), encoding="off")
+        with httpx.Client(transport=transport) as client:
+            assert client.get("https://api.test/traffic").content == BODY
+        traffic = HttpMetrics._traffic[("GET", "/traffic")]
+        assert traffic["response_wire"] >= len(wire) and traffic["response_raw"] >= len(BODY)
+
+    @allure.title("Standard library fallback decoder: {encoding}")
+    @pytest.mark.parametrize("encoding, wbits, compress", [
+        ("gzip", zlib.MAX_WBITS | 16, gzip.compress),
+        ("deflate", zlib.MAX_WBITS, zlib.compress),
+    ])
+    def test_zlib_fallback(self, encoding, wbits, compress):
+        decoder = _ZlibDecoder(wbits)
+        data = compress(BODY)
+        assert decoder.decode(data[:10]) + decoder.decode(data[10:]) + decoder.flush() == BODY
+        with pytest.raises(httpx.DecodingError):
+            _ZlibDecoder(wbits).decode(b"not compressed")
+
+    @allure.title("Unknown encoding is counted as is")
+    def test_unknown_encoding(self):
+        sizes = []
+        stream = _TrafficStream(httpx.ByteStream(b"abc"), "x-custom", lambda wire, raw: sizes.append((wire, raw)))
+        assert b"".join(stream) == b"abc"
+        stream.close()
+        assert sizes == [(3, 3)]
@@ -0,0 +1,56 @@
+from datetime import datetime
+import allure
+import httpx
+import pytest
+
+from services.delivery_index import DeliveryIndex
+
+
+class _DeliveriesApi:
+    """/deliveries с фильтром created_at_from; часы сервера сильно отстают от локальных."""
+
+    def __init__(self):
+        self.deliveries = []
+        self.created_at_from = []
+
+    def add(self, external_id: str, created_at: str):
+        self.deliveries.append({
+            "id": f"id-{external_id}", "external_id": external_id, "status": "new", "created_at": created_at,
+        })
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        created_at_from = request.url.params["created_at_from"]
+        self.created_at_from.append(created_at_from)
+        if "T" in created_at_from:
+            since = datetime.fromisoformat(created_at_from)
+            items = [d for d in self.deliveries if datetime.fromisoformat(d["created_at"]) >= since]
+        else:
+            items = list(self.deliveries)
+        return httpx.Response(200, json={"deliveries": items, "pagination": {"page": 1, "per_page": 100, "total": len(items)}})
+
+
+@allure.epic("Courierica: delivery index")
+@pytest.mark.offline
+class TestDeliveryIndex:
+
+    @allure.title("Incremental sweeps follow the server created_at, not the local clock")
+    def test_cursor_uses_server_time(self, mock_api):
+        api = _DeliveriesApi()
+        api.add("first", "2020-01-01T12:00:00+03:00")
+        mock_api(api)
+        index = DeliveryIndex("pickup-point")
+
+        assert index.find("first", {}, timeout=1)["id"] == "id-first"
+        api.add("second", "2020-01-01T12:00:30+03:00")
+        assert index.find("second", {}, timeout=1)["id"] == "id-second"
+        assert api.created_at_from == [datetime.now().strftime("%Y-%m-%d"), "2020-01-01T11:59:00+03:00"]
+
+    @allure.title("Known orders are served from the index without requests")
+    def test_hit_without_request(self, mock_api):
+        api = _DeliveriesApi()
+        api.add("first", "2020-01-01T12:00:00")
+        mock_api(api)
+        index = DeliveryIndex("pickup-point")
+        index.find("first", {}, timeout=1)
+        assert index.find("first", {}, timeout=1)["id"] == "id-first"
+        assert len(api.created_at_from) == 1
@@ -0,0 +1,33 @@
+import gzip
+import json
+import allure
+import httpx
+import pytest
+
+from src.transports import HarRecorder, HarTransport
+
+
+@allure.epic("HTTP client: HAR recording")
+@pytest.mark.offline
+class TestHarTransport:
+
+    @allure.title("Encoded response bodies are stored decoded, invalid ones as received: {encoding}")
+    @pytest.mark.parametrize("encoding, wire, text", [
+        ("gzip", gzip.compress(b'{"id": 1}'), '{"id": 1}'),
+        ("gzip", b"not gzip", "not gzip"),
+        ("x-custom", b"plain", "plain"),
+    ])
+    def test_decoded_content(self, tmp_path, encoding, wire, text):
+        def _handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, stream=httpx.ByteStream(wire), headers={"Content-Encoding": encoding})
+
+        recorder = HarRecorder("session", str(tmp_path))
+        with httpx.Client(transport=HarTransport(httpx.MockTransport(_handler), recorder)) as client:
+            with client.stream("GET", "https://api.test/deliveries"):
+                pass  # тело не читается: клиент не смог бы распаковать неверный gzip
+        recorder.close()
+
+        entry, = json.loads((tmp_path / "session.har").read_text(encoding="utf-8"))["log"]["entries"]
+        content = entry["response"]["content"]
+        assert content["text"] == text
+        assert content["size"] == len(text)
@@ -0,0 +1,38 @@
+import allure
+import httpx
+import pytest
+
+from src.http_methods import MyRequests, RequestSpec
+
+
+def _cookie_echo(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={"cookie": request.headers.get("Cookie")},
+        headers={"Set-Cookie": "session=from-server; Path=/"},
+    )
+
+
+@allure.epic("HTTP client: MyRequests")
+@pytest.mark.offline
+class TestMyRequestsCookies:
+    request = MyRequests()
+
+    @allure.title("Cookies from responses are not stored by the shared client")
+    def test_response_cookies_not_reused(self, mock_api):
+        mock_api(_cookie_echo)
+        self.request.get(url="https://api.test/login")
+        assert self.request.get(url="https://api.test/user").json() == {"cookie": None}
+
+    @allure.title("Explicit cookies are sent with their own request only")
+    def test_request_cookies_are_isolated(self, mock_api):
+        mock_api(_cookie_echo)
+        specs = [
+            RequestSpec("GET", "https://api.test/user", cookies={"user": str(i)}) if i % 2 else
+            RequestSpec("GET", "https://api.test/user")
+            for i in range(40)
+        ]
+        results = self.request.send_many(specs, concurrency=10)
+        assert [result.response.json()["cookie"] for result in results] == [
+            f"user={i}" if i % 2 else None for i in range(40)
+        ]
@@ -0,0 +1,85 @@
+import json
+import asyncio
+import threading
+import allure
+import httpx
+import pytest
+
+from data import get_iiko_endpoints
+from services.auth_service import IikoAuthService
+from src.http_methods import MyRequests, AsyncMyRequests, RequestSpec
+
+
+class _IikoApi:
+    """access_token выдает новый токен на каждый логин; остальные запросы с отозванным токеном получают 401."""
+
+    def __init__(self):
+        self.logins = 0
+        self.revoked = set()
+        self.seen = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            if str(request.url) == get_iiko_endpoints().access_token:
+                self.logins += 1
+                return httpx.Response(200, json={"token": f"token-{self.logins}"})
+            token = request.headers["Authorization"].removeprefix("Bearer ")
+            self.seen.append((token, request.content))
+            if token in self.revoked:
+                return httpx.Response(401, json={"errorDescription": "token expired"})
+        return httpx.Response(200, json={"ok": True})
+
+
+@allure.epic("iiko: access token")
+@pytest.mark.offline
+class TestIikoToken:
+    url = get_iiko_endpoints().check_status
+
+    @allure.title("One login is shared by all requests of the session")
+    def test_single_login(self, mock_api):
+        api = _IikoApi()
+        mock_api(api)
+        headers = IikoAuthService.get_headers()
+        results = MyRequests().send_many([RequestSpec("POST", self.url, "{}", headers) for _ in range(20)])
+        assert all(result.response.status_code == 200 for result in results)
+        assert api.logins == 1
+
+    @allure.title("Revoked token is replaced and the request is retried once with the same body")
+    def test_retry_after_401(self, mock_api):
+        api = _IikoApi()
+        mock_api(api)
+        headers = IikoAuthService.get_headers()
+        MyRequests().post(url=self.url, data="{}", headers=headers)
+        api.revoked.add("token-1")
+
+        body = json.dumps({"correlationId": "cid"})
+        assert MyRequests().post(url=self.url, data=body, headers=headers).status_code == 200
+        assert api.logins == 2
+        assert api.seen[-2:] == [("token-1", body.encode()), ("token-2", body.encode())]
+
+    @allure.title("401 with a fresh token is returned without a second retry")
+    def test_single_retry(self, mock_api):
+        api = _IikoApi()
+        mock_api(api)
+        api.revoked.update({"token-1", "token-2"})
+        assert MyRequests().post(url=self.url, data="{}", headers=IikoAuthService.get_headers()).status_code == 401
+        assert api.logins == 2
+
+    @allure.title("Async requests log in once and retry on 401")
+    def test_async_retry(self, mock_api):
+        api = _IikoApi()
+        mock_api(api)
+        headers = IikoAuthService.get_headers()
+
+        async def _send():
+            request = AsyncMyRequests()
+            try:
+                await asyncio.gather(*[request.post(url=self.url, data="{}", headers=headers) for _ in range(5)])
+                api.revoked.add("token-1")
+                return await request.post(url=self.url, data="{}", headers=headers)
+            finally:
+                await AsyncMyRequests.aclose()
+
+        assert asyncio.run(_send()).status_code == 200
+        assert api.logins == 2
@@ -0,0 +1,119 @@
+import json
+import threading
+import allure
+import httpx
+import pytest
+from datetime import datetime, timedelta
+
+from data import get_iiko_endpoints
+from functions import load_json
+from services.iiko_delivery_service import IikoDeliveryService
+
+
+ADDRESSES = ["ПВ Курьерика", "Башиловская 22", "Сущёвский Вал 55"]
+ADDRESS_DATA = load_json("tests/e2e/config/iiko_address_data.json")
+
+
+class _IikoApi:
+    """Создание заказов и статусы команд iiko по адресу заказа: address_key -> (HTTP-статус создания, состояние команды)."""
+
+    def __init__(self, outcomes: dict):
+        self.outcomes = list(outcomes.values())
+        self.lines = [ADDRESS_DATA[address_key]["line1"] for address_key in outcomes]
+        self.endpoints = get_iiko_endpoints()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url == self.endpoints.create_order:
+            body = json.dumps(json.loads(request.content), ensure_ascii=False)
+            number = next(i for i, line in enumerate(self.lines) if line in body)
+            return httpx.Response(self.outcomes[number][0], json={
+                "correlationId": f"cid-{number}", "orderInfo": {"id": f"order-{number}"},
+            })
+        if url == self.endpoints.check_status:
+            number = int(json.loads(request.content)["correlationId"].split("-")[1])
+            return httpx.Response(200, json={"state": self.outcomes[number][1]})
+        return httpx.Response(404)
+
+
+@allure.epic("iiko: bulk order creation")
+@pytest.mark.offline
+class TestCreateOrdersBulk:
+    service = IikoDeliveryService()
+
+    @allure.title("All orders are created and confirmed")
+    def test_all_created(self, mock_api, fast_poller):
+        mock_api(_IikoApi({address: (200, "Success") for address in ADDRESSES}))
+        orders = self.service.create_orders_bulk([(address, 60) for address in ADDRESSES], {})
+        assert sorted(order_id for order_id, _ in orders) == ["order-0", "order-1", "order-2"]
+
+    @allure.title("Every failed creation and unconfirmed command is reported at once")
+    def test_failures_are_collected(self, mock_api, fast_poller):
+        mock_api(_IikoApi(dict(zip(ADDRESSES, [(200, "Success"), (500, None), (200, "Error")]))))
+        with pytest.raises(AssertionError) as error:
+            self.service.create_orders_bulk([(address, 60) for address in ADDRESSES], {})
+        message = str(error.value)
+        assert "2 of 3 IIKO orders were not created" in message
+        assert "500 status code" in message
+        assert "Башиловская 22" in message
+        assert "order-2: create command cid-2 was not confirmed" in message
+
+
+class _CleanupApi:
+    """Заказы дня в окнах по дате доставки (заказ на границе окон возвращается обоими) и команды над заказами."""
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.endpoints = get_iiko_endpoints()
+        self.windows = []
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        body = json.loads(request.content)
+        if url == self.endpoints.list_of_orders_by_statuses_and_dates:
+            date_from = datetime.fromisoformat(body["deliveryDateFrom"])
+            date_to = datetime.fromisoformat(body["deliveryDateTo"]) if "deliveryDateTo" in body else datetime.max
+            with self.lock:
+                self.windows.append((date_from, date_to))
+            orders = [order for order, delivery_at in self.orders if date_from <= delivery_at <= date_to]
+            return httpx.Response(200, json={"ordersByOrganizations": [{"orders": orders}]})
+        if url == self.endpoints.check_status:
+            return httpx.Response(200, json={"state": "Success"})
+        with self.lock:
+            self.commands.append((url, body["orderId"]))
+        return httpx.Response(200, json={"correlationId": f"{url}:{body['orderId']}"})
+
+
+def _order(order_id: str, status: str) -> dict:
+    return {"id": order_id, "creationStatus": "Success", "order": {"status": status}}
+
+
+@allure.epic("iiko: order cleanup")
+@pytest.mark.offline
+class TestCleanupOrders:
+    service = IikoDeliveryService()
+
+    @allure.title("Day windows cover the whole day and each order is processed once")
+    def test_windows_cover_day(self, mock_api, fast_poller):
+        day_start = datetime.combine(datetime.now().date(), datetime.min.time())
+        api = _CleanupApi([
+            (_order("boundary", "Waiting"), day_start + timedelta(hours=6)),
+            (_order("late", "OnWay"), day_start + timedelta(hours=23, minutes=59)),
+            (_order("tomorrow", "Delivered"), day_start + timedelta(days=1, hours=1)),
+        ])
+        mock_api(api)
+        summary = self.service.cancel_and_close_all_orders({})
+
+        windows = sorted(api.windows)
+        assert windows[0][0] == day_start and windows[-1][1] == datetime.max
+        assert all(previous[1] > following[0] for previous, following in zip(windows, windows[1:]))
+        endpoints = get_iiko_endpoints()
+        assert sorted(api.commands) == sorted([
+            (endpoints.cancel_order, "boundary"),
+            (endpoints.deliver_order, "late"),
+            (endpoints.close_order, "late"),
+            (endpoints.close_order, "tomorrow"),
+        ])
+        assert (summary.cancelled, summary.delivered, summary.closed, summary.failures) == (1, 1, 2, [])
@@ -0,0 +1,92 @@
+import json
+import asyncio
+import itertools
+import allure
+import httpx
+import pytest
+
+from src.http_methods import MyRequests, AsyncMyRequests
+from src.json_stream import JsonArrayScanner, iter_json_items, aiter_json_items
+from src.token_cache import TokenCache, TokenHeaders
+
+
+BODY = json.dumps({
+    "deliveries": [{"id": i, "comment": 'quoted \\" } ] , [ {', "items": [{"n": i}]} for i in range(5)],
+    "pagination": {"page": 1, "total": 5},
+}).encode()
+
+
+def _list(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, content=BODY, headers={"Content-Type": "application/json"})
+
+
+@allure.epic("HTTP client: streaming JSON")
+@pytest.mark.offline
+class TestJsonArrayScanner:
+
+    @allure.title("Items and envelope are parsed from any chunking")
+    @pytest.mark.parametrize("chunk_size", [1, 7, len(BODY)])
+    def test_chunked(self, chunk_size):
+        scanner = JsonArrayScanner("deliveries")
+        items = []
+        for start in range(0, len(BODY), chunk_size):
+            items += scanner.feed(BODY[start:start + chunk_size])
+        assert items == json.loads(BODY)["deliveries"]
+        assert scanner.close() == {"pagination": {"page": 1, "total": 5}}
+
+    @allure.title("Truncated body is reported on close")
+    def test_incomplete_body(self):
+        scanner = JsonArrayScanner("deliveries")
+        scanner.feed(BODY[:-10])
+        with pytest.raises(ValueError, match="Incomplete JSON body"):
+            scanner.close()
+
+
+@allure.epic("HTTP client: streaming JSON")
+@pytest.mark.offline
+class TestStream:
+    request = MyRequests()
+
+    @allure.title("Streamed list is read item by item")
+    def test_iter_json_items(self, mock_api):
+        mock_api(_list)
+        envelope = {}
+        with self.request.stream(url="https://api.test/deliveries") as response:
+            ids = [item["id"] for item in iter_json_items(response, "deliveries", envelope)]
+        assert ids == list(range(5))
+        assert envelope["pagination"]["total"] == 5
+
+    @allure.title("Async stream is read item by item")
+    def test_aiter_json_items(self, mock_api):
+        mock_api(_list)
+
+        async def _read():
+            try:
+                async with AsyncMyRequests().stream(url="https://api.test/deliveries") as response:
+                    return [item["id"] async for item in aiter_json_items(response, "deliveries")]
+            finally:
+                await AsyncMyRequests.aclose()
+
+        assert asyncio.run(_read()) == list(range(5))
+
+    @allure.title("Stream resolves the cached token and retries once on 401")
+    def test_stream_token_retry(self, mock_api):
+        tokens = itertools.count(1)
+        cache = TokenCache(enabled=True, store=None)
+        headers = TokenHeaders(lambda: cache.get("stream", lambda: f"token-{next(tokens)}"))
+        seen = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers["Authorization"])
+            if request.headers["Authorization"] == "Bearer token-1":
+                return httpx.Response(401, json={"detail": "expired"})
+            return _list(request)
+
+        mock_api(_handler)
+        try:
+            with self.request.stream(url="https://api.test/deliveries", headers=headers) as response:
+                assert response.status_code == 200
+                assert len(list(iter_json_items(response, "deliveries"))) == 5
+        finally:
+            cache.clear()
+        assert seen == ["Bearer token-1", "Bearer token-2"]
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import allure
+import httpx
+import pytest
+
+from src.http_methods import AsyncMyRequests
+from src.paginator import Paginator, AsyncPaginator
+
+
+TOTAL = 230
+SERVER_PER_PAGE = 50  # сервер ограничивает per_page
+
+
+class _ListApi:
+    """Списочный эндпоинт /deliveries с блоком pagination; запоминает запрошенные страницы."""
+
+    def __init__(self, fail_page: int = None):
+        self.fail_page = fail_page
+        self.pages = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        with self.lock:
+            self.pages.append(page)
+        if page == self.fail_page:
+            return httpx.Response(500, json={"detail": "boom"})
+        start = (page - 1) * SERVER_PER_PAGE
+        items = [{"id": i} for i in range(start, min(start + SERVER_PER_PAGE, TOTAL))]
+        return httpx.Response(200, json={
+            "deliveries": items,
+            "pagination": {"page": page, "per_page": SERVER_PER_PAGE, "total": TOTAL},
+        })
+
+
+@allure.epic("HTTP client: paginator")
+@pytest.mark.offline
+class TestPaginator:
+    url = "https://api.test/deliveries"
+
+    @allure.title("All pages are loaded in order using the server page size")
+    def test_get_all(self, mock_api):
+        api = _ListApi()
+        mock_api(api)
+        items = Paginator(window=3).get_all(self.url, "deliveries", {"status": "new"})
+        assert [item["id"] for item in items] == list(range(TOTAL))
+        assert sorted(api.pages) == [1, 2, 3, 4, 5]
+
+    @allure.title("Stopping early does not load the rest of the pages")
+    def test_early_stop(self, mock_api):
+        api = _ListApi()
+        mock_api(api)
+        for item in Paginator(window=1).iter_items(self.url, "deliveries"):
+            if item["id"] == 60:
+                break
+        assert api.pages == [1, 2]
+
+    @allure.title("Non-200 page fails the traversal")
+    def test_failed_page(self, mock_api):
+        mock_api(_ListApi(fail_page=3))
+        with pytest.raises(AssertionError, match="got 500"):
+            Paginator(window=2).get_all(self.url, "deliveries")
+
+    @allure.title("Async paginator loads all pages in order")
+    def test_async_get_all(self, mock_api):
+        api = _ListApi()
+        mock_api(api)
+
+        async def _load():
+            try:
+                return await AsyncPaginator(window=3).get_all(self.url, "deliveries")
+            finally:
+                await AsyncMyRequests.aclose()
+
+        assert [item["id"] for item in asyncio.run(_load())] == list(range(TOTAL))
+        assert sorted(api.pages) == [1, 2, 3, 4, 5]
@@ -0,0 +1,56 @@
+import json
+import asyncio
+import allure
+import httpx
+import pytest
+from http import HTTPStatus
+
+from src.http_methods import MyRequests, AsyncMyRequests
+from src.transports import PluggableTransport
+
+
+def _echo(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"method": request.method, "path": request.url.path, "query": request.url.query.decode()})
+
+
+def _wsgi_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [json.dumps({"path": environ["PATH_INFO"]}).encode()]
+
+
+@allure.epic("HTTP client: pluggable transport")
+@pytest.mark.offline
+class TestPluggableTransport:
+    request = MyRequests()
+
+    @allure.title("Requests go through the mock transport instead of the network")
+    def test_mock_transport(self, mock_api):
+        mock_api(_echo)
+        response = self.request.get(url="https://api.test/deliveries", data={"page": 2})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {"method": "GET", "path": "/deliveries", "query": "page=2"}
+
+    @allure.title("Async client uses the same mock transport")
+    def test_mock_transport_async(self, mock_api):
+        mock_api(_echo)
+
+        async def _send():
+            try:
+                return await AsyncMyRequests().post(url="https://api.test/delivery", data="{}")
+            finally:
+                await AsyncMyRequests.aclose()
+
+        assert asyncio.run(_send()).json()["method"] == "POST"
+
+    @allure.title("WSGI application is served in-process")
+    def test_wsgi_transport(self, mock_api):
+        mock_api(_echo)  # пересоздает клиенты и восстанавливает транспорт после теста
+        PluggableTransport.configure(httpx.WSGITransport(app=_wsgi_app))
+        assert self.request.get(url="https://api.test/couriers").json() == {"path": "/couriers"}
+
+    @allure.title("Invalid transport spec is rejected")
+    def test_invalid_spec(self, mock_api):
+        mock_api(_echo)
+        PluggableTransport.configure("ftp:somewhere")
+        with pytest.raises(ValueError, match="Invalid HTTP transport"):
+            PluggableTransport.get_transport()
@@ -0,0 +1,48 @@
+import allure
+import httpx
+import pytest
+
+from src.http_methods import MyRequests, RequestSpec
+from src.metrics import HttpMetrics
+from src.transports import RateLimiter
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={})
+
+
+@pytest.fixture
+def rate_limits():
+    """Задает HTTP_RATE_LIMITS на время теста (до подключения mock_api)."""
+    yield RateLimiter.configure
+    RateLimiter.configure()
+
+
+@allure.epic("HTTP client: rate limiting")
+@pytest.mark.offline
+class TestRateLimiter:
+
+    @allure.title("Limits are matched by host, path prefix and the '*' default")
+    def test_buckets(self):
+        limiter = RateLimiter("api.test=5,api.test/orders=1:2,*=20")
+        assert len(limiter._buckets(httpx.URL("https://api.test/orders/create"))) == 2
+        assert len(limiter._buckets(httpx.URL("https://api.test/couriers"))) == 1
+        other = limiter._buckets(httpx.URL("https://other.test/"))
+        assert len(other) == 1 and other[0].rate == 20
+        assert limiter._buckets(httpx.URL("https://other.test/")) == other
+
+    @allure.title("Invalid limit is rejected: {rule}")
+    @pytest.mark.parametrize("rule", ["api.test=0", "api.test=-1", "api.test=nan", "*=0", "api.test=5:0", "api.test=x"])
+    def test_invalid_rule(self, rule):
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            RateLimiter(rule)
+
+    @allure.title("Burst is served at once, the rest is queued at the configured rate")
+    def test_requests_are_queued(self, mock_api, rate_limits):
+        rate_limits("api.test=20:2")
+        mock_api(_ok)
+        queued = HttpMetrics.get_counters().get("ratelimit.queued", 0)
+        specs = [RequestSpec("GET", f"https://api.test/couriers/{i}") for i in range(6)]
+        results = MyRequests().send_many(specs, concurrency=6)
+        assert all(result.response.status_code == 200 for result in results)
+        assert HttpMetrics.get_counters()["ratelimit.queued"] - queued == 4
@@ -0,0 +1,79 @@
+import allure
+import httpx
+import pytest
+
+from services.auth_service import AuthService
+from services.courier_service import CourierService
+from src.http_methods import MyRequests
+from src.transports import ResponseCache
+
+
+@allure.epic("HTTP client: response cache")
+@pytest.mark.offline
+class TestResponseCache:
+    request = MyRequests()
+
+    @pytest.fixture
+    def cached_api(self, mock_api):
+        """Mock-сервер со счетчиком запросов и включенным кэшем ответов."""
+        calls = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            return httpx.Response(200, json={"deliveries": [{"id": len(calls)}]})
+
+        ResponseCache.configure(enabled=True, ttl=60)
+        mock_api(_handler)
+        yield calls
+        ResponseCache.configure()
+
+    @allure.title("Repeated GET is served from the cache, mutation invalidates it")
+    def test_get_cached_and_invalidated(self, cached_api):
+        url = "https://api.test/deliveries"
+        assert self.request.get(url=url).json() == self.request.get(url=url).json()
+        assert len(cached_api) == 1
+        self.request.post(url=f"{url}/1", data="{}")
+        self.request.get(url=url)
+        assert cached_api == ["GET", "POST", "GET"]
+
+    @allure.title("Requests with cache=False bypass the cache")
+    def test_cache_bypass(self, cached_api):
+        url = "https://api.test/deliveries"
+        first = self.request.get(url=url).json()
+        assert self.request.get(url=url, cache=False).json() != first
+        assert len(cached_api) == 2
+
+    @allure.title("Streamed requests are not buffered or served by the cache")
+    def test_stream_bypasses_cache(self, cached_api):
+        url = "https://api.test/deliveries"
+        self.request.get(url=url)
+        with self.request.stream(url=url) as response:
+            assert response.json() == {"deliveries": [{"id": 2}]}
+        assert len(cached_api) == 2
+
+    @allure.title("One-time SMS codes are never served from the cache")
+    def test_sms_code_not_cached(self, mock_api):
+        codes = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            codes.append(str(1000 + len(codes)))
+            return httpx.Response(200, json={"code": codes[-1]})
+
+        ResponseCache.configure(enabled=True, ttl=60)
+        mock_api(_handler)
+        try:
+            assert AuthService.get_sms_code_for_courier("c1", {}) == "1000"
+            assert AuthService.get_sms_code_for_courier("c1", {}) == "1001"
+            # Путь одноразового значения не кэшируется и без явного cache=False
+            assert self.request.get(url="https://api.test/couriers/c1/sms_code").json() == {"code": "1002"}
+            assert self.request.get(url="https://api.test/couriers/c1/sms_code").json() == {"code": "1003"}
+        finally:
+            ResponseCache.configure()
+
+    @allure.title("Courier batch polling reads a fresh body on every attempt")
+    def test_batch_polling_not_cached(self, cached_api):
+        service = CourierService()
+        first = service.get_courier_batch_deliveries("test", {}, max_attempts=1, delay=0)
+        second = service.get_courier_batch_deliveries("test", {}, max_attempts=1, delay=0)
+        assert first != second
+        assert cached_api == ["GET", "GET"]
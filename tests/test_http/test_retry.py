@@ -0,0 +1,128 @@
+import asyncio
+import allure
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from settings import settings
+from src.transports import retry
+from src.transports.retry import RetryTransport, CircuitBreaker, CircuitOpenError
+
+
+class _Script:
+    """Обработчик MockTransport: по очереди возвращает ответы (или бросает исключения) из списка."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        step = self.steps[min(self.calls, len(self.steps) - 1)]
+        self.calls += 1
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Задержки повторов без реального ожидания."""
+    delays = []
+    monkeypatch.setattr(retry.time, "sleep", delays.append)
+    CircuitBreaker.reset_all()
+    yield delays
+    CircuitBreaker.reset_all()
+
+
+def _client(script: _Script, retries: int = 3, max_delay: float = 10.0) -> httpx.Client:
+    return httpx.Client(transport=RetryTransport(httpx.MockTransport(script), retries, backoff=0.1, max_delay=max_delay))
+
+
+@allure.epic("HTTP client: retries")
+@pytest.mark.offline
+class TestRetryTransport:
+    url = "https://api.test/deliveries"
+
+    @allure.title("Idempotent request is retried on 503 until it succeeds")
+    def test_retry_unavailable(self, sleeps):
+        script = _Script(httpx.Response(503), httpx.Response(503), httpx.Response(200))
+        assert _client(script).get(self.url).status_code == 200
+        assert script.calls == 3
+        assert len(sleeps) == 2 and all(0 <= delay <= 0.2 for delay in sleeps)
+
+    @allure.title("POST is not retried on 503")
+    def test_post_not_retried(self, sleeps):
+        script = _Script(httpx.Response(503), httpx.Response(200))
+        assert _client(script).post(self.url).status_code == 503
+        assert script.calls == 1
+
+    @allure.title("Any method is retried when the connection failed")
+    def test_connect_error(self, sleeps):
+        script = _Script(httpx.ConnectError("refused"), httpx.Response(201))
+        assert _client(script).post(self.url).status_code == 201
+        assert script.calls == 2
+
+    @allure.title("Retry-After in seconds and as an HTTP date is honored")
+    def test_retry_after(self, sleeps):
+        http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=3), usegmt=True)
+        script = _Script(
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(429, headers={"Retry-After": http_date}),
+            httpx.Response(200),
+        )
+        assert _client(script).post(self.url).status_code == 200
+        assert sleeps[0] == 2.0
+        assert 1.0 < sleeps[1] <= 3.0
+
+    @allure.title("Retry-After above the max delay returns the original response")
+    def test_retry_after_too_long(self, sleeps):
+        script = _Script(httpx.Response(429, headers={"Retry-After": "60"}), httpx.Response(200))
+        assert _client(script, max_delay=5).get(self.url).status_code == 429
+        assert script.calls == 1 and sleeps == []
+
+    @allure.title("Retries are limited")
+    def test_retries_exhausted(self, sleeps):
+        script = _Script(httpx.Response(502))
+        assert _client(script, retries=2).get(self.url).status_code == 502
+        assert script.calls == 3
+
+    @allure.title("Async transport retries the same way")
+    def test_async_retry(self, sleeps, monkeypatch):
+        async def _no_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(retry.asyncio, "sleep", _no_sleep)
+        script = _Script(httpx.ReadTimeout("slow"), httpx.Response(200))
+
+        async def _get():
+            transport = RetryTransport(httpx.MockTransport(script), retries=2, backoff=0.1)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.get(self.url)
+
+        assert asyncio.run(_get()).status_code == 200
+        assert script.calls == 2 and len(sleeps) == 1
+
+
+@allure.epic("HTTP client: retries")
+@pytest.mark.offline
+class TestCircuitBreaker:
+    url = "https://api.test/deliveries"
+
+    @allure.title("Breaker opens after consecutive failures and lets one probe through after the reset timeout")
+    def test_open_and_probe(self, sleeps, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_CIRCUIT_BREAKER_THRESHOLD", 2)
+        monkeypatch.setattr(settings, "HTTP_CIRCUIT_BREAKER_RESET", 30.0)
+        script = _Script(httpx.Response(503), httpx.Response(503), httpx.Response(200))
+        client = _client(script, retries=0)
+        assert client.get(self.url).status_code == 503
+        assert client.get(self.url).status_code == 503
+        with pytest.raises(CircuitOpenError):
+            client.get(self.url)
+        assert script.calls == 2
+
+        breaker = CircuitBreaker.for_host("api.test")
+        breaker._opened_at -= 30.0  # истек reset_timeout
+        assert client.get(self.url).status_code == 200
+        assert client.get(self.url).status_code == 200
+        assert script.calls == 4
@@ -0,0 +1,113 @@
+import time
+import asyncio
+import threading
+import itertools
+import allure
+import pytest
+
+from src.token_cache import TokenCache
+
+
+class _Login:
+    """Счетчик логинов: каждый логин длится delay секунд и выдает новый токен."""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.calls = 0
+        self._numbers = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _next(self) -> str:
+        with self._lock:
+            self.calls += 1
+            return f"token-{next(self._numbers)}"
+
+    def __call__(self) -> str:
+        time.sleep(self.delay)
+        return self._next()
+
+    async def alogin(self) -> str:
+        await asyncio.sleep(self.delay)
+        return self._next()
+
+
+@pytest.fixture
+def cache():
+    cache = TokenCache(enabled=True, default_ttl=3600, store=None)
+    yield cache
+    cache.clear()
+
+
+def _in_threads(count: int, target) -> list:
+    results = [None] * count
+
+    def _run(i):
+        results[i] = target(i)
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@allure.epic("HTTP client: token cache")
+@pytest.mark.offline
+class TestTokenCache:
+
+    @allure.title("Concurrent get calls share one login")
+    def test_get_single_flight(self, cache):
+        login = _Login()
+        assert set(_in_threads(8, lambda i: cache.get("admin", login))) == {"token-1"}
+        assert login.calls == 1
+
+    @allure.title("Concurrent aget calls in one event loop share one login")
+    def test_aget_single_flight(self, cache):
+        login = _Login()
+
+        async def _get_all():
+            return await asyncio.gather(*[cache.aget("admin", login.alogin, login) for _ in range(8)])
+
+        assert set(asyncio.run(_get_all())) == {"token-1"}
+        assert login.calls == 1
+
+    @allure.title("aget calls from different event loops and threads share one login with get")
+    def test_sync_and_async_share_login(self, cache):
+        login = _Login(delay=0.2)
+
+        def _target(i):
+            if i % 2:
+                return cache.get("admin", login)
+            return asyncio.run(cache.aget("admin", login.alogin, login))
+
+        tokens = _in_threads(6, _target)
+        assert set(tokens) == {"token-1"}
+        assert login.calls == 1
+
+    @allure.title("Rejected token is replaced by a new login")
+    def test_reject(self, cache):
+        login = _Login(delay=0)
+        token = cache.get("admin", login)
+        TokenCache.reject({"Authorization": f"Bearer {token}"})
+        assert cache.get("admin", login) == "token-2"
+        assert login.calls == 2
+
+    @allure.title("Cancelled aget does not keep the key locked")
+    def test_cancelled_aget(self, cache):
+        login = _Login(delay=0.3)
+
+        async def _cancel_waiter():
+            holder = threading.Thread(target=cache.get, args=("admin", login))
+            holder.start()
+            await asyncio.sleep(0.05)
+            waiter = asyncio.ensure_future(cache.aget("admin", login.alogin, login))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            await asyncio.to_thread(holder.join)
+
+        asyncio.run(_cancel_waiter())
+        cache.invalidate("admin")
+        assert cache.get("admin", _Login(delay=0)) == "token-1"